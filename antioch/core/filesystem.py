@@ -6,7 +6,9 @@ Provides abstracted file system operations for virtual files and directories
 in a browser environment using Pyodide.
 """
 
-from typing import Dict, List, Optional
+import json
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
@@ -21,6 +23,11 @@ class FileSystemItem:
         self.modified = modified or datetime.now().isoformat()
         self.content = content
         self.children: Dict[str, 'FileSystemItem'] = {}
+        # Serialized form from to_json(), cleared when this item changes
+        self._json: Optional[str] = None
+        # Snapshot of children returned by items(), cleared when they change
+        self._items: Optional[Tuple['FileSystemItem', ...]] = None
+        self._listing: Optional[Tuple[Tuple[str, ...], Tuple[bool, ...]]] = None
 
     def is_directory(self) -> bool:
         return self.type == 'directory'
@@ -32,6 +39,8 @@ class FileSystemItem:
         """Add a child item (for directories)."""
         if self.is_directory():
             self.children[item.name] = item
+            self._json = None
+            self._items = self._listing = None
 
     def get_child(self, name: str) -> Optional['FileSystemItem']:
         """Get a child item by name."""
@@ -41,9 +50,25 @@ class FileSystemItem:
         """Remove a child item."""
         if name in self.children:
             del self.children[name]
+            self._json = None
+            self._items = self._listing = None
             return True
         return False
 
+    def items(self) -> Tuple['FileSystemItem', ...]:
+        """Get the child items, cached until a child is added or removed."""
+        if self._items is None:
+            self._items = tuple(self.children.values())
+        return self._items
+
+    def listing(self) -> Tuple[Tuple[str, ...], Tuple[bool, ...]]:
+        """Get the children as parallel (names, is_directory) tuples, cached like items()."""
+        if self._listing is None:
+            items = self.items()
+            self._listing = (tuple(item.name for item in items),
+                             tuple(item.type == 'directory' for item in items))
+        return self._listing
+
     def get_extension(self) -> str:
         """Get file extension."""
         if self.is_file() and '.' in self.name:
@@ -61,6 +86,28 @@ class FileSystemItem:
             'children': {name: child.to_dict() for name, child in self.children.items()}
         }
 
+    def to_json(self) -> str:
+        """
+        Serialize to the JSON form of to_dict().
+
+        Each item caches its string, so after a change only the changed item
+        and the directories above it are re-serialized. Callers that mutate an
+        item other than through add_child/remove_child must clear ``_json`` on
+        it and its ancestors.
+        """
+        if self._json is None:
+            fields = json.dumps({
+                'name': self.name,
+                'type': self.type,
+                'size': self.size,
+                'modified': self.modified,
+                'content': self.content,
+            })
+            children = ", ".join(f"{json.dumps(name)}: {child.to_json()}"
+                                 for name, child in self.children.items())
+            self._json = f'{fields[:-1]}, "children": {{{children}}}}}'
+        return self._json
+
     @classmethod
     def from_dict(cls, data: dict) -> 'FileSystemItem':
         """Create FileSystemItem from dictionary."""
@@ -106,6 +153,9 @@ class VirtualFileSystem:
 
         self.current_path = []
         self.storage_backend = storage_backend
+        # Incremented on every save so callers can cache derived data
+        self.version = 0
+        self._flat_cache = None
         self._load_or_create_filesystem()
         self._initialized = True
 
@@ -152,8 +202,24 @@ class VirtualFileSystem:
 
     def _save_filesystem(self):
         """Save the current filesystem to storage."""
+        self.version += 1
         if self.storage_backend:
-            self.storage_backend.save_filesystem(self.root.to_dict())
+            # Backends that take the tree reuse its cached serialization
+            save_tree = getattr(self.storage_backend, 'save_filesystem_tree', None)
+            if save_tree:
+                save_tree(self.root)
+            else:
+                self.storage_backend.save_filesystem(self.root.to_dict())
+
+    def _invalidate_current_path(self):
+        """Drop the cached serialization of the current directory's ancestors."""
+        current = self.root
+        current._json = None
+        for part in self.current_path:
+            current = current.get_child(part)
+            if current is None:
+                break
+            current._json = None
 
     def add_observer(self, callback) -> None:
         """
@@ -214,6 +280,19 @@ class VirtualFileSystem:
         })
         return True
 
+    def push_path(self, name: str) -> bool:
+        """Navigate into a subdirectory of the current directory and notify observers."""
+        child = self.get_current_directory().get_child(name)
+        if not child or not child.is_directory():
+            return False
+
+        self.current_path.append(name)
+        self._notify_observers('navigate', {
+            'path': self.get_path_string(),
+            'current_items': len(child.children)
+        })
+        return True
+
     def go_up(self) -> bool:
         """Navigate to parent directory and notify observers."""
         if self.current_path:
@@ -233,6 +312,7 @@ class VirtualFileSystem:
 
         file_item = FileSystemItem(name, "file", len(content), content=content)
         current_dir.add_child(file_item)
+        self._invalidate_current_path()
         self._save_filesystem()
         self._notify_observers('create', {
             'type': 'file',
@@ -249,6 +329,7 @@ class VirtualFileSystem:
 
         dir_item = FileSystemItem(name, "directory")
         current_dir.add_child(dir_item)
+        self._invalidate_current_path()
         self._save_filesystem()
         self._notify_observers('create', {
             'type': 'directory',
@@ -262,6 +343,7 @@ class VirtualFileSystem:
         current_dir = self.get_current_directory()
         success = current_dir.remove_child(name)
         if success:
+            self._invalidate_current_path()
             self._save_filesystem()
             self._notify_observers('delete', {
                 'name': name,
@@ -284,7 +366,10 @@ class VirtualFileSystem:
         # Update the dictionary key
         current_dir.children[new_name] = item
         del current_dir.children[old_name]
+        current_dir._items = current_dir._listing = None
 
+        item._json = None
+        self._invalidate_current_path()
         self._save_filesystem()
         self._notify_observers('rename', {
             'old_name': old_name,
@@ -293,10 +378,13 @@ class VirtualFileSystem:
         })
         return True
 
-    def get_current_items(self) -> List[FileSystemItem]:
-        """Get items in current directory."""
-        current_dir = self.get_current_directory()
-        return list(current_dir.children.values())
+    def get_current_items(self) -> Tuple[FileSystemItem, ...]:
+        """Get items in current directory, as a snapshot shared until it changes."""
+        return self.get_current_directory().items()
+
+    def get_current_listing(self) -> Tuple[Tuple[str, ...], Tuple[bool, ...]]:
+        """Get names and directory flags of the current directory's items as parallel tuples."""
+        return self.get_current_directory().listing()
 
     def get_path_string(self) -> str:
         """Get current path as string."""
@@ -320,6 +408,8 @@ class VirtualFileSystem:
             file_item.content = content
             file_item.size = len(content)
             file_item.modified = datetime.now().isoformat()
+            file_item._json = None
+            self._invalidate_current_path()
             self._save_filesystem()
             self._notify_observers('modify', {
                 'type': 'file',
@@ -346,6 +436,34 @@ class VirtualFileSystem:
 
         return current
 
+    def flatten(self) -> Tuple[List[str], List[int], List[str]]:
+        """
+        Flatten every item below root into parallel lists.
+
+        Returns:
+            (names, sizes, types) where sizes are content lengths. The result
+            is cached until the filesystem next changes.
+        """
+        if self._flat_cache and self._flat_cache[0] == self.version:
+            return self._flat_cache[1]
+
+        names, sizes, types = [], [], []
+        pending = deque([self.root])
+        while pending:
+            directory = pending.popleft()
+            for name, item in directory.children.items():
+                names.append(name)
+                types.append(item.type)
+                if item.type == 'directory':
+                    sizes.append(0)
+                    pending.append(item)
+                else:
+                    sizes.append(len(item.content) if item.content else 0)
+
+        flat = (names, sizes, types)
+        self._flat_cache = (self.version, flat)
+        return flat
+
     def reset_filesystem(self):
         """Reset the filesystem to defaults, clear storage, and notify observers."""
         if self.storage_backend:
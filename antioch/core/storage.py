@@ -8,6 +8,8 @@ in browser environments.
 
 import js
 import json
+from functools import partial
+from pyodide.ffi import create_proxy
 from typing import Optional, Protocol
 
 
@@ -28,15 +30,58 @@ class StorageBackend(Protocol):
 
 
 class LocalStorageBackend:
-    """Storage backend using browser localStorage."""
+    """
+    Storage backend using browser localStorage.
+
+    Args:
+        storage_key: localStorage key holding the filesystem
+        debounce_ms: When > 0, saves within this window are coalesced into a
+            single write of the latest snapshot (default 0 writes immediately)
+    """
 
-    def __init__(self, storage_key: str = "antioch_filesystem"):
+    def __init__(self, storage_key: str = "antioch_filesystem", debounce_ms: int = 0):
         self.storage_key = storage_key
+        self.debounce_ms = debounce_ms
+        self._pending = None
+        self._timer = None
+        self._flush_proxy = None
 
     def save_filesystem(self, filesystem_data: dict) -> bool:
         """Save filesystem data to browser localStorage."""
+        return self._save(partial(json.dumps, filesystem_data))
+
+    def save_filesystem_tree(self, root) -> bool:
+        """Save a FileSystemItem tree, reusing its cached JSON."""
+        return self._save(root.to_json)
+
+    def _save(self, serialize) -> bool:
+        """Write now, or keep the latest serializer until the debounce fires."""
+        if self.debounce_ms <= 0:
+            return self._write(serialize)
+
+        self._pending = serialize
+        if self._timer is None:
+            if self._flush_proxy is None:
+                self._flush_proxy = create_proxy(lambda *args: self.flush())
+                # Don't lose a pending write when the page goes away
+                js.window.addEventListener('pagehide', self._flush_proxy)
+            self._timer = js.setTimeout(self._flush_proxy, self.debounce_ms)
+        return True
+
+    def flush(self) -> bool:
+        """Write any pending debounced save now."""
+        if self._timer is not None:
+            js.clearTimeout(self._timer)
+            self._timer = None
+        serialize, self._pending = self._pending, None
+        if serialize is None:
+            return True
+        return self._write(serialize)
+
+    def _write(self, serialize) -> bool:
+        """Serialize and store filesystem data."""
         try:
-            json_data = json.dumps(filesystem_data)
+            json_data = serialize()
             js.localStorage.setItem(self.storage_key, json_data)
             return True
         except Exception as e:
@@ -56,6 +101,10 @@ class LocalStorageBackend:
 
     def clear_filesystem(self) -> bool:
         """Clear filesystem data from browser localStorage."""
+        if self._timer is not None:
+            js.clearTimeout(self._timer)
+            self._timer = None
+        self._pending = None
         try:
             js.localStorage.removeItem(self.storage_key)
             return True
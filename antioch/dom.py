@@ -1,6 +1,6 @@
 import js
 from typing import Union, Optional
-from .elements import Element
+from .elements import Element, _append_items
 
 
 class DOMHelper:
@@ -36,21 +36,8 @@ class DOMHelper:
             # Assume it's already a DOM node
             target_node = target
 
-        # Add each item (same logic as Element.add())
-        for item in items:
-            if isinstance(item, Element):
-                target_node.appendChild(item._dom_element)
-            elif hasattr(item, 'element') and hasattr(item.element, '_dom_element'):
-                # Handle Macro objects - use their root element
-                target_node.appendChild(item.element._dom_element)
-            elif isinstance(item, str):
-                text_node = self._document.createTextNode(item)
-                target_node.appendChild(text_node)
-            elif hasattr(item, '__iter__') and not isinstance(item, str):
-                self.add(*item, target=target)
-            else:
-                text_node = self._document.createTextNode(str(item))
-                target_node.appendChild(text_node)
+        # Add items (same logic as Element.add())
+        _append_items(target_node, items)
 
         return self
     
@@ -2,6 +2,17 @@ import js
 from pyodide.ffi import create_proxy
 from typing import Union, Optional, List, Any, Dict
 
+# snake_case -> kebab-case property names, filled on first use
+_CSS_NAMES: Dict[str, str] = {}
+
+
+def _css_name(name: str) -> str:
+    """Convert a snake_case style name to its CSS property name."""
+    css_property = _CSS_NAMES.get(name)
+    if css_property is None:
+        css_property = _CSS_NAMES[name] = name.replace('_', '-')
+    return css_property
+
 class StyleProxy:
     """Proxy object for seamless CSS style manipulation."""
 
@@ -14,7 +25,7 @@ class StyleProxy:
             super().__setattr__(name, value)
             return
 
-        css_property = name.replace('_', '-')
+        css_property = _css_name(name)
 
         if value is None:
             self._dom_element.style.removeProperty(css_property)
@@ -24,13 +35,13 @@ class StyleProxy:
     def __getattr__(self, name):
         if name.startswith('_'):
             return super().__getattribute__(name)
-        css_property = name.replace('_', '-')
+        css_property = _css_name(name)
         return self._dom_element.style.getPropertyValue(css_property)
 
     def update(self, styles: Dict[str, Any]) -> 'StyleProxy':
         """Update multiple styles using a dictionary."""
         for property_name, value in styles.items():
-            css_property = property_name.replace('_', '-')
+            css_property = _css_name(property_name)
 
             if value is None:
                 self._dom_element.style.removeProperty(css_property)
@@ -38,9 +49,53 @@ class StyleProxy:
                 self._dom_element.style.setProperty(css_property, str(value))
         return self
 
+def _css_text(styles: Dict[str, Any]) -> str:
+    """Build a cssText string from a snake_case style dictionary."""
+    return ";".join(
+        f"{_css_name(name)}:{value}"
+        for name, value in styles.items()
+        if value is not None
+    )
+
+
+def _append_nodes(node, items):
+    """Append items (Elements, Macros, strings, iterables) to a DOM node."""
+    for item in items:
+        if isinstance(item, Element):
+            node.appendChild(item._dom_element)
+        elif hasattr(item, 'element') and hasattr(item.element, '_dom_element'):
+            # Handle Macro objects - use their root element
+            node.appendChild(item.element._dom_element)
+        elif isinstance(item, str):
+            node.appendChild(js.document.createTextNode(item))
+        elif hasattr(item, '__iter__'):
+            _append_nodes(node, item)
+        else:
+            node.appendChild(js.document.createTextNode(str(item)))
+
+
+def _append_items(node, items):
+    """
+    Append items to a DOM node.
+
+    Several items are collected in a DocumentFragment first so the live
+    parent is mutated once instead of once per child.
+    """
+    if len(items) > 1:
+        fragment = js.document.createDocumentFragment()
+        _append_nodes(fragment, items)
+        node.appendChild(fragment)
+    else:
+        _append_nodes(node, items)
+
+
 class Element:
     """Base class for all DOM elements with real js.document integration."""
     
+    # event -> {handler: proxy}; created on first listener so wrapped
+    # elements built with __new__ work too
+    _listeners: Optional[Dict[str, Dict[Any, Any]]] = None
+    
     @staticmethod
     def _create_style_proxy(element):
         """Helper method to create StyleProxy for existing DOM elements."""
@@ -86,9 +141,10 @@ class Element:
         if events:
             self.handle(events)
 
-        # Apply styles
+        # Apply styles - a new element has no inline styles yet, so the
+        # whole dictionary is written with a single cssText assignment
         if styles:
-            self._style.update(styles)
+            self._dom_element.style.cssText = _css_text(styles)
     
     @property
     def style(self) -> StyleProxy:
@@ -107,20 +163,14 @@ class Element:
     
     def add(self, *items) -> 'Element':
         """Add child elements or text content. Returns self for method chaining."""
-        for item in items:
-            if isinstance(item, Element):
-                self._dom_element.appendChild(item._dom_element)
-            elif hasattr(item, 'element') and hasattr(item.element, '_dom_element'):
-                # Handle Macro objects - use their root element
-                self._dom_element.appendChild(item.element._dom_element)
-            elif isinstance(item, str):
-                text_node = js.document.createTextNode(item)
-                self._dom_element.appendChild(text_node)
-            elif hasattr(item, '__iter__') and not isinstance(item, str):
-                self.add(*item)
-            else:
-                text_node = js.document.createTextNode(str(item))
-                self._dom_element.appendChild(text_node)
+        _append_items(self._dom_element, items)
+        return self
+    
+    def replace_children(self, *items) -> 'Element':
+        """Replace all children with the given items in a single DOM operation."""
+        fragment = js.document.createDocumentFragment()
+        _append_nodes(fragment, items)
+        self._dom_element.replaceChildren(fragment)
         return self
     
     def set_attribute(self, name: str, value: Any) -> 'Element':
@@ -154,19 +204,48 @@ class Element:
         return self
     
     # Event handling methods
+    def _add_listener(self, event: str, handler) -> None:
+        """Attach handler once; its proxy is kept so it can be released later."""
+        if self._listeners is None:
+            self._listeners = {}
+        bound = self._listeners.setdefault(event, {})
+        if handler in bound:
+            return
+        proxy_handler = create_proxy(handler)
+        bound[handler] = proxy_handler
+        self._dom_element.addEventListener(event, proxy_handler)
+    
     def on(self, event: str, handler) -> 'Element':
         """Add a single event listener."""
         if handler:
-            proxy_handler = create_proxy(handler)
-            self._dom_element.addEventListener(event, proxy_handler)
+            self._add_listener(event, handler)
         return self
     
     def handle(self, event_handlers: Dict[str, Any]) -> 'Element':
         """Add multiple event handlers using a dictionary."""
         for event, handler in event_handlers.items():
             if handler:
-                proxy_handler = create_proxy(handler)
-                self._dom_element.addEventListener(event, proxy_handler)
+                self._add_listener(event, handler)
+        return self
+    
+    def off(self, event: str, handler=None) -> 'Element':
+        """Remove one handler, or all handlers, for an event and free their proxies."""
+        bound = self._listeners.get(event) if self._listeners else None
+        if not bound:
+            return self
+        handlers = [handler] if handler is not None else list(bound)
+        for item in handlers:
+            proxy_handler = bound.pop(item, None)
+            if proxy_handler is not None:
+                self._dom_element.removeEventListener(event, proxy_handler)
+                proxy_handler.destroy()
+        return self
+    
+    def dispose(self) -> 'Element':
+        """Remove every event listener added through this element."""
+        if self._listeners:
+            for event in list(self._listeners):
+                self.off(event)
         return self
     
     # Pythonic event handling methods
@@ -37,6 +37,7 @@ class Macro:
         
         # Callback management
         self._callbacks: Dict[str, List[Callable]] = {}
+        self._has_callbacks: Dict[str, bool] = {}
         
         # Element references
         self._elements: Dict[str, Any] = {}
@@ -193,6 +194,7 @@ class Macro:
         """
         if event_type not in self._callbacks:
             self._callbacks[event_type] = []
+            self._has_callbacks[event_type] = False
     
     def _trigger_callbacks(self, event_type: str, *args, **kwargs):
         """
@@ -203,12 +205,14 @@ class Macro:
             *args: Arguments to pass to callbacks
             **kwargs: Keyword arguments to pass to callbacks
         """
-        if event_type in self._callbacks:
-            for callback in self._callbacks[event_type]:
-                try:
-                    callback(self, *args, **kwargs)
-                except Exception as e:
-                    print(f"Macro {self._id} callback error ({event_type}): {e}")
+        # Fast path: most events have no listeners registered
+        if not self._has_callbacks.get(event_type):
+            return
+        for callback in self._callbacks[event_type]:
+            try:
+                callback(self, *args, **kwargs)
+            except Exception as e:
+                print(f"Macro {self._id} callback error ({event_type}): {e}")
     
     def on(self, event_type: str, callback: Callable) -> 'Macro':
         """
@@ -223,6 +227,7 @@ class Macro:
         """
         self._add_callback_type(event_type)
         self._callbacks[event_type].append(callback)
+        self._has_callbacks[event_type] = True
         return self
     
     def off(self, event_type: str, callback: Optional[Callable] = None) -> 'Macro':
@@ -246,6 +251,7 @@ class Macro:
                     self._callbacks[event_type].remove(callback)
                 except ValueError:
                     pass  # Callback wasn't in the list
+            self._has_callbacks[event_type] = bool(self._callbacks[event_type])
         return self
     
     def _create_container(self, container_styles: Optional[Dict[str, Any]] = None) -> Div:
@@ -325,6 +331,7 @@ class Macro:
         
         # Clear all callbacks
         self._callbacks.clear()
+        self._has_callbacks.clear()
         
         # Clear element references
         self._elements.clear()
@@ -207,6 +207,51 @@ class ChartJS(Macro):
         chart.update(mode)
         return self
 
+    def update_data(self, labels, data, dataset_label=None, title=None,
+                    dataset_index=0, mode='none'):
+        """
+        Replace the labels and one dataset's values.
+
+        Only the changed pieces are sent to Chart.js, instead of converting
+        the whole config as update() does.
+
+        Args:
+            labels: New x-axis labels
+            data: New values for the dataset
+            dataset_label: New dataset label (optional)
+            title: New chart title text (optional)
+            dataset_index: Which dataset to replace (default: 0)
+            mode: Update mode (default 'none' skips animation)
+
+        Returns:
+            Self for method chaining
+        """
+        # Keep the Python-side config in step with the chart
+        config = self._get_state('config')
+        dataset = config['data']['datasets'][dataset_index]
+        config['data']['labels'] = labels
+        dataset['data'] = data
+        if dataset_label is not None:
+            dataset['label'] = dataset_label
+        if title is not None:
+            options = config.setdefault('options', {})
+            options.setdefault('plugins', {}).setdefault('title', {})['text'] = title
+
+        chart = self._get_state('chart_instance')
+        if not chart:
+            return self
+
+        chart.data.labels = to_js(labels)
+        js_dataset = chart.data.datasets[dataset_index]
+        js_dataset.data = to_js(data)
+        if dataset_label is not None:
+            js_dataset.label = dataset_label
+        if title is not None:
+            chart.options.plugins.title.text = title
+
+        chart.update(mode)
+        return self
+
     def destroy(self):
         """Destroy chart instance and clean up."""
         chart = self._get_state('chart_instance')
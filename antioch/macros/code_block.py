@@ -44,6 +44,9 @@ THEMES = {
     'nord': 'https://cdnjs.cloudflare.com/ajax/libs/codemirror/5.65.16/theme/nord.min.css',
 }
 
+# Trailing delay (ms) before a burst of edits is reported as one change
+CHANGE_DEBOUNCE_MS = 100
+
 
 class CodeBlock(Macro):
     """
@@ -132,6 +135,10 @@ class CodeBlock(Macro):
 
         self._container_style = self._merge_styles(default_container_style, container_style)
 
+        # Pending debounced change notification
+        self._change_timer = None
+        self._change_flush_proxy = None
+
         # Callback types
         self._add_callback_type('ready')
         self._add_callback_type('change')
@@ -258,6 +265,7 @@ class CodeBlock(Macro):
 
             # Set up change listener if editable
             if editable:
+                self._change_flush_proxy = create_proxy(self._flush_content_change)
                 change_proxy = create_proxy(lambda *args: self._on_content_change(args[0] if args else None))
                 editor_instance.on('change', change_proxy)
 
@@ -284,8 +292,18 @@ class CodeBlock(Macro):
             js.setTimeout(init_proxy, 200)
 
     def _on_content_change(self, cm):
-        """Handle content change events."""
-        new_content = cm.getValue()
+        """Handle content change events, coalescing rapid keystrokes."""
+        if self._change_timer is not None:
+            js.clearTimeout(self._change_timer)
+        self._change_timer = js.setTimeout(self._change_flush_proxy, CHANGE_DEBOUNCE_MS)
+
+    def _flush_content_change(self):
+        """Read the editor content once and notify change listeners."""
+        self._change_timer = None
+        editor = self._get_state('editor_instance')
+        if not editor:
+            return
+        new_content = editor.getValue()
         self._set_state(content=new_content)
         self._trigger_callbacks('change', new_content)
 
@@ -491,10 +509,13 @@ class CodeBlock(Macro):
 
         Args:
             callback: Function(new_content) called when content changes
+                      (None is ignored). Calls are debounced while typing.
 
         Returns:
             Self for method chaining
         """
+        if callback is None:
+            return self
         return self.on('change', callback)
 
     def on_ready(self, callback):
@@ -511,6 +532,13 @@ class CodeBlock(Macro):
 
     def destroy(self):
         """Destroy editor instance and clean up."""
+        if self._change_timer is not None:
+            js.clearTimeout(self._change_timer)
+            self._change_timer = None
+        if self._change_flush_proxy is not None:
+            self._change_flush_proxy.destroy()
+            self._change_flush_proxy = None
+
         editor = self._get_state('editor_instance')
         if editor:
             # CodeMirror doesn't have a destroy method, but we can clear it
@@ -215,6 +215,20 @@ class Counter(Macro):
         """
         return self.on('change', callback)
     
+    def bind(self, target, attribute="progress"):
+        """Drive another macro's value from this counter.
+        
+        The target's ``set_<attribute>`` method is resolved once here, so each
+        change is a single direct call rather than a user-defined closure.
+        
+        Args:
+            target: Macro to update (e.g. a ProgressBar)
+            attribute: Name of the value to set; calls ``target.set_<attribute>``
+        """
+        setter = getattr(target, f"set_{attribute}")
+        setter(self._get_state('value'))
+        return self.on('change', lambda counter, new_value, old_value: setter(new_value))
+    
     def set_limits(self, min_value=None, max_value=None):
         """Update the min/max limits for this counter."""
         self._set_state(min_value=min_value, max_value=max_value)
@@ -199,6 +199,26 @@ class DataTable(Macro):
 
         return self
 
+    def update_or_add_data(self, data):
+        """
+        Update rows in place by the table's index field, adding any new rows.
+
+        Only changed rows are re-rendered, unlike set_data which replaces the
+        whole row set. Requires an "index" option naming a unique row key.
+
+        Args:
+            data: List of dictionaries representing rows
+
+        Returns:
+            Self for method chaining
+        """
+        table = self._get_state('table_instance')
+        if not table:
+            return self.set_data(data)
+
+        table.updateOrAddData(to_js(data, dict_converter=js.Object.fromEntries))
+        return self
+
     def get_data(self):
         """
         Get current table data.
@@ -213,6 +233,18 @@ class DataTable(Macro):
             return js_data.to_py()
         return self._get_state('data')
 
+    def get_data_count(self):
+        """
+        Get the number of rows in the table.
+
+        Returns:
+            Row count
+        """
+        table = self._get_state('table_instance')
+        if table:
+            return table.getDataCount()
+        return len(self._get_state('data'))
+
     def clear_data(self):
         """Clear all table data."""
         table = self._get_state('table_instance')
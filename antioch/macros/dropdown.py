@@ -2,11 +2,15 @@
 Dropdown macro - A reusable dropdown menu component.
 Uses unique IDs and safe event handling for multiple instances.
 """
+import math
 import js
 from pyodide.ffi import create_proxy
 from .base import Macro
 from ..elements import Div, Button, Span
 
+# Extra rows rendered above and below the visible ones in a virtual list
+_VIRTUAL_OVERSCAN = 3
+
 
 class DropdownItem:
     """Represents a single dropdown item."""
@@ -40,7 +44,7 @@ class Dropdown(Macro):
     def __init__(self, items=None, placeholder="Select an option", 
                  selected_value=None, searchable=False, multi_select=False,
                  max_height="200px", button_style=None, menu_style=None, 
-                 item_style=None, **kwargs):
+                 item_style=None, virtual_threshold=100, item_height=40, **kwargs):
         """
         Initialize a dropdown component.
         
@@ -54,6 +58,9 @@ class Dropdown(Macro):
             button_style: Custom styles for dropdown button
             menu_style: Custom styles for dropdown menu
             item_style: Custom styles for dropdown items
+            virtual_threshold: Above this many matching items, only the rows in
+                view are rendered and reused while scrolling (None to disable)
+            item_height: Row height in pixels used by the virtual list
         """
         # Initialize base macro
         super().__init__(macro_type="dropdown", **kwargs)
@@ -87,6 +94,11 @@ class Dropdown(Macro):
         self._click_outside_handler = None
         self._escape_handler = None
         
+        # Virtual list settings; _virtual_items is set while one is shown
+        self._virtual_threshold = virtual_threshold
+        self._item_height = item_height
+        self._virtual_items = None
+        
         # Add callback types
         self._add_callback_type('select')
         self._add_callback_type('deselect')
@@ -138,6 +150,29 @@ class Dropdown(Macro):
         self._menu_style = self._merge_styles(default_menu_style, menu_style)
         self._item_style = self._merge_styles(default_item_style, item_style)
         
+        # Virtual list rows have a fixed height and are restyled per state;
+        # every state sets the same properties so none is left behind
+        self._virtual_row_style = self._merge_styles(self._item_style, {
+            "height": f"{item_height}px",
+            "box_sizing": "border-box",
+            "overflow": "hidden",
+            "white_space": "nowrap",
+            "text_overflow": "ellipsis"
+        })
+        normal_style = {
+            "opacity": None,
+            "cursor": self._item_style.get("cursor"),
+            "background_color": "transparent",
+            "color": self._item_style.get("color"),
+            "font_weight": self._item_style.get("font_weight")
+        }
+        self._virtual_state_styles = {
+            'normal': normal_style,
+            'disabled': {**normal_style, "opacity": "0.5", "cursor": "not-allowed",
+                         "background_color": "#f8f9fa"},
+            'selected': {**normal_style, "color": "#0056b3", "font_weight": "bold"}
+        }
+        
         # Initialize macro
         self._init_macro()
     
@@ -173,6 +208,7 @@ class Dropdown(Macro):
         
         # Dropdown menu
         menu = self._register_element('menu', Div(style=self._menu_style))
+        menu.on('scroll', self._handle_menu_scroll)
         
         # Create menu items
         self._create_menu_items(menu)
@@ -197,6 +233,7 @@ class Dropdown(Macro):
         
         # Clear existing items
         menu._dom_element.innerHTML = ""
+        self._virtual_items = None
         
         # Search box (if searchable)
         if self._get_state('searchable'):
@@ -236,6 +273,9 @@ class Dropdown(Macro):
                 "font_style": "italic"
             })
             menu.add(no_results)
+        elif self._virtual_threshold is not None and len(visible_items) > self._virtual_threshold:
+            # Separators would break the fixed row height, so they're left out
+            self._create_virtual_list(menu, [item for item in visible_items if not item.separator])
         else:
             for item in visible_items:
                 if item.separator:
@@ -278,6 +318,115 @@ class Dropdown(Macro):
         
         return item_element
     
+    def _create_virtual_list(self, menu, items):
+        """
+        Render a long item list as a fixed pool of reusable rows.
+
+        A spacer gives the menu the scroll height of the full list; only the
+        rows in view exist and are rebound to new items as the menu scrolls.
+        """
+        spacer = Div(style={
+            "position": "relative",
+            "height": f"{len(items) * self._item_height}px"
+        })
+        window = Div(style={
+            "position": "absolute",
+            "top": "0",
+            "left": "0",
+            "right": "0"
+        })
+        
+        rows = []
+        for index in range(min(len(items), self._virtual_row_count(menu))):
+            row = Div(style=self._virtual_row_style)
+            row.on_mouseenter(lambda e, i=index: self._set_virtual_row_hover(i, True))
+            row.on_mouseleave(lambda e, i=index: self._set_virtual_row_hover(i, False))
+            rows.append(row)
+        window.add(*rows)
+        # One listener serves every row
+        window.on_click(self._handle_virtual_click)
+        
+        spacer.add(window)
+        menu.add(spacer)
+        
+        self._virtual_items = items
+        self._virtual_rows = rows
+        self._virtual_row_states = [None] * len(rows)
+        self._virtual_spacer = spacer
+        self._virtual_window = window
+        self._virtual_start = None
+        self._bind_virtual_rows()
+    
+    def _virtual_row_count(self, menu):
+        """Number of rows needed to fill the menu, plus overscan."""
+        viewport = menu._dom_element.clientHeight
+        if not viewport:
+            # A closed menu has no layout yet; use its configured height
+            try:
+                viewport = float(str(self._get_state('max_height')).replace('px', ''))
+            except ValueError:
+                viewport = 300
+        return math.ceil(viewport / self._item_height) + 2 * _VIRTUAL_OVERSCAN
+    
+    def _bind_virtual_rows(self, force=False):
+        """Point the row pool at the items around the current scroll position."""
+        items = self._virtual_items
+        rows = self._virtual_rows
+        menu = self._get_element('menu')
+        
+        offset = menu._dom_element.scrollTop - self._virtual_spacer._dom_element.offsetTop
+        start = max(0, int(offset // self._item_height) - _VIRTUAL_OVERSCAN)
+        start = min(start, len(items) - len(rows))
+        if start == self._virtual_start and not force:
+            return
+        if start != self._virtual_start:
+            # Every slot now shows a different item, so restyle them all; this
+            # also clears the hover background from the slot under the mouse
+            self._virtual_row_states = [None] * len(rows)
+        self._virtual_start = start
+        
+        self._virtual_window.style.transform = f"translateY({start * self._item_height}px)"
+        for slot, row in enumerate(rows):
+            item = items[start + slot]
+            row.set_text(item.text)
+            row._dom_element.dataset.index = start + slot
+            
+            if item.disabled:
+                state = 'disabled'
+            elif self._is_item_selected(item):
+                state = 'selected'
+            else:
+                state = 'normal'
+            if self._virtual_row_states[slot] != state:
+                self._virtual_row_states[slot] = state
+                row.style.update(self._virtual_state_styles[state])
+    
+    def _set_virtual_row_hover(self, slot, is_hover):
+        """Set hover state for a virtual list row."""
+        state = self._virtual_row_states[slot]
+        if state == 'disabled':
+            return
+        row = self._virtual_rows[slot]
+        if is_hover:
+            row.style.background_color = "#f8f9fa"
+        else:
+            row.style.background_color = self._virtual_state_styles[state]["background_color"]
+    
+    def _handle_menu_scroll(self, event):
+        """Rebind virtual list rows when the menu scrolls."""
+        if self._virtual_items is not None:
+            self._bind_virtual_rows()
+    
+    def _handle_virtual_click(self, event):
+        """Route a click on a virtual list row to its item."""
+        # Reading a missing data-index raises rather than returning None
+        index = getattr(event.target.dataset, "index", None)
+        if index is None:
+            return
+        item = self._virtual_items[int(index)]
+        if not item.disabled:
+            self._handle_item_click(event, item)
+    
     def _is_item_selected(self, item):
         """Check if an item is selected."""
         if self._get_state('multi_select'):
@@ -420,9 +569,11 @@ class Dropdown(Macro):
             if button_content:
                 button_content.set_text(self._get_display_text())
 
-            # Recreate menu to update selected states
+            # Update selected states; a virtual list only restyles its rows
             menu = self._get_element('menu')
-            if menu:
+            if self._virtual_items is not None:
+                self._bind_virtual_rows(force=True)
+            elif menu:
                 self._create_menu_items(menu)
 
             self._trigger_callbacks('change', selected_values, item)
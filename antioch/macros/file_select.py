@@ -154,8 +154,9 @@ class FileSelect(Macro):
 
             # Apply filter if specified
             if self.file_filter:
+                suffixes = tuple(self.file_filter)
                 files = [(name, item) for name, item in files
-                        if any(name.endswith(ext) for ext in self.file_filter)]
+                        if name.endswith(suffixes)]
 
             if not files and not (self.show_directories and directories):
                 empty_msg = P(
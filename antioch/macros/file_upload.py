@@ -8,6 +8,12 @@ from antioch import Div, Button, P, Input, Label, Span, Strong
 from antioch.macros.base import Macro
 from antioch.core import get_filesystem
 
+# Extensions stored as binary data rather than text
+BINARY_EXTENSIONS = (
+    '.zip', '.tif', '.tiff', '.png', '.jpg', '.jpeg', '.gif',
+    '.pdf', '.exe', '.bin', '.dat', '.geotiff'
+)
+
 
 class FileUpload(Macro):
     """
@@ -15,7 +21,8 @@ class FileUpload(Macro):
 
     Args:
         destination_path: Default destination path in VFS (e.g., ['maps'])
-        allowed_extensions: Optional list of allowed file extensions (e.g., ['.zip', '.tif'])
+        allowed_extensions: Optional sequence of allowed file extensions (e.g., ['.zip', '.tif']),
+            matched case-insensitively
         max_size_mb: Maximum file size in MB (default 10)
         on_upload: Callback function(file_path, success) called after upload attempt
         multiple: Allow multiple file selection (default False)
@@ -28,6 +35,8 @@ class FileUpload(Macro):
 
         self.destination_path = destination_path or []
         self.allowed_extensions = allowed_extensions or []
+        # Lowercased tuple so validation is a single endswith() call
+        self._allowed_suffixes = tuple(ext.lower() for ext in self.allowed_extensions)
         self.max_size_mb = max_size_mb
         self.on_upload_callback = on_upload
         self.multiple = multiple
@@ -160,9 +169,8 @@ class FileUpload(Macro):
         file_size = file.size
 
         # Validate file extension
-        if self.allowed_extensions:
-            valid_ext = any(file_name.endswith(ext) for ext in self.allowed_extensions)
-            if not valid_ext:
+        if self._allowed_suffixes:
+            if not file_name.lower().endswith(self._allowed_suffixes):
                 self._show_status(f"❌ {file_name}: Invalid file type", "error")
                 return False
 
@@ -247,11 +255,7 @@ class FileUpload(Macro):
 
     def _is_binary_file(self, filename):
         """Determine if a file should be treated as binary."""
-        binary_extensions = [
-            '.zip', '.tif', '.tiff', '.png', '.jpg', '.jpeg', '.gif',
-            '.pdf', '.exe', '.bin', '.dat', '.geotiff'
-        ]
-        return any(filename.lower().endswith(ext) for ext in binary_extensions)
+        return filename.lower().endswith(BINARY_EXTENSIONS)
 
     def _show_status(self, message, status_type="info"):
         """Show status message."""
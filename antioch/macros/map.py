@@ -3,7 +3,9 @@ Map macro - An interactive map component using Leaflet.
 Provides mapping, markers, popups, and geolocation features.
 """
 import js
-from pyodide.ffi import create_proxy
+from array import array
+from itertools import zip_longest
+from pyodide.ffi import JsProxy, create_proxy
 from .base import Macro
 from ..elements import Div
 from ..lib.loader import inject_script, inject_stylesheet
@@ -17,6 +19,354 @@ inject_script('antioch/lib/vendor/georaster-layer-for-leaflet.min.js')
 inject_script('antioch/lib/vendor/proj4.js')
 inject_script('antioch/lib/vendor/geotiff.js')
 
+# Shaders for stretching raster bands on the GPU. The quad covers the canvas
+# with uv.y flipped so the first raster row ends up at the top
+_STRETCH_VERTEX_SHADER = """#version 300 es
+in vec2 position;
+out vec2 uv;
+void main() {
+    uv = vec2(position.x * 0.5 + 0.5, 0.5 - position.y * 0.5);
+    gl_Position = vec4(position, 0.0, 1.0);
+}
+"""
+
+_STRETCH_FRAGMENT_SHADER = """#version 300 es
+precision highp float;
+uniform highp sampler2D red;
+uniform highp sampler2D green;
+uniform highp sampler2D blue;
+uniform vec3 low;
+uniform vec3 span;
+uniform float noData;
+in vec2 uv;
+out vec4 color;
+void main() {
+    vec3 v = vec3(texture(red, uv).r, texture(green, uv).r, texture(blue, uv).r);
+    bool empty = all(lessThan(v, vec3(noData)));
+    color = vec4(clamp((v - low) / span, 0.0, 1.0), empty ? 0.0 : 1.0);
+}
+"""
+
+
+class _StretchRenderer:
+    """WebGL2 canvas that linearly stretches up to three raster bands into RGBA."""
+
+    def __init__(self, gl, canvas, program):
+        self.gl = gl
+        self.canvas = canvas
+        self.program = program
+        self.max_size = gl.getParameter(gl.MAX_TEXTURE_SIZE)
+        self.textures = [gl.createTexture() for _ in range(3)]
+        self.uniforms = {name: gl.getUniformLocation(program, name)
+                         for name in ('red', 'green', 'blue', 'low', 'span', 'noData')}
+
+        # Full-canvas quad as a triangle strip
+        gl.bindBuffer(gl.ARRAY_BUFFER, gl.createBuffer())
+        gl.bufferData(gl.ARRAY_BUFFER, js.Float32Array.of(-1, -1, 1, -1, -1, 1, 1, 1), gl.STATIC_DRAW)
+        position = gl.getAttribLocation(program, 'position')
+        gl.enableVertexAttribArray(position)
+        gl.vertexAttribPointer(position, 2, gl.FLOAT, False, 0, 0)
+
+    @classmethod
+    def create(cls):
+        """Build the renderer, or return None if WebGL2 isn't available."""
+        canvas = js.document.createElement('canvas')
+        options = js.Object.new()
+        options.premultipliedAlpha = False
+        options.preserveDrawingBuffer = True
+        gl = canvas.getContext('webgl2', options)
+        if not gl:
+            return None
+
+        program = gl.createProgram()
+        for kind, source in ((gl.VERTEX_SHADER, _STRETCH_VERTEX_SHADER),
+                             (gl.FRAGMENT_SHADER, _STRETCH_FRAGMENT_SHADER)):
+            shader = gl.createShader(kind)
+            gl.shaderSource(shader, source)
+            gl.compileShader(shader)
+            gl.attachShader(program, shader)
+        gl.linkProgram(program)
+        if not gl.getProgramParameter(program, gl.LINK_STATUS):
+            print(f"GPU raster stretch unavailable: {gl.getProgramInfoLog(program)}")
+            return None
+        return cls(gl, canvas, program)
+
+    def render(self, bands, width, height, ranges, no_data_below=None):
+        """
+        Draw the stretched bands and return the canvas, or None if the raster
+        is too large for a texture.
+
+        Args:
+            bands: One JS typed array per band; a single band is drawn as grayscale
+            ranges: (low, high) per band, mapped onto the full color range
+            no_data_below: Pixels whose bands are all below this are transparent;
+                only applied with three or more bands, as the CPU colormaps do
+        """
+        gl = self.gl
+        if width > self.max_size or height > self.max_size:
+            return None
+
+        self.canvas.width = width
+        self.canvas.height = height
+        gl.viewport(0, 0, width, height)
+        gl.useProgram(self.program)
+        gl.pixelStorei(gl.UNPACK_ALIGNMENT, 1)
+
+        if len(bands) < 3:
+            bands = [bands[0]] * 3
+            ranges = [ranges[0]] * 3
+            # Grayscale stays opaque, matching the CPU path
+            no_data_below = None
+
+        # Upload each band as a float texture; NEAREST since float textures
+        # can't be filtered linearly without an extension
+        for unit, (name, band, texture) in enumerate(zip(('red', 'green', 'blue'), bands, self.textures)):
+            gl.activeTexture(gl.TEXTURE0 + unit)
+            gl.bindTexture(gl.TEXTURE_2D, texture)
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.NEAREST)
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.NEAREST)
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE)
+            gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+            gl.texImage2D(gl.TEXTURE_2D, 0, gl.R32F, width, height, 0, gl.RED, gl.FLOAT,
+                          js.Float32Array.new(band))
+            gl.uniform1i(self.uniforms[name], unit)
+
+        lows = [low for low, high in ranges]
+        spans = [high - low if high > low else 1.0 for low, high in ranges]
+        gl.uniform3f(self.uniforms['low'], *lows)
+        gl.uniform3f(self.uniforms['span'], *spans)
+        # Without a threshold nothing is treated as no-data
+        gl.uniform1f(self.uniforms['noData'], -3.0e38 if no_data_below is None else no_data_below)
+
+        gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4)
+        return self.canvas
+
+
+def _feature_callback(on_each_feature):
+    """A JS callable for onEachFeature; proxies made by the caller are reused."""
+    if isinstance(on_each_feature, JsProxy):
+        return on_each_feature
+    return create_proxy(on_each_feature)
+
+
+def _assign_clamped(data, values):
+    """Copy a float64 array into a Uint8ClampedArray in one call."""
+    proxy = create_proxy(values)
+    buffer = proxy.getBuffer('f64')
+    try:
+        data.set(buffer.data)
+    finally:
+        buffer.release()
+        proxy.destroy()
+
+
+# Created on first use; None once WebGL2 is known to be unavailable
+_stretch_renderer = False
+
+
+def _get_stretch_renderer():
+    """The shared GPU stretch renderer, or None if WebGL2 isn't available."""
+    global _stretch_renderer
+    if _stretch_renderer is False:
+        _stretch_renderer = _StretchRenderer.create()
+    return _stretch_renderer
+
+
+class _RasterCache:
+    """
+    Rendered GeoTIFF overlays kept in IndexedDB across sessions.
+
+    Overlays are stored as PNG Blobs with their bounds, size and last use.
+    Entries older than MAX_AGE_MS are treated as misses so remote files are
+    eventually re-read, and the least recently used entries are evicted once
+    the store holds more than MAX_ENTRIES or MAX_BYTES.
+    """
+
+    DB_NAME = 'antioch_raster_cache'
+    # Bumped whenever the entry format changes; older stores are dropped
+    DB_VERSION = 2
+    STORE = 'overlays'
+    MAX_ENTRIES = 32
+    MAX_BYTES = 64 * 1024 * 1024
+    MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000
+
+    def __init__(self):
+        self._db = None
+        self._opening = False
+        self._waiting = []
+
+    def _with_db(self, callback):
+        """Call callback with the open database, or None if IndexedDB is unavailable."""
+        if self._db is not None or not hasattr(js, 'indexedDB'):
+            callback(self._db)
+            return
+        self._waiting.append(callback)
+        if self._opening:
+            return
+        self._opening = True
+
+        def finish(db):
+            self._db = db
+            self._opening = False
+            waiting, self._waiting = self._waiting, []
+            for waiter in waiting:
+                waiter(db)
+
+        def upgrade(event):
+            db = request.result
+            if db.objectStoreNames.contains(self.STORE):
+                db.deleteObjectStore(self.STORE)
+            db.createObjectStore(self.STORE)
+
+        try:
+            request = js.indexedDB.open(self.DB_NAME, self.DB_VERSION)
+        except Exception:
+            finish(None)
+            return
+        upgrade_proxy = create_proxy(upgrade)
+        request.onupgradeneeded = upgrade_proxy
+        _on_request(request, lambda: finish(request.result), lambda: finish(None), upgrade_proxy)
+
+    def get(self, key, callback):
+        """
+        Look up key and call callback with (blob, bounds), or None on a miss.
+
+        Any IndexedDB error is reported as a miss so the caller loads the
+        raster itself.
+        """
+        def lookup(db):
+            if db is None:
+                callback(None)
+                return
+            try:
+                store = db.transaction(self.STORE, 'readwrite').objectStore(self.STORE)
+                request = store.get(key)
+            except Exception:
+                callback(None)
+                return
+
+            def found():
+                entry = request.result
+                now = js.Date.now()
+                if not entry or now - entry.stored > self.MAX_AGE_MS:
+                    callback(None)
+                    return
+                try:
+                    # Record the use for LRU eviction
+                    entry.used = now
+                    store.put(entry, key)
+                except Exception:
+                    pass
+                bounds = entry.bounds
+                callback((entry.blob, (bounds[0], bounds[1], bounds[2], bounds[3])))
+
+            _on_request(request, found, lambda: callback(None))
+
+        self._with_db(lookup)
+
+    def put(self, key, data_url, bounds):
+        """Store a rendered overlay under key, evicting old entries if needed."""
+        def store_blob(blob):
+            def write(db):
+                if db is None:
+                    return
+                try:
+                    now = js.Date.now()
+                    entry = js.Object.new()
+                    entry.blob = blob
+                    entry.bounds = js.Array.of(*bounds)
+                    entry.size = blob.size
+                    entry.stored = now
+                    entry.used = now
+                    store = db.transaction(self.STORE, 'readwrite').objectStore(self.STORE)
+                    store.put(entry, key)
+                    self._evict(store)
+                except Exception as e:
+                    print(f"Raster cache write failed: {e}")
+
+            self._with_db(write)
+
+        # The overlay is stored as a binary PNG rather than its base64 URL;
+        # converting here leaves the (possibly shared) canvas free to redraw
+        blob_promise = _on_settled(js.fetch(data_url), lambda response: response.blob(),
+                                   lambda error: js.Promise.reject(error))
+        _on_settled(blob_promise, store_blob, lambda error: None)
+
+    def _evict(self, store):
+        """Delete least recently used entries beyond the entry and byte limits."""
+        keys_request = store.getAllKeys()
+        entries_request = store.getAll()
+
+        def trim():
+            keys = keys_request.result
+            entries = entries_request.result
+            usage = sorted(((entries[i].used, entries[i].size, keys[i]) for i in range(keys.length)),
+                           reverse=True)
+            total = 0
+            for count, (used, size, key) in enumerate(usage, 1):
+                total += size
+                if count > self.MAX_ENTRIES or total > self.MAX_BYTES:
+                    store.delete(key)
+
+        # Requests in one transaction complete in order, so both results
+        # are ready once the second succeeds
+        _on_request(entries_request, trim, lambda: None)
+
+
+def _on_request(request, on_success, on_error, *extra_proxies):
+    """Attach one-shot success/error handlers to an IndexedDB request."""
+    def settle(callback):
+        success.destroy()
+        error.destroy()
+        for proxy in extra_proxies:
+            proxy.destroy()
+        callback()
+
+    success = create_proxy(lambda event: settle(on_success))
+    error = create_proxy(lambda event: settle(on_error))
+    request.onsuccess = success
+    request.onerror = error
+
+
+def _on_settled(promise, on_fulfilled, on_rejected):
+    """
+    Chain fulfil/reject handlers onto a promise.
+
+    Both proxies are released once either runs, so a rejected promise doesn't
+    leak the fulfil handler (as a once-callable would).
+    """
+    def settle(callback, value):
+        fulfilled.destroy()
+        rejected.destroy()
+        return callback(value)
+
+    fulfilled = create_proxy(lambda value: settle(on_fulfilled, value))
+    rejected = create_proxy(lambda error: settle(on_rejected, error))
+    return promise.then(fulfilled, rejected)
+
+
+_raster_cache = _RasterCache()
+
+# geotiff.js worker pool for decompressing raster tiles, created on first use
+_decoder_pool = None
+
+
+def _forget_bounds(event):
+    """Drop a group layer's cached bounds when a layer is added to or removed from it."""
+    js.Reflect.deleteProperty(event.target, '_antiochBounds')
+
+
+# Listener shared by every group layer whose bounds are cached
+_forget_bounds_proxy = None
+
+
+def _get_decoder_pool():
+    """The shared geotiff.js decoder pool, or None if the bundle has no Pool."""
+    global _decoder_pool
+    if _decoder_pool is None and hasattr(js.GeoTIFF, 'Pool'):
+        _decoder_pool = js.GeoTIFF.Pool.new()
+    return _decoder_pool
+
 
 class Map(Macro):
     """
@@ -341,6 +691,47 @@ class Map(Macro):
 
         return marker
 
+    def add_markers(self, points, popups=None):
+        """
+        Add many markers to the map as one group.
+
+        The markers are collected off-map and added in a single insertion, and
+        are stored (and removed by clear_markers) as one entry.
+
+        Args:
+            points: List of [lat, lng] coordinates
+            popups: Optional list of popup texts, one per point; points past its
+                end get no popup
+
+        Returns:
+            Leaflet FeatureGroup of the markers or None if map not ready
+
+        Raises:
+            ValueError: If there are more popups than points
+        """
+        popups = popups or ()
+        if len(popups) > len(points):
+            raise ValueError(f"{len(popups)} popups given for {len(points)} points")
+
+        map_instance = self._get_state('map_instance')
+        if not map_instance:
+            return None
+
+        group = js.L.featureGroup()
+        for (lat, lng), popup in zip_longest(points, popups):
+            marker = js.L.marker(js.Array.of(lat, lng))
+            if popup:
+                marker.bindPopup(popup)
+            group.addLayer(marker)
+        group.addTo(map_instance)
+
+        # Store marker reference
+        markers = self._get_state('markers')
+        markers.append(group)
+        self._set_state(markers=markers)
+
+        return group
+
     def remove_marker(self, marker):
         """Remove a marker from the map."""
         map_instance = self._get_state('map_instance')
@@ -465,16 +856,15 @@ class Map(Macro):
             return
 
         try:
-            # Create a feature group containing all layers
-            feature_group = js.L.featureGroup.new()
-
-            # Add all layers to the feature group
+            # Union the layers' bounds, each measured once and then reused
+            bounds = js.L.latLngBounds(js.Array.new())
             for layer in layers:
                 if layer:
-                    feature_group.addLayer(layer)
+                    bounds.extend(self._layer_bounds(layer))
 
-            # Get bounds of the feature group
-            bounds = feature_group.getBounds()
+            if not bounds.isValid():
+                print("No layer bounds to zoom to")
+                return
 
             # Create options if padding specified
             if padding is not None:
@@ -500,6 +890,32 @@ class Map(Macro):
         except Exception as e:
             print(f"Error zooming to layers: {e}")
 
+    def _layer_bounds(self, layer):
+        """
+        Get a layer's LatLngBounds, cached on the layer.
+
+        A GeoJSON layer's features are only walked the first time it is
+        measured. Group layers (GeoJSON, feature groups) can gain or lose
+        members through addData()/addLayer(), so their cache is dropped when
+        they fire layeradd or layerremove.
+        """
+        global _forget_bounds_proxy
+        bounds = getattr(layer, '_antiochBounds', None)
+        if bounds is None:
+            if hasattr(layer, 'getBounds'):
+                bounds = layer.getBounds()
+            else:
+                latlng = layer.getLatLng()
+                bounds = js.L.latLngBounds(latlng, latlng)
+            layer._antiochBounds = bounds
+
+            if hasattr(layer, 'getLayers') and not getattr(layer, '_antiochBoundsWatched', False):
+                if _forget_bounds_proxy is None:
+                    _forget_bounds_proxy = create_proxy(_forget_bounds)
+                layer.on('layeradd layerremove', _forget_bounds_proxy)
+                layer._antiochBoundsWatched = True
+        return bounds
+
     def add_circle(self, lat, lng, radius, color="#3388ff", fill_color=None, fill_opacity=0.2):
         """
         Add a circle overlay to the map.
@@ -544,6 +960,46 @@ class Map(Macro):
 
         return circle
 
+    def add_circles(self, centers, radii, color="#3388ff", fill_color=None, fill_opacity=0.2):
+        """
+        Add many circles to the map as one layer.
+
+        The circles share one style and are added to the map in a single
+        insertion rather than one per circle.
+
+        Args:
+            centers: List of [lat, lng] coordinates
+            radii: Radius in meters for each center
+            color: Stroke color
+            fill_color: Fill color (defaults to stroke color)
+            fill_opacity: Fill opacity (0-1)
+
+        Returns:
+            Leaflet FeatureGroup of the circles or None if map not ready
+        """
+        map_instance = self._get_state('map_instance')
+        if not map_instance:
+            return None
+
+        # Leaflet copies the options into each circle, so one object serves all
+        options = js.Object.new()
+        options.color = color
+        options.fillColor = fill_color if fill_color is not None else color
+        options.fillOpacity = fill_opacity
+
+        group = js.L.featureGroup()
+        for (lat, lng), radius in zip(centers, radii):
+            options.radius = radius
+            group.addLayer(js.L.circle(js.Array.of(lat, lng), options))
+        group.addTo(map_instance)
+
+        # Store layer reference
+        layers = self._get_state('layers')
+        layers.append(group)
+        self._set_state(layers=layers)
+
+        return group
+
     def add_polyline(self, points, color="#3388ff", weight=3, opacity=1.0):
         """
         Add a polyline (connected line segments) to the map.
@@ -629,7 +1085,8 @@ class Map(Macro):
 
         return polygon
 
-    def add_shapefile(self, url, name=None, style_options=None, on_each_feature=None, add_to_control=True):
+    def add_shapefile(self, url, name=None, style_options=None, on_each_feature=None, add_to_control=True,
+                      signal=None):
         """
         Add a shapefile overlay to the map.
 
@@ -637,8 +1094,10 @@ class Map(Macro):
             url: URL to the shapefile (.zip containing .shp, .shx, .dbf files)
             name: Layer name for layer control (defaults to filename from URL)
             style_options: Dictionary of style options (color, weight, fillColor, fillOpacity, etc.)
-            on_each_feature: Optional callback function(feature, layer) called for each feature
+            on_each_feature: Optional callback function(feature, layer) called for each feature,
+                or a proxy of one created once by the caller and reused across loads
             add_to_control: If True, add layer to layer control (default: True)
+            signal: Optional AbortSignal that cancels the download
 
         Returns:
             Promise that resolves to Leaflet GeoJSON layer or None if map not ready
@@ -662,7 +1121,7 @@ class Map(Macro):
         # Create callback proxy if provided
         feature_callback = None
         if on_each_feature:
-            feature_callback = create_proxy(on_each_feature)
+            feature_callback = _feature_callback(on_each_feature)
 
         # Extract filename from URL if name not provided
         layer_name = name
@@ -693,10 +1152,23 @@ class Map(Macro):
 
             return layer
 
+        def handle_shapefile_error(error):
+            # A superseded load is aborted on purpose and isn't an error
+            if signal is None or not signal.aborted:
+                print(f"Error loading shapefile: {error}")
+
         # Parse shapefile using shp.js
-        parse_proxy = create_proxy(handle_shapefile_load)
-        promise = js.shp(url)
-        promise.then(parse_proxy)
+        if signal is not None:
+            # shp.js can't be cancelled itself, so download the zip here and
+            # hand it the bytes; failures pass through to the handlers below
+            fetch_options = js.Object.new()
+            fetch_options.signal = signal
+            promise = _on_settled(js.fetch(url, fetch_options),
+                                  lambda response: response.arrayBuffer(),
+                                  lambda error: js.Promise.reject(error)).then(js.shp)
+        else:
+            promise = js.shp(url)
+        _on_settled(promise, handle_shapefile_load, handle_shapefile_error)
 
         return promise
 
@@ -708,7 +1180,8 @@ class Map(Macro):
             geojson_data: GeoJSON object or URL to GeoJSON file
             name: Layer name for layer control (defaults to "GeoJSON Layer")
             style_options: Dictionary of style options (color, weight, fillColor, fillOpacity, etc.)
-            on_each_feature: Optional callback function(feature, layer) called for each feature
+            on_each_feature: Optional callback function(feature, layer) called for each feature,
+                or a proxy of one created once by the caller and reused across loads
             add_to_control: If True, add layer to layer control (default: True)
 
         Returns:
@@ -728,7 +1201,7 @@ class Map(Macro):
         # Create callback proxy if provided
         feature_callback = None
         if on_each_feature:
-            feature_callback = create_proxy(on_each_feature)
+            feature_callback = _feature_callback(on_each_feature)
 
         # Default layer name if not provided
         layer_name = name if name else "GeoJSON Layer"
@@ -754,7 +1227,9 @@ class Map(Macro):
 
         return layer
 
-    def add_geotiff(self, url, name=None, opacity=1.0, colormap=None, add_to_control=True):
+    def add_geotiff(self, url, name=None, opacity=1.0, colormap=None, add_to_control=True,
+                    batch_colormap=None, band_ranges=None, no_data_below=None, max_width=None,
+                    cache_key=None, signal=None, decode_in_workers=False):
         """
         Add a GeoTIFF raster overlay to the map by converting it to a PNG image overlay.
 
@@ -770,6 +1245,24 @@ class Map(Macro):
             opacity: Layer opacity (0-1)
             colormap: Optional Python function (values_array) => [r, g, b, a] to colorize pixels
             add_to_control: If True, add layer to layer control (default: True)
+            batch_colormap: Optional Python function (bands, width, height) => RGBA bytes
+                colorizing the whole raster in one call; bands is a list of memoryviews,
+                one per band. Takes precedence over colormap and avoids a JS round trip
+                per pixel
+            band_ranges: Optional list of (min, max) per band, or a function (bands) => that
+                list given the band memoryviews. The bands are then stretched linearly in a
+                WebGL2 shader, falling back to the colormaps if WebGL2 is unavailable
+            no_data_below: With band_ranges, pixels whose bands are all below this value
+                are drawn transparent
+            max_width: Optional width in pixels to read the raster at. Wider images are read
+                from their closest overview, and HTTP(S) URLs are opened with range requests
+                so a cloud-optimized GeoTIFF only downloads the header and the tiles used
+            cache_key: Optional string identifying this raster and its rendering. The
+                rendered overlay is kept in IndexedDB under it, and later calls with the
+                same key skip the download and decode
+            signal: Optional AbortSignal that cancels the download
+            decode_in_workers: If True, compressed tiles are decoded by a shared pool of
+                web workers instead of on the main thread
 
         Returns:
             Leaflet ImageOverlay layer or None if map not ready
@@ -811,70 +1304,80 @@ class Map(Macro):
                         def handle_rasters_read(rasters):
                             """Process the raster data."""
                             try:
-                                # Get image metadata
-                                width = image.getWidth()
-                                height = image.getHeight()
+                                # Get image metadata; the rasters carry their size,
+                                # which differs from the image when read at max_width
+                                width = rasters.width
+                                height = rasters.height
                                 bbox = image.getBoundingBox()
 
-                                # Create canvas
-                                canvas = js.document.createElement('canvas')
-                                canvas.width = width
-                                canvas.height = height
-                                ctx = canvas.getContext('2d')
-
-                                # Create image data
-                                image_data = ctx.createImageData(width, height)
-                                data = image_data.data
-
-                                # Process pixels
                                 num_bands = len(rasters)
+                                bands = None
+
+                                # Stretch on the GPU when display ranges are given
+                                gpu_canvas = None
+                                if band_ranges is not None:
+                                    renderer = _get_stretch_renderer()
+                                    if renderer:
+                                        ranges = band_ranges
+                                        if callable(band_ranges):
+                                            bands = [rasters[band].to_memoryview() for band in range(num_bands)]
+                                            ranges = band_ranges(bands)
+                                        shown = [rasters[band] for band in range(min(num_bands, 3))]
+                                        gpu_canvas = renderer.render(shown, width, height, ranges, no_data_below)
+
+                                if gpu_canvas:
+                                    data_url = gpu_canvas.toDataURL('image/png')
+                                else:
+                                    # Create canvas
+                                    canvas = js.document.createElement('canvas')
+                                    canvas.width = width
+                                    canvas.height = height
+                                    ctx = canvas.getContext('2d')
+
+                                    # Create image data
+                                    image_data = ctx.createImageData(width, height)
+                                    data = image_data.data
+
+                                    if batch_colormap:
+                                        # Copy each band out once and write the result back in one go
+                                        if bands is None:
+                                            bands = [rasters[band].to_memoryview() for band in range(num_bands)]
+                                        data.assign(batch_colormap(bands, width, height))
+                                    else:
+                                        # Fill a local buffer and copy it over once; the
+                                        # clamped array rounds and clamps values on the way in
+                                        if bands is None:
+                                            bands = [rasters[band].to_memoryview() for band in range(num_bands)]
+                                        pixels = width * height
+                                        out = array('d', [0.0]) * (4 * pixels)
 
-                                for y in range(height):
-                                    for x in range(width):
-                                        idx = y * width + x
-                                        pixel_idx = idx * 4
-
-                                        # Get pixel values from all bands
-                                        values = []
-                                        for band in range(num_bands):
-                                            values.append(rasters[band][idx])
-
-                                        # Apply colormap
                                         if colormap and callable(colormap):
-                                            try:
-                                                rgba = colormap(values)
-                                                data[pixel_idx] = rgba[0]      # R
-                                                data[pixel_idx + 1] = rgba[1]  # G
-                                                data[pixel_idx + 2] = rgba[2]  # B
-                                                data[pixel_idx + 3] = rgba[3]  # A
-                                            except:
-                                                # Fallback to grayscale
-                                                val = min(255, max(0, int(values[0]))) if values else 0
-                                                data[pixel_idx] = val
-                                                data[pixel_idx + 1] = val
-                                                data[pixel_idx + 2] = val
-                                                data[pixel_idx + 3] = 255
+                                            for idx, values in enumerate(zip(*bands)):
+                                                pixel_idx = idx * 4
+                                                try:
+                                                    rgba = colormap(list(values))
+                                                    out[pixel_idx] = rgba[0]      # R
+                                                    out[pixel_idx + 1] = rgba[1]  # G
+                                                    out[pixel_idx + 2] = rgba[2]  # B
+                                                    out[pixel_idx + 3] = rgba[3]  # A
+                                                except:
+                                                    # Fallback to grayscale
+                                                    out[pixel_idx] = out[pixel_idx + 1] = out[pixel_idx + 2] = values[0]
+                                                    out[pixel_idx + 3] = 255
                                         else:
                                             # Default: RGB if 3+ bands, grayscale if 1 band
-                                            if num_bands >= 3:
-                                                # RGB
-                                                data[pixel_idx] = min(255, max(0, int(values[0])))
-                                                data[pixel_idx + 1] = min(255, max(0, int(values[1])))
-                                                data[pixel_idx + 2] = min(255, max(0, int(values[2])))
-                                                data[pixel_idx + 3] = 255
-                                            else:
-                                                # Grayscale
-                                                val = min(255, max(0, int(values[0]))) if values else 0
-                                                data[pixel_idx] = val
-                                                data[pixel_idx + 1] = val
-                                                data[pixel_idx + 2] = val
-                                                data[pixel_idx + 3] = 255
-
-                                # Put image data on canvas
-                                ctx.putImageData(image_data, 0, 0)
-
-                                # Convert canvas to data URL
-                                data_url = canvas.toDataURL('image/png')
+                                            channels = bands[:3] if num_bands >= 3 else bands[:1] * 3
+                                            for offset, band in enumerate(channels):
+                                                out[offset::4] = array('d', band)
+                                            out[3::4] = array('d', [255.0]) * pixels
+
+                                        _assign_clamped(data, out)
+
+                                    # Put image data on canvas
+                                    ctx.putImageData(image_data, 0, 0)
+
+                                    # Convert canvas to data URL
+                                    data_url = canvas.toDataURL('image/png')
 
                                 # Get bounds and convert to lat/lon if needed
                                 # bbox is [minX, minY, maxX, maxY] in image's projection
@@ -894,47 +1397,10 @@ class Map(Macro):
                                 # Define overlay creation function (used for both WGS84 and reprojected)
                                 def create_overlay(south, west, north, east):
                                     """Create the image overlay with the given bounds."""
-                                    # Create bounds array for Leaflet: [[south, west], [north, east]]
-                                    js_bounds = js.Array.new()
-                                    sw_corner = js.Array.new()
-                                    sw_corner.push(south)
-                                    sw_corner.push(west)
-                                    ne_corner = js.Array.new()
-                                    ne_corner.push(north)
-                                    ne_corner.push(east)
-                                    js_bounds.push(sw_corner)
-                                    js_bounds.push(ne_corner)
-
-                                    # Create image overlay with crisp rendering options
-                                    overlay_options = js.Object.new()
-                                    overlay_options.opacity = opacity
-                                    overlay_options.className = 'geotiff-overlay'
-
-                                    layer = js.L.imageOverlay(data_url, js_bounds, overlay_options).addTo(map_instance)
-
-                                    # Add CSS for crisp image rendering (no blurring when scaling)
-                                    try:
-                                        img_element = layer.getElement()
-                                        if img_element:
-                                            img_element.style.imageRendering = 'pixelated'
-                                            img_element.style.setProperty('image-rendering', '-webkit-optimize-contrast', 'important')
-                                    except:
-                                        pass
-
-                                    # Store layer reference
-                                    layers = self._get_state('layers')
-                                    layers.append(layer)
-                                    self._set_state(layers=layers)
-
-                                    # Add to layer control
-                                    if add_to_control and layer_name:
-                                        self._add_to_layer_control(layer, layer_name)
-
-                                    # Zoom to layer bounds
-                                    try:
-                                        map_instance.fitBounds(js_bounds)
-                                    except:
-                                        pass
+                                    self._add_image_overlay(data_url, (south, west, north, east), opacity,
+                                                            layer_name if add_to_control else None)
+                                    if cache_key is not None:
+                                        _raster_cache.put(cache_key, data_url, (south, west, north, east))
 
                                 # Convert to lat/lon if needed
                                 if epsg_code and epsg_code != 4326:
@@ -1002,7 +1468,20 @@ class Map(Macro):
                         def handle_raster_error(error):
                             pass
 
-                        read_promise = image.readRasters()
+                        options = js.Object.new()
+                        if signal is not None:
+                            options.signal = signal
+                        if decode_in_workers:
+                            pool = _get_decoder_pool()
+                            if pool:
+                                options.pool = pool
+                        if max_width and image.getWidth() > max_width:
+                            # Let geotiff.js pick the closest overview for this size
+                            options.width = max_width
+                            options.height = max(1, round(image.getHeight() * max_width / image.getWidth()))
+                            read_promise = tiff.readRasters(options)
+                        else:
+                            read_promise = image.readRasters(options)
                         read_promise.then(create_proxy(handle_rasters_read), create_proxy(handle_raster_error))
 
                     except:
@@ -1020,9 +1499,9 @@ class Map(Macro):
             except:
                 pass
 
-        # Start loading - fetch entire file then parse
-        # This is more reliable than fromUrl for local files
-        try:
+        # Fetch the entire file then parse. This is more reliable than fromUrl
+        # for local files, and is the fallback when range requests fail
+        def load_full_file():
             def handle_fetch_response(response):
                 return response.arrayBuffer()
 
@@ -1039,14 +1518,118 @@ class Map(Macro):
                 pass
 
             # Fetch the file
-            fetch_promise = js.fetch(url)
+            fetch_options = js.Object.new()
+            if signal is not None:
+                fetch_options.signal = signal
+            fetch_promise = js.fetch(url, fetch_options)
             fetch_promise.then(create_proxy(handle_fetch_response), create_proxy(handle_fetch_error)).then(create_proxy(handle_array_buffer))
 
+        def load_raster():
+            if max_width and url.startswith(('http://', 'https://')):
+                # Read only the header now; raster tiles are fetched by range
+                # when the rasters are read
+                def handle_range_error(error):
+                    if signal is not None and signal.aborted:
+                        return
+                    print(f"Range requests failed for {url}, downloading the whole file")
+                    load_full_file()
+
+                range_options = js.Object.new()
+                range_options.allowFullFile = False
+                js.GeoTIFF.fromUrl(url, range_options, signal).then(
+                    create_proxy(handle_geotiff_loaded), create_proxy(handle_range_error))
+            else:
+                load_full_file()
+
+        try:
+            if cache_key is not None:
+                def handle_cached(cached):
+                    if not cached:
+                        load_raster()
+                        return
+                    blob, bounds = cached
+                    blob_url = js.URL.createObjectURL(blob)
+                    layer = self._add_image_overlay(blob_url, bounds, opacity,
+                                                    layer_name if add_to_control else None)
+
+                    # The image element holds its own copy once loaded
+                    def release(event=None):
+                        layer.off('load error', release_proxy)
+                        release_proxy.destroy()
+                        js.URL.revokeObjectURL(blob_url)
+
+                    release_proxy = create_proxy(release)
+                    layer.on('load error', release_proxy)
+
+                _raster_cache.get(cache_key, handle_cached)
+            else:
+                load_raster()
+
         except:
             return None
 
         return None  # Layer will be added asynchronously
 
+    def _add_image_overlay(self, data_url, bounds, opacity, layer_name=None):
+        """
+        Add a rendered raster as an image overlay and zoom to it.
+
+        Args:
+            data_url: Image URL for the overlay
+            bounds: (south, west, north, east) in degrees
+            opacity: Layer opacity (0-1)
+            layer_name: Name for the layer control, or None to leave it out
+
+        Returns:
+            The Leaflet ImageOverlay layer
+        """
+        map_instance = self._get_state('map_instance')
+        south, west, north, east = bounds
+
+        # Create bounds array for Leaflet: [[south, west], [north, east]]
+        js_bounds = js.Array.new()
+        sw_corner = js.Array.new()
+        sw_corner.push(south)
+        sw_corner.push(west)
+        ne_corner = js.Array.new()
+        ne_corner.push(north)
+        ne_corner.push(east)
+        js_bounds.push(sw_corner)
+        js_bounds.push(ne_corner)
+
+        # Create image overlay with crisp rendering options
+        overlay_options = js.Object.new()
+        overlay_options.opacity = opacity
+        overlay_options.className = 'geotiff-overlay'
+
+        layer = js.L.imageOverlay(data_url, js_bounds, overlay_options).addTo(map_instance)
+
+        # Add CSS for crisp image rendering (no blurring when scaling)
+        try:
+            img_element = layer.getElement()
+            if img_element:
+                img_element.style.imageRendering = 'pixelated'
+                img_element.style.setProperty('image-rendering', '-webkit-optimize-contrast', 'important')
+        except:
+            pass
+
+        # Store layer reference
+        layers = self._get_state('layers')
+        layers.append(layer)
+        self._set_state(layers=layers)
+
+        # Add to layer control
+        if layer_name:
+            self._add_to_layer_control(layer, layer_name)
+
+        # Zoom to layer bounds
+        try:
+            map_instance.fitBounds(js_bounds)
+        except:
+            pass
+
+        return layer
+
     def remove_layer(self, layer):
         """
         Remove a layer (shapefile, GeoJSON, GeoTIFF, etc.) from the map.
@@ -3,7 +3,7 @@ Pagination macro - A reusable pagination component.
 Uses unique IDs and safe event handling for multiple instances.
 """
 from .base import Macro
-from ..elements import Div, Button, Span
+from ..elements import Div, Button, Input, Span
 
 
 class Pagination(Macro):
@@ -14,7 +14,8 @@ class Pagination(Macro):
     
     def __init__(self, total_items=0, items_per_page=10, current_page=1, 
                  max_visible_pages=7, show_first_last=True, show_prev_next=True,
-                 show_page_info=True, button_style=None, container_style=None, **kwargs):
+                 show_page_info=True, show_page_jump=False, button_style=None,
+                 container_style=None, **kwargs):
         """
         Initialize a pagination component.
         
@@ -26,6 +27,7 @@ class Pagination(Macro):
             show_first_last: Whether to show first/last page buttons
             show_prev_next: Whether to show previous/next buttons
             show_page_info: Whether to show page info text
+            show_page_jump: Whether to show a number input for jumping to a page
             button_style: Custom styles for buttons
             container_style: Custom styles for container
         """
@@ -44,7 +46,8 @@ class Pagination(Macro):
             max_visible_pages=max_visible_pages,
             show_first_last=show_first_last,
             show_prev_next=show_prev_next,
-            show_page_info=show_page_info
+            show_page_info=show_page_info,
+            show_page_jump=show_page_jump
         )
         
         # Add callback types
@@ -78,6 +81,25 @@ class Pagination(Macro):
         self._container_style = self._merge_styles(default_container_style, container_style)
         self._button_style = self._merge_styles(default_button_style, button_style)
         
+        # Styles for each button state; every state sets the same properties
+        # so switching between them never leaves one behind
+        normal_style = {
+            "display": None,
+            "opacity": None,
+            "cursor": self._button_style.get("cursor"),
+            "background_color": self._button_style.get("background_color"),
+            "color": self._button_style.get("color"),
+            "border_color": "#ddd"
+        }
+        self._state_styles = {
+            'normal': normal_style,
+            'disabled': {**normal_style, "opacity": "0.5", "cursor": "not-allowed",
+                         "background_color": "#f8f9fa"},
+            'current': {**normal_style, "background_color": "#007bff", "color": "white",
+                        "border_color": "#007bff"},
+            'hidden': {**normal_style, "display": "none"}
+        }
+        
         # Initialize macro
         self._init_macro()
     
@@ -92,84 +114,96 @@ class Pagination(Macro):
         return container
     
     def _create_pagination_buttons(self, container):
-        """Create pagination buttons."""
-        current_page = self._get_state('current_page')
-        total_pages = self._get_state('total_pages')
-        show_first_last = self._get_state('show_first_last')
-        show_prev_next = self._get_state('show_prev_next')
-        show_page_info = self._get_state('show_page_info')
+        """
+        Create the pagination controls once.
+
+        There is a fixed slot for every control that can be shown, so page
+        changes rewrite the existing buttons instead of rebuilding the DOM.
+        """
+        self._buttons = []
+        self._button_states = []
         
         # Page info
-        if show_page_info:
-            info_text = self._create_page_info()
-            container.add(info_text)
+        self._info = None
+        if self._get_state('show_page_info'):
+            self._info = Span(style={
+                "margin_right": "15px",
+                "font_size": "14px",
+                "color": "#666"
+            })
+            container.add(self._info)
         
-        # First page button
-        if show_first_last and total_pages > 1:
-            first_btn = self._create_button("«", 1, current_page == 1)
-            container.add(first_btn)
+        show_first_last = self._get_state('show_first_last')
+        show_prev_next = self._get_state('show_prev_next')
         
-        # Previous button
-        if show_prev_next and total_pages > 1:
-            prev_btn = self._create_button("‹", max(1, current_page - 1), current_page == 1)
-            container.add(prev_btn)
+        # First/previous buttons
+        self._first_btn = self._create_button(container, "«") if show_first_last else None
+        self._prev_btn = self._create_button(container, "‹") if show_prev_next else None
         
         # Page number buttons
-        page_buttons = self._get_visible_page_range()
-        for page_num in page_buttons:
-            is_current = page_num == current_page
-            page_btn = self._create_button(str(page_num), page_num, False, is_current)
-            container.add(page_btn)
-        
-        # Next button
-        if show_prev_next and total_pages > 1:
-            next_btn = self._create_button("›", min(total_pages, current_page + 1), current_page == total_pages)
-            container.add(next_btn)
-        
-        # Last page button
-        if show_first_last and total_pages > 1:
-            last_btn = self._create_button("»", total_pages, current_page == total_pages)
-            container.add(last_btn)
-    
-    def _create_button(self, text, page_num, disabled=False, is_current=False):
-        """Create a pagination button."""
-        button_style = self._button_style.copy()
-        
-        if disabled:
-            button_style.update({
-                "opacity": "0.5",
-                "cursor": "not-allowed",
-                "background_color": "#f8f9fa"
-            })
-        elif is_current:
-            button_style.update({
-                "background_color": "#007bff",
-                "color": "white",
-                "border_color": "#007bff"
+        self._page_buttons = [self._create_button(container)
+                              for _ in range(self._get_state('max_visible_pages'))]
+        
+        # Next/last buttons
+        self._next_btn = self._create_button(container, "›") if show_prev_next else None
+        self._last_btn = self._create_button(container, "»") if show_first_last else None
+        
+        # Direct page entry
+        self._jump_input = None
+        if self._get_state('show_page_jump'):
+            self._jump_input = Input("number", min=1, style={
+                "width": "70px",
+                "padding": "7px",
+                "border": "1px solid #ddd",
+                "border_radius": "4px",
+                "font_size": "14px"
             })
+            self._jump_input.set_attribute("aria-label", "Go to page")
+            self._jump_input.on_change(self._handle_page_jump)
+            container.add(self._jump_input)
         
-        btn = Button(text, style=button_style)
+        # One listener serves every page button
+        container.on_click(self._handle_container_click)
         
-        if not disabled:
-            btn.on_click(lambda e, page=page_num: self._handle_page_click(page))
-            
-            if not is_current:
-                btn.on_mouseenter(lambda e, b=btn: self._set_button_hover(b, True))
-                btn.on_mouseleave(lambda e, b=btn: self._set_button_hover(b, False))
-        
-        return btn
+        self._update_pagination()
+    
+    def _create_button(self, container, text=""):
+        """Create a pagination button slot and return its index."""
+        index = len(self._buttons)
+        btn = Button(text, style=self._button_style)
+        btn.on_mouseenter(lambda e: self._set_button_hover(index, True))
+        btn.on_mouseleave(lambda e: self._set_button_hover(index, False))
+        container.add(btn)
+        
+        self._buttons.append(btn)
+        self._button_states.append(None)
+        return index
+    
+    def _set_button(self, index, page_num, state, text=None):
+        """Point a button slot at a page and restyle it if its state changed."""
+        if index is None:
+            return
+        btn = self._buttons[index]
+        btn._dom_element.dataset.page = page_num
+        if text is not None:
+            btn.set_text(text)
+        if self._button_states[index] != state:
+            self._button_states[index] = state
+            btn.style.update(self._state_styles[state])
     
-    def _set_button_hover(self, button, is_hover):
+    def _set_button_hover(self, index, is_hover):
         """Set button hover state."""
+        if self._button_states[index] != 'normal':
+            return
+        button = self._buttons[index]
         if is_hover:
             button.style.background_color = "#e9ecef"
             button.style.border_color = "#adb5bd"
         else:
-            button.style.background_color = "#fff"
-            button.style.border_color = "#ddd"
+            button.style.update(self._state_styles['normal'])
     
-    def _create_page_info(self):
-        """Create page information text."""
+    def _page_info_text(self):
+        """Page information text."""
         current_page = self._get_state('current_page')
         total_pages = self._get_state('total_pages')
         total_items = self._get_state('total_items')
@@ -178,13 +212,7 @@ class Pagination(Macro):
         start_item = (current_page - 1) * items_per_page + 1
         end_item = min(current_page * items_per_page, total_items)
         
-        info_text = f"Showing {start_item}-{end_item} of {total_items} items (Page {current_page} of {total_pages})"
-        
-        return Span(info_text, style={
-            "margin_right": "15px",
-            "font_size": "14px",
-            "color": "#666"
-        })
+        return f"Showing {start_item}-{end_item} of {total_items} items (Page {current_page} of {total_pages})"
     
     def _get_visible_page_range(self):
         """Get the range of page numbers to display."""
@@ -214,14 +242,55 @@ class Pagination(Macro):
             self._update_pagination()
             self._trigger_callbacks('page_change', page_num, old_page)
     
+    def _handle_container_click(self, event):
+        """Route clicks on page buttons to their page."""
+        # Other children have no data-page, and reading a missing one raises
+        page = getattr(event.target.dataset, "page", None)
+        if page:
+            self._handle_page_click(int(page))
+    
+    def _handle_page_jump(self, event):
+        """Go to the page typed into the page number input."""
+        try:
+            page_num = int(event.target.value)
+        except ValueError:
+            page_num = None
+        total_pages = self._get_state('total_pages')
+        if page_num is not None and 1 <= page_num <= total_pages:
+            self._handle_page_click(page_num)
+        else:
+            # Out of range; show the current page again
+            event.target.value = str(self._get_state('current_page'))
+    
     def _update_pagination(self):
-        """Update pagination display."""
-        container = self._get_element('container')
-        if container:
-            # Clear existing buttons
-            container._dom_element.innerHTML = ""
-            # Recreate pagination
-            self._create_pagination_buttons(container)
+        """Update pagination display in place."""
+        current_page = self._get_state('current_page')
+        total_pages = self._get_state('total_pages')
+        
+        if self._info is not None:
+            self._info.set_text(self._page_info_text())
+        
+        # Navigation buttons are only shown when there is somewhere to go
+        at_first = 'hidden' if total_pages <= 1 else 'disabled' if current_page == 1 else 'normal'
+        at_last = 'hidden' if total_pages <= 1 else 'disabled' if current_page == total_pages else 'normal'
+        self._set_button(self._first_btn, 1, at_first)
+        self._set_button(self._prev_btn, max(1, current_page - 1), at_first)
+        self._set_button(self._next_btn, min(total_pages, current_page + 1), at_last)
+        self._set_button(self._last_btn, total_pages, at_last)
+        
+        # Page number buttons; slots past the visible range are hidden
+        page_buttons = self._get_visible_page_range()
+        for slot, index in enumerate(self._page_buttons):
+            if slot < len(page_buttons):
+                page_num = page_buttons[slot]
+                state = 'current' if page_num == current_page else 'normal'
+                self._set_button(index, page_num, state, str(page_num))
+            else:
+                self._set_button(index, "", 'hidden')
+        
+        if self._jump_input is not None:
+            self._jump_input.set_attribute("max", total_pages)
+            self._jump_input.value = current_page
     
     def set_page(self, page_num):
         """Set current page."""
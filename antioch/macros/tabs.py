@@ -10,11 +10,17 @@ from ..elements import Div, Button
 
 
 class Tab:
-    """Represents a single tab with content."""
+    """
+    Represents a single tab with content.
 
-    def __init__(self, title, content=None, tab_id=None, disabled=False):
+    Content can be given up front, or as a content_factory called the first
+    time the tab is shown; its result is kept as the tab's content.
+    """
+
+    def __init__(self, title, content=None, tab_id=None, disabled=False, content_factory=None):
         self.title = title
         self.content = content or ""
+        self.content_factory = content_factory
         self.tab_id = tab_id or str(uuid.uuid4())[:8]
         self.disabled = disabled
         self.tab_button = None
@@ -294,6 +300,11 @@ class Tabs(Macro):
         container = self._get_element("content_container")
         container._dom_element.innerHTML = ""
 
+        # Build deferred content on first activation only
+        if not tab.content and tab.content_factory is not None:
+            tab.content = tab.content_factory() or ""
+            tab.content_factory = None
+
         if tab.content:
             if isinstance(tab.content, str):
                 from ..elements import P
@@ -316,6 +327,7 @@ class Tabs(Macro):
             return self
 
         tab.content = content
+        tab.content_factory = None
 
         if tab.tab_id == self._get_state("active_tab_id"):
             container = self._get_element("content_container")
@@ -0,0 +1,40 @@
+"""
+Shared style dictionaries for the example demos.
+
+Style dicts are only read when applied to an element, so demos can pass
+these constants directly and build local variants with {**BASE, ...}.
+"""
+
+# Action buttons
+_BUTTON = {
+    "color": "white",
+    "border": "none",
+    "padding": "8px 16px",
+    "border_radius": "4px",
+    "cursor": "pointer"
+}
+BTN_SUCCESS = {**_BUTTON, "background_color": "#28a745"}
+BTN_DANGER = {**_BUTTON, "background_color": "#dc3545"}
+BTN_SECONDARY = {**_BUTTON, "background_color": "#6c757d"}
+
+# White button used on coloured backgrounds
+BTN_LIGHT = {
+    "background_color": "white",
+    "color": "#667eea",
+    "border": "none",
+    "padding": "12px 24px",
+    "border_radius": "6px",
+    "cursor": "pointer",
+    "margin_top": "20px",
+    "font_weight": "bold"
+}
+
+# Section headers
+SECTION_HEADER = {"margin_bottom": "20px"}
+SECTION_TITLE = {"margin": "0 0 10px 0"}
+SECTION_SUBTITLE = {"color": "#666", "margin": "0"}
+ACCENT_HEADING = {"color": "#007bff"}
+SECTION_RULE = {"margin": "30px 0"}
+
+# Cards and panels
+CARD_SHADOW = {"box_shadow": "0 2px 4px rgba(0,0,0,0.1)"}
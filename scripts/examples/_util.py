@@ -0,0 +1,89 @@
+"""
+Shared helpers for the example demos.
+"""
+from functools import lru_cache
+
+import js
+from pyodide.ffi import create_once_callable, create_proxy
+
+_KB = 1024
+_MB = 1024 * 1024
+_GB = 1024 * 1024 * 1024
+
+# Characters shown in file previews
+PREVIEW_CHARS = 200
+
+# Geospatial file types accepted by the file demos
+GEO_EXT = ('.zip', '.tif', '.tiff', '.geotiff', '.geojson', '.json')
+
+
+@lru_cache(maxsize=1024)
+def format_size(size_bytes):
+    """Format file size in human-readable format."""
+    if size_bytes < _KB:
+        return f"{size_bytes} B"
+    elif size_bytes < _MB:
+        return f"{size_bytes / _KB:.1f} KB"
+    elif size_bytes < _GB:
+        return f"{size_bytes / _MB:.1f} MB"
+    else:
+        return f"{size_bytes / _GB:.1f} GB"
+
+
+def preview_text(content, limit=PREVIEW_CHARS):
+    """
+    Return the start of text content for a preview, or None for binary data.
+
+    Only the head is sliced, so the cost does not grow with the file size.
+    """
+    if not isinstance(content, str) or not content:
+        return None
+    head = content[:limit]
+    return head + "..." if len(content) > limit else head
+
+
+def run_when_idle(callback):
+    """Run callback once the browser is idle, after the page has painted."""
+    once = create_once_callable(lambda *args: callback())
+    if hasattr(js, "requestIdleCallback"):
+        js.requestIdleCallback(once)
+    else:
+        js.setTimeout(once, 0)
+
+
+def on_settled(promise, on_fulfilled, on_rejected):
+    """
+    Chain fulfil/reject handlers onto a promise.
+
+    Both proxies are released once either runs; a once-callable would leak
+    whenever the other outcome happens instead.
+    """
+    def settle(callback, value):
+        fulfilled.destroy()
+        rejected.destroy()
+        return callback(value)
+
+    fulfilled = create_proxy(lambda value: settle(on_fulfilled, value))
+    rejected = create_proxy(lambda error: settle(on_rejected, error))
+    return promise.then(fulfilled, rejected)
+
+
+def object_url(content, mime_type):
+    """
+    Create a blob: URL for VFS file content.
+
+    Bytes are handed to the Blob as a view of Pyodide's memory, so the Blob's
+    own copy is the only one made.
+    """
+    options = js.Object.new(type=mime_type)
+    if isinstance(content, str):
+        return js.URL.createObjectURL(js.Blob.new([content], options))
+
+    proxy = create_proxy(content)
+    buffer = proxy.getBuffer("u8")
+    try:
+        blob = js.Blob.new([buffer.data], options)
+    finally:
+        buffer.release()
+        proxy.destroy()
+    return js.URL.createObjectURL(blob)
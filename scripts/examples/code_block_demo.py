@@ -8,10 +8,18 @@ Shows various languages, themes, and editable/readonly modes.
 
 from antioch import DOM, Div, H1, H2, H3, P, Button, Hr
 from antioch.macros import CodeBlock, Tabs, Tab
-import js
+import functools
 
-# Sample code for different languages
-PYTHON_CODE = '''def fibonacci(n):
+# Log editor changes to the console (off by default; runs on every edit)
+_DEBUG_EDITOR = False
+
+# Maximum number of characters shown by "Get Content"
+_PREVIEW_CHARS = 500
+
+# Sample code for different languages, built on first use
+@functools.cache
+def _python_code():
+    return '''def fibonacci(n):
     """Generate Fibonacci sequence up to n terms."""
     a, b = 0, 1
     result = []
@@ -25,7 +33,10 @@ fib_sequence = fibonacci(10)
 print(f"First 10 Fibonacci numbers: {fib_sequence}")
 '''
 
-JAVASCRIPT_CODE = '''// Async/await example with error handling
+
+@functools.cache
+def _javascript_code():
+    return '''// Async/await example with error handling
 async function fetchUserData(userId) {
     try {
         const response = await fetch(`/api/users/${userId}`);
@@ -44,7 +55,10 @@ async function fetchUserData(userId) {
 fetchUserData(123).then(user => console.log(user));
 '''
 
-HTML_CODE = '''<!DOCTYPE html>
+
+@functools.cache
+def _html_code():
+    return '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -65,7 +79,10 @@ HTML_CODE = '''<!DOCTYPE html>
 </html>
 '''
 
-CSS_CODE = '''/* Modern CSS with Grid and Flexbox */
+
+@functools.cache
+def _css_code():
+    return '''/* Modern CSS with Grid and Flexbox */
 .card {
     display: flex;
     flex-direction: column;
@@ -86,7 +103,10 @@ CSS_CODE = '''/* Modern CSS with Grid and Flexbox */
 }
 '''
 
-JSON_CODE = '''{
+
+@functools.cache
+def _json_code():
+    return '''{
   "name": "antioch",
   "version": "1.0.0",
   "description": "Build web apps in Python",
@@ -158,7 +178,7 @@ def create_readonly_section():
 
     # Python tab
     python_code = CodeBlock(
-        content=PYTHON_CODE,
+        content=_python_code(),
         language="python",
         editable=False,
         line_numbers=True,
@@ -169,7 +189,7 @@ def create_readonly_section():
 
     # JavaScript tab
     js_code = CodeBlock(
-        content=JAVASCRIPT_CODE,
+        content=_javascript_code(),
         language="javascript",
         editable=False,
         line_numbers=True,
@@ -180,7 +200,7 @@ def create_readonly_section():
 
     # HTML tab
     html_code = CodeBlock(
-        content=HTML_CODE,
+        content=_html_code(),
         language="html",
         editable=False,
         line_numbers=True,
@@ -191,7 +211,7 @@ def create_readonly_section():
 
     # CSS tab
     css_code = CodeBlock(
-        content=CSS_CODE,
+        content=_css_code(),
         language="css",
         editable=False,
         line_numbers=True,
@@ -202,7 +222,7 @@ def create_readonly_section():
 
     # JSON tab
     json_code = CodeBlock(
-        content=JSON_CODE,
+        content=_json_code(),
         language="json",
         editable=False,
         line_numbers=True,
@@ -245,13 +265,14 @@ def create_editable_section():
     default_title.style.margin = "0 0 10px 0"
     default_title.style.color = "#555"
     default_editor = CodeBlock(
-        content=PYTHON_CODE,
+        content=_python_code(),
         language="python",
         editable=True,
         theme="default",
         height="250px"
     )
-    default_editor.on_change(lambda editor, content: print(f"Default editor changed: {len(content)} chars"))
+    if _DEBUG_EDITOR:
+        default_editor.on_change(lambda editor, content: print(f"Default editor changed: {len(content)} chars"))
     default_container.add(default_title, default_editor.element)
     grid.add(default_container)
 
@@ -261,13 +282,14 @@ def create_editable_section():
     monokai_title.style.margin = "0 0 10px 0"
     monokai_title.style.color = "#555"
     monokai_editor = CodeBlock(
-        content=JAVASCRIPT_CODE,
+        content=_javascript_code(),
         language="javascript",
         editable=True,
         theme="monokai",
         height="250px"
     )
-    monokai_editor.on_change(lambda editor, content: print(f"Monokai editor changed: {len(content)} chars"))
+    if _DEBUG_EDITOR:
+        monokai_editor.on_change(lambda editor, content: print(f"Monokai editor changed: {len(content)} chars"))
     monokai_container.add(monokai_title, monokai_editor.element)
     grid.add(monokai_container)
 
@@ -277,13 +299,14 @@ def create_editable_section():
     dracula_title.style.margin = "0 0 10px 0"
     dracula_title.style.color = "#555"
     dracula_editor = CodeBlock(
-        content=CSS_CODE,
+        content=_css_code(),
         language="css",
         editable=True,
         theme="dracula",
         height="250px"
     )
-    dracula_editor.on_change(lambda editor, content: print(f"Dracula editor changed: {len(content)} chars"))
+    if _DEBUG_EDITOR:
+        dracula_editor.on_change(lambda editor, content: print(f"Dracula editor changed: {len(content)} chars"))
     dracula_container.add(dracula_title, dracula_editor.element)
     grid.add(dracula_container)
 
@@ -293,13 +316,14 @@ def create_editable_section():
     material_title.style.margin = "0 0 10px 0"
     material_title.style.color = "#555"
     material_editor = CodeBlock(
-        content=HTML_CODE,
+        content=_html_code(),
         language="html",
         editable=True,
         theme="material",
         height="250px"
     )
-    material_editor.on_change(lambda editor, content: print(f"Material editor changed: {len(content)} chars"))
+    if _DEBUG_EDITOR:
+        material_editor.on_change(lambda editor, content: print(f"Material editor changed: {len(content)} chars"))
     material_container.add(material_title, material_editor.element)
     grid.add(material_container)
 
@@ -326,7 +350,7 @@ def create_interactive_section():
 
     # Create editor
     editor = CodeBlock(
-        content=PYTHON_CODE,
+        content=_python_code(),
         language="python",
         editable=True,
         theme="default",
@@ -390,6 +414,9 @@ def create_interactive_section():
     output.style.white_space = "pre_wrap"
     section.add(output)
 
+    # Keep the output node on the editor so show_content skips the DOM lookup
+    editor._output = output.dom_element
+
     return section
 
 
@@ -415,11 +442,11 @@ def toggle_editable(editor):
 
 def show_content(editor):
     """Display current editor content."""
-    import js
     content = editor.get_content()
-    output = js.document.getElementById("output_area")
-    if output:
-        output.textContent = f"Current content ({len(content)} characters):\n\n{content[:500]}..."
+    n = len(content)
+    # Only slice when needed; the preview is capped so huge documents don't hit layout
+    body = content if n <= _PREVIEW_CHARS else content[:_PREVIEW_CHARS] + "..."
+    editor._output.textContent = f"Current content ({n} characters):\n\n{body}"
 
 
 if __name__ == "__main__":
@@ -7,6 +7,9 @@ from antioch import Div, H1, H2, H3, P, Button, Input, Span, DOM
 # Import the base classes for creating custom macros
 from antioch.macros import Macro, SimpleMacro, Counter
 
+# Progress labels are limited to whole percents, so build them once
+_PCT_STRINGS = tuple(f"{i}%" for i in range(101))
+
 
 class ProgressBar(Macro):
     """
@@ -83,6 +86,18 @@ class ProgressBar(Macro):
         
         container.add(progress_fill, progress_text)
         
+        # Keep direct references so display updates skip the registry lookup
+        self._fill = progress_fill
+        self._text = progress_text
+        self._last_pct = -1
+        self._text_color = "#495057"
+        
+        # Fill style is rewritten as a single cssText assignment per update
+        self._fill_css = (
+            f"height:100%;background-color:{self._get_state('color')};"
+            "transition:width 0.3s ease;position:absolute;left:0;top:0;width:"
+        )
+        
         # Set initial progress
         self._update_display()
         
@@ -97,18 +112,20 @@ class ProgressBar(Macro):
         percentage = min(100, max(0, (progress / max_progress) * 100))
         
         # Update fill width
-        fill = self._get_element('progress_fill')
-        fill.style.width = f"{percentage}%"
+        self._fill.dom_element.style.cssText = f"{self._fill_css}{percentage}%"
         
-        # Update text
-        text = self._get_element('progress_text')
-        text.set_text(f"{percentage:.0f}%")
+        # Change text color based on progress, only when it flips; checked
+        # before the text, since 50 -> 50.2 flips it without changing the text
+        text_color = "white" if percentage > 50 else "#495057"
+        if text_color != self._text_color:
+            self._text_color = text_color
+            self._text.style.color = text_color
         
-        # Change text color based on progress
-        if percentage > 50:
-            text.style.color = "white"
-        else:
-            text.style.color = "#495057"
+        # Text only changes when the rounded percentage does
+        pct = round(percentage)
+        if pct != self._last_pct:
+            self._last_pct = pct
+            self._text.set_text(_PCT_STRINGS[pct])
     
     def set_progress(self, value):
         """Set the progress value."""
@@ -119,7 +136,8 @@ class ProgressBar(Macro):
         value = max(0, min(max_progress, value))
         
         self._set_state(progress=value)
-        self._update_display()
+        if value != old_progress:
+            self._update_display()
         
         # Trigger callbacks
         self._trigger_callbacks('progress_change', value, old_progress)
@@ -300,12 +318,9 @@ def create_counter_with_progress_demo():
     progress_bar = ProgressBar(max_progress=100, color="#6f42c1")
     
     # Connect them
-    def update_progress(macro, new_value, old_value):
-        progress_bar.set_progress(new_value)
-        if new_value == 100:
-            print("🎉 Goal reached!")
-    
-    counter.on_change(update_progress)
+    counter.bind(progress_bar)
+    counter.on_change(lambda macro, new_value, old_value:
+                      print("🎉 Goal reached!") if new_value == 100 else None)
     
     demo_section.add(counter.element)
     demo_section.add(progress_bar.element)
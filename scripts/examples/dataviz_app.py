@@ -2,8 +2,92 @@
 Data Visualization App - A comprehensive spreadsheet and charting application.
 Demonstrates advanced macro usage with DataTable and Chart components.
 """
-from antioch import Div, H1, H2, P, Button, Select, Option, DOM
+from html import escape
+from operator import itemgetter
+import js
+from pyodide.ffi import create_proxy
+from antioch import Div, H1, H2, P, Button, Select, DOM
 from antioch.macros import DataTable, ChartJS as Chart, Tabs, Tab, Modal
+from ._styles import (
+    BTN_SUCCESS, BTN_DANGER, BTN_SECONDARY, CARD_SHADOW,
+    SECTION_HEADER, SECTION_TITLE, SECTION_SUBTITLE
+)
+
+# Delay (ms) used to coalesce bursts of edits into one chart update
+_UPDATE_DELAY_MS = 50
+
+
+# Column layout shared by the sample datasets without fixed widths
+_DEFAULT_COLUMNS = (
+    {"title": "Month", "field": "month", "editor": "input"},
+    {"title": "Revenue", "field": "revenue", "editor": "number", "formatter": "money"},
+    {"title": "Units Sold", "field": "units", "editor": "number"},
+    {"title": "Profit", "field": "profit", "editor": "number", "formatter": "money"}
+)
+
+# Sample datasets, built once at import and shared by every app instance
+_SAMPLE_DATASETS = {
+    "sales": {
+        "name": "Monthly Sales Data",
+        "columns": [
+            {"title": "Month", "field": "month", "editor": "input", "width": 150},
+            {"title": "Revenue", "field": "revenue", "editor": "number", "formatter": "money", "width": 150},
+            {"title": "Units Sold", "field": "units", "editor": "number", "width": 150},
+            {"title": "Profit", "field": "profit", "editor": "number", "formatter": "money", "width": 150}
+        ],
+        "data": [
+            {"month": "January", "revenue": 45000, "units": 120, "profit": 12000},
+            {"month": "February", "revenue": 52000, "units": 135, "profit": 14500},
+            {"month": "March", "revenue": 38000, "units": 95, "profit": 9500},
+            {"month": "April", "revenue": 61000, "units": 165, "profit": 18500},
+            {"month": "May", "revenue": 55000, "units": 140, "profit": 16000},
+            {"month": "June", "revenue": 67000, "units": 180, "profit": 21000}
+        ]
+    },
+    "performance": {
+        "name": "Team Performance Metrics",
+        "columns": _DEFAULT_COLUMNS,
+        "data": [
+            {"month": "Alice", "revenue": 28, "units": 9.2, "profit": 85},
+            {"month": "Bob", "revenue": 32, "units": 8.7, "profit": 92},
+            {"month": "Carol", "revenue": 25, "units": 9.5, "profit": 88},
+            {"month": "David", "revenue": 30, "units": 8.9, "profit": 90},
+            {"month": "Eve", "revenue": 27, "units": 9.1, "profit": 87}
+        ]
+    },
+    "budget": {
+        "name": "Department Budget Allocation",
+        "columns": _DEFAULT_COLUMNS,
+        "data": [
+            {"month": "Engineering", "revenue": 120000, "units": 130000, "profit": 125000},
+            {"month": "Marketing", "revenue": 80000, "units": 95000, "profit": 90000},
+            {"month": "Sales", "revenue": 60000, "units": 70000, "profit": 75000},
+            {"month": "HR", "revenue": 40000, "units": 45000, "profit": 42000},
+            {"month": "Operations", "revenue": 95000, "units": 100000, "profit": 105000}
+        ]
+    }
+}
+
+
+def _as_number(val):
+    """Coerce a cell value to float, or None if it isn't numeric."""
+    if isinstance(val, (int, float)) and not isinstance(val, bool):
+        return float(val)
+    if isinstance(val, str):
+        try:
+            return float(val)
+        except ValueError:
+            return None
+    return None
+
+
+def _column_values(rows, field):
+    """Extract one field from every row, using None for missing cells."""
+    try:
+        return list(map(itemgetter(field), rows))
+    except KeyError:
+        # Sparse rows: fall back to per-row lookups
+        return [row.get(field) for row in rows]
 
 
 class DataVizApp:
@@ -13,63 +97,15 @@ class DataVizApp:
         self.data_table = None
         self.chart = None
         self.tabs = None
-        self.sample_datasets = self._get_sample_datasets()
+        self.sample_datasets = _SAMPLE_DATASETS
+        self._update_pending = False
+        self._columns_cache = []
+        self._row_keys = None
+        self._field_title_map = {}
+        self._first_field = None
+        self._flush_proxy = create_proxy(self._flush_update)
         self.setup_ui()
     
-    def _get_sample_datasets(self):
-        """Get sample datasets for the app."""
-        return {
-            "sales": {
-                "name": "Monthly Sales Data",
-                "columns": [
-                    {"title": "Month", "field": "month", "editor": "input", "width": 150},
-                    {"title": "Revenue", "field": "revenue", "editor": "number", "formatter": "money", "width": 150},
-                    {"title": "Units Sold", "field": "units", "editor": "number", "width": 150},
-                    {"title": "Profit", "field": "profit", "editor": "number", "formatter": "money", "width": 150}
-                ],
-                "data": [
-                    {"month": "January", "revenue": 45000, "units": 120, "profit": 12000},
-                    {"month": "February", "revenue": 52000, "units": 135, "profit": 14500},
-                    {"month": "March", "revenue": 38000, "units": 95, "profit": 9500},
-                    {"month": "April", "revenue": 61000, "units": 165, "profit": 18500},
-                    {"month": "May", "revenue": 55000, "units": 140, "profit": 16000},
-                    {"month": "June", "revenue": 67000, "units": 180, "profit": 21000}
-                ]
-            },
-            "performance": {
-                "name": "Team Performance Metrics",
-                "columns": [
-                    {"title": "Month", "field": "month", "editor": "input"},
-                    {"title": "Revenue", "field": "revenue", "editor": "number", "formatter": "money"},
-                    {"title": "Units Sold", "field": "units", "editor": "number"},
-                    {"title": "Profit", "field": "profit", "editor": "number", "formatter": "money"}
-                ],
-                "data": [
-                    {"month": "Alice", "revenue": 28, "units": 9.2, "profit": 85},
-                    {"month": "Bob", "revenue": 32, "units": 8.7, "profit": 92},
-                    {"month": "Carol", "revenue": 25, "units": 9.5, "profit": 88},
-                    {"month": "David", "revenue": 30, "units": 8.9, "profit": 90},
-                    {"month": "Eve", "revenue": 27, "units": 9.1, "profit": 87}
-                ]
-            },
-            "budget": {
-                "name": "Department Budget Allocation",
-                "columns": [
-                    {"title": "Month", "field": "month", "editor": "input"},
-                    {"title": "Revenue", "field": "revenue", "editor": "number", "formatter": "money"},
-                    {"title": "Units Sold", "field": "units", "editor": "number"},
-                    {"title": "Profit", "field": "profit", "editor": "number", "formatter": "money"}
-                ],
-                "data": [
-                    {"month": "Engineering", "revenue": 120000, "units": 130000, "profit": 125000},
-                    {"month": "Marketing", "revenue": 80000, "units": 95000, "profit": 90000},
-                    {"month": "Sales", "revenue": 60000, "units": 70000, "profit": 75000},
-                    {"month": "HR", "revenue": 40000, "units": 45000, "profit": 42000},
-                    {"month": "Operations", "revenue": 95000, "units": 100000, "profit": 105000}
-                ]
-            }
-        }
-    
     def setup_ui(self):
         """Set up the main application UI."""
         # Create main container
@@ -84,10 +120,11 @@ class DataVizApp:
         header = self._create_header()
         
         # Create tabs for different sections
+        self._charts_tab = Tab("Visualizations", self._create_charts_tab())
         self.tabs = Tabs(
             tabs=[
                 Tab("Data Editor", self._create_data_editor_tab()),
-                Tab("Visualizations", self._create_charts_tab()),
+                self._charts_tab,
                 Tab("Sample Data", self._create_samples_tab())
             ],
             container_style={
@@ -99,6 +136,9 @@ class DataVizApp:
             }
         )
         
+        # Build the chart the first time its tab is opened
+        self.tabs.on_change(lambda tabs, tab, old_id: self._ensure_chart() if tab is self._charts_tab else None)
+        
         main_container.add(header, self.tabs.element)
         DOM.add(main_container)
 
@@ -141,10 +181,10 @@ class DataVizApp:
         })
         
         # Section header
-        header = Div(style={"margin_bottom": "20px"})
-        header.add(H2("📝 Data Editor", style={"margin": "0 0 10px 0"}))
+        header = Div(style=SECTION_HEADER)
+        header.add(H2("📝 Data Editor", style=SECTION_TITLE))
         header.add(P("Edit your data in the spreadsheet below. Changes will automatically update the charts.", 
-                    style={"color": "#666", "margin": "0"}))
+                    style=SECTION_SUBTITLE))
         
         # Data table controls
         controls = Div(style={
@@ -155,36 +195,15 @@ class DataVizApp:
         })
         
         # Add sample data button
-        load_sample_btn = Button("Load Sample Data", style={
-            "background_color": "#28a745",
-            "color": "white",
-            "border": "none",
-            "padding": "8px 16px",
-            "border_radius": "4px",
-            "cursor": "pointer"
-        })
+        load_sample_btn = Button("Load Sample Data", style=BTN_SUCCESS)
         load_sample_btn.on_click(lambda e: self._show_sample_selector())
         
         # Clear data button
-        clear_btn = Button("Clear All", style={
-            "background_color": "#dc3545",
-            "color": "white",
-            "border": "none",
-            "padding": "8px 16px",
-            "border_radius": "4px",
-            "cursor": "pointer"
-        })
+        clear_btn = Button("Clear All", style=BTN_DANGER)
         clear_btn.on_click(lambda e: self._clear_data())
         
         # Export button
-        export_btn = Button("Export Data", style={
-            "background_color": "#6c757d",
-            "color": "white",
-            "border": "none",
-            "padding": "8px 16px",
-            "border_radius": "4px",
-            "cursor": "pointer"
-        })
+        export_btn = Button("Export Data", style=BTN_SECONDARY)
         export_btn.on_click(lambda e: self._export_data())
         
         controls.add(load_sample_btn, clear_btn, export_btn)
@@ -196,13 +215,19 @@ class DataVizApp:
             columns=default_dataset["columns"],
             height="500px",
             layout="fitData",
-            container_style={
-                "box_shadow": "0 2px 4px rgba(0,0,0,0.1)"
-            }
+            # Only render the rows in view (plus a buffer) for large datasets
+            options={
+                "index": "month",
+                "renderVertical": "virtual",
+                "renderVerticalBuffer": 300
+            },
+            container_style=CARD_SHADOW
         )
+        self._columns_cache = default_dataset["columns"]
+        self._row_keys = {row["month"] for row in default_dataset["data"]}
 
         # Connect data table changes to chart updates
-        self.data_table.on_cell_edited(lambda cell: self._update_charts())
+        self.data_table.on_cell_edited(lambda cell: self._on_cell_edited())
 
         container.add(header, controls, self.data_table.element)
         return container
@@ -212,10 +237,10 @@ class DataVizApp:
         container = Div(style={"padding": "20px"})
         
         # Section header
-        header = Div(style={"margin_bottom": "20px"})
-        header.add(H2("📈 Data Visualizations", style={"margin": "0 0 10px 0"}))
+        header = Div(style=SECTION_HEADER)
+        header.add(H2("📈 Data Visualizations", style=SECTION_TITLE))
         header.add(P("Interactive charts that automatically update when you modify the data.", 
-                    style={"color": "#666", "margin": "0"}))
+                    style=SECTION_SUBTITLE))
         
         # Chart controls
         controls = Div(style={
@@ -237,65 +262,77 @@ class DataVizApp:
             "border_radius": "4px",
             "min_width": "150px"
         })
-        self.column_select.on_change(lambda e: self._update_charts())
+        self.column_select.on_change(lambda e: self._schedule_update())
         
         controls.add(self.column_select)
         
-        # Create chart with Chart.js
-        self.chart = Chart(
-            config={
-                'type': 'bar',
-                'data': {
-                    'labels': [],
-                    'datasets': [{
-                        'label': 'Data Visualization',
-                        'data': [],
-                        'backgroundColor': 'rgba(54, 162, 235, 0.5)',
-                        'borderColor': 'rgba(54, 162, 235, 1)',
-                        'borderWidth': 1
-                    }]
-                },
-                'options': {
-                    'responsive': True,
-                    'maintainAspectRatio': False,
-                    'plugins': {
-                        'title': {
-                            'display': True,
-                            'text': 'Data Visualization',
-                            'font': {
-                                'size': 16
-                            }
-                        },
-                        'legend': {
-                            'display': True,
-                            'position': 'top'
+        # Chart.js config; the chart itself is built lazily by _ensure_chart
+        self._chart_config = {
+            'type': 'bar',
+            'data': {
+                'labels': [],
+                'datasets': [{
+                    'label': 'Data Visualization',
+                    'data': [],
+                    'backgroundColor': 'rgba(54, 162, 235, 0.5)',
+                    'borderColor': 'rgba(54, 162, 235, 1)',
+                    'borderWidth': 1
+                }]
+            },
+            'options': {
+                'responsive': True,
+                'maintainAspectRatio': False,
+                'plugins': {
+                    'title': {
+                        'display': True,
+                        'text': 'Data Visualization',
+                        'font': {
+                            'size': 16
                         }
                     },
-                    'scales': {
-                        'y': {
-                            'beginAtZero': True
-                        }
+                    'legend': {
+                        'display': True,
+                        'position': 'top'
+                    }
+                },
+                'scales': {
+                    'y': {
+                        'beginAtZero': True
                     }
                 }
-            },
-            width=700,
-            height=400
-        )
+            }
+        }
+        
+        # Keep references into the chart config so updates patch it in place
+        self._chart_data_ref = self._chart_config['data']
+        self._dataset_ref = self._chart_config['data']['datasets'][0]
+        self._title_ref = self._chart_config['options']['plugins']['title']
         
-        container.add(header, controls, self.chart.element)
+        self._chart_host = Div()
+        container.add(header, controls, self._chart_host)
         return container
     
+    def _ensure_chart(self):
+        """Create the Chart.js widget on first use."""
+        if self.chart:
+            return
+        # The chart reads the shared config, so it starts with any data
+        # already patched in by _update_charts
+        self.chart = Chart(config=self._chart_config, width=700, height=400)
+        self._chart_host.add(self.chart.element)
+    
     def _create_samples_tab(self):
         """Create the sample data tab."""
         container = Div(style={"padding": "20px"})
         
         # Section header
-        header = Div(style={"margin_bottom": "20px"})
-        header.add(H2("🎯 Sample Datasets", style={"margin": "0 0 10px 0"}))
+        header = Div(style=SECTION_HEADER)
+        header.add(H2("🎯 Sample Datasets", style=SECTION_TITLE))
         header.add(P("Choose from pre-made datasets to get started quickly.", 
-                    style={"color": "#666", "margin": "0"}))
+                    style=SECTION_SUBTITLE))
         
-        # Sample dataset buttons
+        # Sample dataset buttons, attached together once built
+        cards = []
         for key, dataset in self.sample_datasets.items():
             sample_card = Div(style={
                 "border": "1px solid #ddd",
@@ -338,8 +375,9 @@ class DataVizApp:
             load_btn.on_click(lambda e, dataset_key=key: self._load_sample_dataset(dataset_key))
             
             sample_card.add(load_btn)
-            container.add(sample_card)
+            cards.append(sample_card)
         
+        container.add(*cards)
         return container
     
     def _load_sample_dataset(self, dataset_key):
@@ -352,7 +390,13 @@ class DataVizApp:
         if self.data_table:
             # Just update data, not columns (to avoid expansion issues)
             # Note: This only works if datasets have same fields as sales
-            self.data_table.set_data(dataset["data"])
+            new_keys = {row["month"] for row in dataset["data"]}
+            if new_keys == self._row_keys:
+                # Same rows, new values: update in place instead of rebuilding
+                self.data_table.update_or_add_data(dataset["data"])
+            else:
+                self.data_table.set_data(dataset["data"])
+            self._row_keys = new_keys
 
         # Switch to data editor tab
         if self.tabs:
@@ -365,34 +409,51 @@ class DataVizApp:
         if not self.column_select or not self.data_table:
             return
 
-        columns = self.data_table._get_state('columns')
-
-        # Clear existing options
-        self.column_select._dom_element.innerHTML = ""
+        columns = self._columns_cache
+        self._index_columns(columns)
 
-        # Add default option
-        default_option = Option("Select a column...", value="")
-        self.column_select.add(default_option)
-
-        # Add column options
+        # Replace all options with a single DOM write
+        options = ['<option value="">Select a column...</option>']
         for i, col in enumerate(columns):
-            col_title = col.get('title', f'Column {i+1}')
-            col_field = col.get('field', '')
-            option = Option(f"{col_title}", value=col_field)
-            self.column_select.add(option)
+            col_title = escape(str(col.get('title', f'Column {i+1}')))
+            col_field = escape(str(col.get('field', '')))
+            options.append(f'<option value="{col_field}">{col_title}</option>')
+        self.column_select._dom_element.innerHTML = "".join(options)
+    
+    def _index_columns(self, columns):
+        """Cache field -> title lookups for the current columns."""
+        self._field_title_map = {
+            col.get('field'): col.get('title', col.get('field')) for col in columns
+        }
+        self._first_field = columns[0].get('field') if columns else None
+    
+    def _on_cell_edited(self):
+        """Handle a table edit."""
+        # Edits may change row keys, so the next dataset load does a full set
+        self._row_keys = None
+        self._schedule_update()
+    
+    def _schedule_update(self):
+        """Queue a chart update, collapsing rapid edits into one refresh."""
+        if self._update_pending:
+            return
+        self._update_pending = True
+        js.setTimeout(self._flush_proxy, _UPDATE_DELAY_MS)
+    
+    def _flush_update(self):
+        """Run the pending chart update."""
+        self._update_pending = False
+        self._update_charts()
     
     def _update_charts(self):
         """Update charts with current data table data."""
-        if not self.data_table or not self.chart or not self.column_select:
+        if not self.data_table or not self.column_select:
             return
 
         selected_field = self.column_select.value
         if not selected_field or selected_field == "":
             # Show empty chart
-            config = self.chart.config.copy()
-            config['data']['labels'] = []
-            config['data']['datasets'][0]['data'] = []
-            self.chart.update(config)
+            self._apply_chart_data([], [])
             return
 
         try:
@@ -402,65 +463,62 @@ class DataVizApp:
             if not table_data:
                 return
 
-            columns = self.data_table._get_state('columns')
-
             # Find the selected column info
-            selected_col_title = None
-            for col in columns:
-                if col.get('field') == selected_field:
-                    selected_col_title = col.get('title', selected_field)
-                    break
-
-            # Extract data for selected field
-            chart_data = []
-            for row in table_data:
-                val = row.get(selected_field)
-                # Convert to number if possible
-                if val is not None:
-                    try:
-                        chart_data.append(float(val))
-                    except (ValueError, TypeError):
-                        chart_data.append(val)
-                else:
-                    chart_data.append(None)
+            selected_col_title = self._field_title_map.get(selected_field)
 
             # Get labels from first column field if available
-            if columns:
-                first_field = columns[0].get('field')
-                labels = [str(row.get(first_field, f"Row {i+1}")) for i, row in enumerate(table_data)]
+            if self._field_title_map:
+                first_values = _column_values(table_data, self._first_field)
+
+                # Build labels and check for a numeric first column in one pass
+                labels = []
+                all_numeric = True
+                for i, v in enumerate(first_values):
+                    if v is None:
+                        all_numeric = False
+                        labels.append(f"Row {i+1}")
+                    else:
+                        if all_numeric and not isinstance(v, (int, float)):
+                            all_numeric = False
+                        labels.append(v if v.__class__ is str else str(v))
 
                 # If first column looks numeric, use row numbers instead
-                try:
-                    if all(isinstance(row.get(first_field), (int, float)) for row in table_data):
-                        labels = [f"Row {i+1}" for i in range(len(table_data))]
-                except:
-                    pass
+                if all_numeric:
+                    labels = [f"Row {i+1}" for i in range(len(labels))]
             else:
                 labels = [f"Row {i+1}" for i in range(len(table_data))]
 
-            # Filter out None values and corresponding labels
+            # Coerce values and drop non-numeric cells in a single pass
             filtered_data = []
             filtered_labels = []
-            for data_val, label in zip(chart_data, labels):
-                if data_val is not None:
-                    filtered_data.append(data_val)
-                    filtered_labels.append(str(label))
+            values = _column_values(table_data, selected_field)
+            for raw, label in zip(values, labels):
+                val = _as_number(raw)
+                if val is not None:
+                    filtered_data.append(val)
+                    filtered_labels.append(label)
 
             # Update chart with Chart.js API
             chart_title = f"{selected_col_title} Visualization" if selected_col_title else "Data Visualization"
 
-            # Get current config and update it
-            config = self.chart.config.copy()
-            config['data']['labels'] = filtered_labels
-            config['data']['datasets'][0]['data'] = filtered_data
-            config['data']['datasets'][0]['label'] = chart_title
-            config['options']['plugins']['title']['text'] = chart_title
-
-            self.chart.update(config)
+            self._apply_chart_data(filtered_labels, filtered_data, chart_title)
 
         except Exception as e:
             print(f"Error updating chart: {e}")
     
+    def _apply_chart_data(self, labels, data, title=None):
+        """Send only the changed labels, values and title to the chart."""
+        if self.chart and self.chart.is_ready:
+            self.chart.update_data(labels, data, dataset_label=title, title=title)
+            return
+
+        # Chart not built yet: patch the config it will be created from
+        self._chart_data_ref['labels'] = labels
+        self._dataset_ref['data'] = data
+        if title is not None:
+            self._dataset_ref['label'] = title
+            self._title_ref['text'] = title
+    
     def _show_sample_selector(self):
         """Show modal with sample dataset options."""
         modal_content = Div()
@@ -499,23 +557,18 @@ class DataVizApp:
         """Clear all data from the table."""
         if self.data_table:
             self.data_table.clear_data()
+            self._row_keys = set()
         print("🗑️ Data cleared")
     
     def _export_data(self):
-        """Export current data (simulation)."""
+        """Export current data as CSV."""
         if not self.data_table:
             return
 
-        data = self.data_table.get_data()
-        print("📤 Export data (simulation):")
-        print("Data would be exported as:")
-        for i, row in enumerate(data[:3]):  # Show first 3 rows
-            print(f"  Row {i+1}: {row}")
-        if len(data) > 3:
-            print(f"  ... and {len(data) - 3} more rows")
-
-        # Could also use Tabulator's built-in download
-        # self.data_table.download("csv", "dataviz_export")
+        # Tabulator serializes and downloads on the JS side, so the full
+        # dataset is never converted to Python
+        self.data_table.download("csv", "dataviz_export")
+        print(f"📤 Exported {self.data_table.get_data_count()} rows to dataviz_export.csv")
 
 
 def main():
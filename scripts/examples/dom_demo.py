@@ -1,5 +1,5 @@
 from antioch import Div, P, H1, Button, DOM
-import main as main_page
+from ._styles import BTN_LIGHT
 def create_dom_demo():
     """Demonstrate DOM helper functionality."""
     
@@ -37,6 +37,8 @@ def create_dom_demo():
 
 def go_back_to_main():
     """Navigate back to main page without reloading."""
+    # Imported here so viewing this demo doesn't load the main page module
+    import main as main_page
     DOM.clear()
     main_page.main()
     print("✓ Returned to main page!")
@@ -47,17 +49,7 @@ def demonstrate_dom_operations():
     DOM.clear()
 
     # Back button for the cleared page
-    back_btn = Button("← Back to Main Page", style={
-        "background_color": "white",
-        "color": "#667eea",
-        "border": "none",
-        "padding": "12px 24px",
-        "border_radius": "6px",
-        "cursor": "pointer",
-        "margin_top": "20px",
-        "margin_right": "10px",
-        "font_weight": "bold"
-    })
+    back_btn = Button("← Back to Main Page", style={**BTN_LIGHT, "margin_right": "10px"})
     back_btn.on_click(lambda e: go_back_to_main())
 
     # Add new content
@@ -74,16 +66,7 @@ def demonstrate_dom_operations():
         back_btn,
         Button("Refresh to Start Over",
                onclick="location.reload()",
-               style={
-                   "background_color": "white",
-                   "color": "#667eea",
-                   "border": "none",
-                   "padding": "12px 24px",
-                   "border_radius": "6px",
-                   "cursor": "pointer",
-                   "margin_top": "20px",
-                   "font_weight": "bold"
-               })
+               style=BTN_LIGHT)
     )
 
     DOM.add(new_content)
@@ -12,6 +12,24 @@ from antioch import DOM
 from antioch.elements import Div, H1, H2, P, Hr
 from antioch.macros import DownloadLink
 from antioch.core.filesystem import get_filesystem
+from ._styles import ACCENT_HEADING, SECTION_RULE
+
+
+def _ensure_demo_files(vfs):
+    """Create the sample VFS files, skipping the work if they already exist."""
+    if vfs.get_item_by_path('/data/config.json') and vfs.get_item_by_path('/documents/notes.txt'):
+        return
+
+    # Create a sample JSON file in the data directory
+    vfs.navigate_to(['data'])
+    vfs.create_file('config.json', '{\n  "app": "Antioch",\n  "version": "1.0.0",\n  "features": ["VFS", "Macros", "Download"]\n}')
+
+    # Create a sample text file in documents
+    vfs.navigate_to(['documents'])
+    vfs.create_file('notes.txt', 'Meeting Notes\n\nDate: 2024-01-15\nTopic: Download functionality\n\nImplemented DownloadLink macro with VFS support.')
+
+    # Return to root
+    vfs.navigate_to([])
 
 
 def create_demo():
@@ -41,12 +59,12 @@ def create_demo():
             filename="sample.pdf",
             text="Download Sample PDF from URL"
         ).element,
-        Hr(style={"margin": "30px 0"})
+        Hr(style=SECTION_RULE)
     )
 
     # Section 2: Download from data string
     container.add(
-        H2("2. Download from Data String", style={"color": "#007bff"}),
+        H2("2. Download from Data String", style=ACCENT_HEADING),
         P("Download generated content from a data string:"),
         DownloadLink(
             data="Hello from Antioch!\n\nThis is a test file generated in memory.",
@@ -54,26 +72,15 @@ def create_demo():
             filename="hello.txt",
             text="Download Generated Text File"
         ).element,
-        Hr(style={"margin": "30px 0"})
+        Hr(style=SECTION_RULE)
     )
 
     # Section 3: Download from VFS
-    # First, create some files in the VFS
-    vfs = get_filesystem()
-
-    # Create a sample JSON file in the data directory
-    vfs.navigate_to(['data'])
-    vfs.create_file('config.json', '{\n  "app": "Antioch",\n  "version": "1.0.0",\n  "features": ["VFS", "Macros", "Download"]\n}')
-
-    # Create a sample text file in documents
-    vfs.navigate_to(['documents'])
-    vfs.create_file('notes.txt', 'Meeting Notes\n\nDate: 2024-01-15\nTopic: Download functionality\n\nImplemented DownloadLink macro with VFS support.')
-
-    # Return to root
-    vfs.navigate_to([])
+    # First, make sure the sample files exist in the VFS
+    _ensure_demo_files(get_filesystem())
 
     container.add(
-        H2("3. Download from Virtual File System", style={"color": "#007bff"}),
+        H2("3. Download from Virtual File System", style=ACCENT_HEADING),
         P("Download files stored in the browser's Virtual File System:"),
         Div(
             DownloadLink(
@@ -102,12 +109,12 @@ def create_demo():
             ).element,
             style={"margin_bottom": "10px"}
         ),
-        Hr(style={"margin": "30px 0"})
+        Hr(style=SECTION_RULE)
     )
 
     # Section 4: Custom styled link
     container.add(
-        H2("4. Custom Styled Download Link", style={"color": "#007bff"}),
+        H2("4. Custom Styled Download Link", style=ACCENT_HEADING),
         P("Download link with custom styling:"),
         DownloadLink(
             data="This file was downloaded using a custom-styled link!",
@@ -126,12 +133,12 @@ def create_demo():
                 "box_shadow": "0 2px 4px rgba(0,0,0,0.2)"
             }
         ).element,
-        Hr(style={"margin": "30px 0"})
+        Hr(style=SECTION_RULE)
     )
 
     # Section 5: Dynamic update demo
     container.add(
-        H2("5. Dynamic Update Example", style={"color": "#007bff"}),
+        H2("5. Dynamic Update Example", style=ACCENT_HEADING),
         P("This link can be updated dynamically (check console for example code):"),
     )
 
@@ -168,5 +175,10 @@ def create_demo():
     )
 
 
-# Run the demo
-create_demo()
\ No newline at end of file
+def main():
+    """Run the download link demo."""
+    create_demo()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,93 @@
+import js
+from pyodide.ffi import create_proxy
 from antioch import Div, P, H1, H2, Button, Input, Span, DOM
 
+# Trailing delay so a burst of keystrokes updates the output once
+INPUT_DEBOUNCE_MS = 50
+
 def create_welcome_div():
-    welcome_div = Div().add(
+    welcome_div = Div(
         H1("Welcome to Antioch!"),
         P("A Python library for seamless DOM manipulation"),
-        P("Built for real-time interactivity with js.document")
+        P("Built for real-time interactivity with js.document"),
+        style={
+            "display": "block",
+            "background_color": "#f0f8ff",
+            "padding": "20px",
+            "border_radius": "8px",
+            "margin": "20px auto",
+            "max_width": "600px",
+            "box_shadow": "0 4px 6px rgba(0, 0, 0, 0.1)"
+        }
     )
     
-    welcome_div.style.display = "block"
-    welcome_div.style.background_color = "#f0f8ff"
-    welcome_div.style.padding = "20px"
-    welcome_div.style.border_radius = "8px"
-    welcome_div.style.margin = "20px auto"
-    welcome_div.style.max_width = "600px"
-    welcome_div.style.box_shadow = "0 4px 6px rgba(0, 0, 0, 0.1)"
-    
     return welcome_div
 
 def create_event_demo():
     """Demonstrate the new handle() method for multiple event handling."""
-    demo_section = Div()
-    demo_section.add(H2("Event Handling Demo"))
-    
-    # Counter for button clicks
-    counter = {"value": 0}
+    demo_section = Div(style={
+        "margin_top": "30px",
+        "padding": "20px",
+        "background_color": "#ffffff",
+        "border_radius": "8px",
+        "box_shadow": "0 2px 4px rgba(0, 0, 0, 0.1)"
+    })
     
     # Interactive button with multiple events
-    button = Button("Interactive Button")
-    button.style.background_color = "#28a745"
-    button.style.color = "white"
-    button.style.border = "none"
-    button.style.padding = "12px 20px"
-    button.style.border_radius = "6px"
-    button.style.cursor = "pointer"
-    button.style.margin = "10px 5px"
-    button.style.transition = "all 0.3s ease"
+    button = Button("Interactive Button", style={
+        "background_color": "#28a745",
+        "color": "white",
+        "border": "none",
+        "padding": "12px 20px",
+        "border_radius": "6px",
+        "cursor": "pointer",
+        "margin": "10px 5px",
+        "transition": "all 0.3s ease"
+    })
     
     # Status display
-    status = Span("Ready...")
-    status.style.margin_left = "10px"
-    status.style.font_weight = "bold"
+    status = Span("Ready...", style={"margin_left": "10px", "font_weight": "bold"})
     
     # Use the new handle() method for multiple events
+    button_ctl = _ButtonController(button, status)
     button.handle({
-        "click": lambda e: handle_click(counter, button, status),
-        "mouseenter": lambda e: handle_hover_in(button, status),
-        "mouseleave": lambda e: handle_hover_out(button, status),
-        "mousedown": lambda e: handle_mouse_down(button),
-        "mouseup": lambda e: handle_mouse_up(button)
+        "click": button_ctl.on_click,
+        "mouseenter": button_ctl.on_enter,
+        "mouseleave": button_ctl.on_leave,
+        "mousedown": button_ctl.on_down,
+        "mouseup": button_ctl.on_up
     })
     
     # Input field with real-time handling
-    text_input = Input("text")
-    text_input.set_attribute("placeholder", "Type something...")
-    text_input.style.padding = "8px 12px"
-    text_input.style.border = "2px solid #ddd"
-    text_input.style.border_radius = "4px"
-    text_input.style.margin = "10px 5px"
-    text_input.style.width = "200px"
-    
-    output_text = P("Your text will appear here...")
-    output_text.style.font_style = "italic"
-    output_text.style.color = "#666"
-    output_text.style.background_color = "#f9f9f9"
-    output_text.style.padding = "10px"
-    output_text.style.border_radius = "4px"
-    output_text.style.margin_top = "10px"
+    text_input = Input("text", placeholder="Type something...", style={
+        "padding": "8px 12px",
+        "border": "2px solid #ddd",
+        "border_radius": "4px",
+        "margin": "10px 5px",
+        "width": "200px"
+    })
+    
+    output_text = P("Your text will appear here...", style={
+        "font_style": "italic",
+        "color": "#666",
+        "background_color": "#f9f9f9",
+        "padding": "10px",
+        "border_radius": "4px",
+        "margin_top": "10px"
+    })
     
     # Real-time input handling
+    input_ctl = _InputController(text_input, output_text)
     text_input.handle({
-        "input": lambda e: handle_input(e, output_text),
-        "focus": lambda e: handle_focus_in(text_input),
-        "blur": lambda e: handle_focus_out(text_input)
+        "input": input_ctl.on_input,
+        "focus": input_ctl.on_focus,
+        "blur": input_ctl.on_blur
     })
     
     demo_section.add(
+        H2("Event Handling Demo"),
         P("This button handles multiple events:"),
-        Div().add(button, status),
+        Div(button, status),
         P("This input field responds in real-time:"),
         text_input,
         output_text
@@ -84,69 +95,89 @@ def create_event_demo():
     
     return demo_section
 
-def handle_click(counter, button, status):
-    counter["value"] += 1
-    count = counter["value"]
-    button.set_text(f"Clicked {count} time{'s' if count != 1 else ''}!")
-    status.set_text("👆 Clicked!")
-    status.style.color = "#007bff"
-    
-    if count == 5:
-        status.set_text("🎉 You found the secret!")
-        status.style.color = "#ff6347"
-
-def handle_hover_in(button, status):
-    button.style.background_color = "#34ce57"
-    button.style.transform = "scale(1.05)"
-    status.set_text("🖱️ Hovering")
-    status.style.color = "#28a745"
-
-def handle_hover_out(button, status):
-    button.style.background_color = "#28a745"
-    button.style.transform = "scale(1)"
-    status.set_text("Ready...")
-    status.style.color = "#333"
-
-def handle_mouse_down(button):
-    button.style.transform = "scale(0.95)"
-
-def handle_mouse_up(button):
-    button.style.transform = "scale(1.05)"
-
-def handle_input(event, output):
-    value = event.target.value
-    if value.strip():
-        output.set_text(f"You typed: '{value}'")
-        output.style.color = "#333"
-        output.style.background_color = "#e8f5e8"
-    else:
-        output.set_text("Your text will appear here...")
-        output.style.color = "#666"
-        output.style.background_color = "#f9f9f9"
-
-def handle_focus_in(input_element):
-    input_element.style.border_color = "#007bff"
-    input_element.style.box_shadow = "0 0 0 2px rgba(0,123,255,.25)"
+class _ButtonController:
+    """Event handlers for the interactive button, bound once per demo."""
+    
+    def __init__(self, button, status):
+        self.count = 0
+        self.button = button
+        self.status = status
+    
+    def on_click(self, event):
+        self.count += 1
+        count = self.count
+        self.button.set_text(f"Clicked {count} time{'s' if count != 1 else ''}!")
+        self.status.set_text("👆 Clicked!")
+        self.status.style.color = "#007bff"
+        
+        if count == 5:
+            self.status.set_text("🎉 You found the secret!")
+            self.status.style.color = "#ff6347"
+    
+    def on_enter(self, event):
+        self.button.style.background_color = "#34ce57"
+        self.button.style.transform = "scale(1.05)"
+        self.status.set_text("🖱️ Hovering")
+        self.status.style.color = "#28a745"
+    
+    def on_leave(self, event):
+        self.button.style.background_color = "#28a745"
+        self.button.style.transform = "scale(1)"
+        self.status.set_text("Ready...")
+        self.status.style.color = "#333"
+    
+    def on_down(self, event):
+        self.button.style.transform = "scale(0.95)"
+    
+    def on_up(self, event):
+        self.button.style.transform = "scale(1.05)"
 
-def handle_focus_out(input_element):
-    input_element.style.border_color = "#ddd"
-    input_element.style.box_shadow = "none"
+class _InputController:
+    """Event handlers for the real-time text input."""
+    
+    def __init__(self, text_input, output):
+        self.text_input = text_input
+        self.output = output
+        self._value = ""
+        self._timer = None
+        self._flush_proxy = create_proxy(self._flush)
+    
+    def on_input(self, event):
+        self._value = event.target.value
+        if self._timer is not None:
+            js.clearTimeout(self._timer)
+        self._timer = js.setTimeout(self._flush_proxy, INPUT_DEBOUNCE_MS)
+    
+    def _flush(self):
+        self._timer = None
+        value = self._value
+        output = self.output
+        if value.strip():
+            output.set_text(f"You typed: '{value}'")
+            output.style.color = "#333"
+            output.style.background_color = "#e8f5e8"
+        else:
+            output.set_text("Your text will appear here...")
+            output.style.color = "#666"
+            output.style.background_color = "#f9f9f9"
+    
+    def on_focus(self, event):
+        self.text_input.style.border_color = "#007bff"
+        self.text_input.style.box_shadow = "0 0 0 2px rgba(0,123,255,.25)"
+    
+    def on_blur(self, event):
+        self.text_input.style.border_color = "#ddd"
+        self.text_input.style.box_shadow = "none"
 
 def main():
     # Create main container
-    main_container = Div()
-    main_container.style.font_family = "Arial, sans-serif"
+    main_container = Div(style={"font_family": "Arial, sans-serif"})
     
     # Add welcome section
     welcome_section = create_welcome_div()
     
     # Add event demo section
     event_demo = create_event_demo()
-    event_demo.style.margin_top = "30px"
-    event_demo.style.padding = "20px"
-    event_demo.style.background_color = "#ffffff"
-    event_demo.style.border_radius = "8px"
-    event_demo.style.box_shadow = "0 2px 4px rgba(0, 0, 0, 0.1)"
     
     main_container.add(welcome_section, event_demo)
     DOM.add(main_container)
@@ -3,19 +3,102 @@ File Manager Demo - Complete file management with upload and selection.
 Demonstrates FileUpload and FileSelect working together.
 """
 
+from collections import Counter
+from itertools import compress
+
+import js
+from pyodide.ffi import create_proxy
+
 from antioch import Div, H1, H2, H3, P, Button, DOM
 from antioch.macros import FileUpload, FileSelect
 from antioch.core import get_filesystem, LocalStorageBackend
 
+from ._util import GEO_EXT, format_size, preview_text, run_when_idle
+
+# Uploads finishing within this window are reported and refreshed together
+_UPLOAD_BATCH_MS = 150
+
+# Largest number of extension badges shown in the breakdown
+_MAX_TYPE_BADGES = 20
+
+# Styles used by the event callbacks are built once at import time
+_PANEL = {
+    "background": "#fff",
+    "padding": "20px",
+    "border_radius": "8px",
+    "box_shadow": "0 2px 4px rgba(0,0,0,0.1)"
+}
+_PANEL_TITLE = {"color": "#444", "margin_top": "0"}
+_UPLOADER_TITLE = {
+    "color": "#555",
+    "font_size": "1.1em",
+    "margin": "20px 0 10px 0"
+}
+_STATUS = {"padding": "10px", "border_radius": "4px", "margin": "5px 0"}
+_STATUS_OK = {**_STATUS, "background": "#e8f5e9", "color": "#2e7d32"}
+_STATUS_FAIL = {**_STATUS, "background": "#ffebee", "color": "#c62828"}
+_PATH_STYLE = {
+    "margin": "0 0 10px 0",
+    "color": "#333",
+    "font_weight": "bold",
+    "font_size": "1.1em"
+}
+_META_STYLE = {"margin": "0 0 10px 0", "color": "#666"}
+_PREVIEW_LABEL = {"margin": "10px 0 5px 0", "color": "#666", "font_weight": "bold"}
+_PREVIEW_WRAP = {
+    "padding": "10px",
+    "background": "#fff",
+    "border": "1px solid #ddd",
+    "border_radius": "4px",
+    "font_family": "monospace",
+    "font_size": "0.85em",
+    "color": "#333",
+    "white_space": "pre-wrap",
+    "overflow": "auto",
+    "max_height": "150px"
+}
+
+# The stat cards are plain text, so they are rendered from one HTML template
+_STAT_LABEL_CSS = "margin:0 0 5px 0;color:#666;font-size:0.9em"
+_STAT_VALUE_CSS = "margin:0;font-size:2em;font-weight:bold"
+
+
+def _stat_card_html(label, background, color, field):
+    """Card markup with a {field} placeholder for the value."""
+    return (
+        f'<div style="padding:15px;border-radius:4px;background:{background}">'
+        f'<p style="{_STAT_LABEL_CSS}">{label}</p>'
+        f'<p style="{_STAT_VALUE_CSS};color:{color}">{{{field}}}</p>'
+        '</div>'
+    )
+
+
+_STATS_HTML = (
+    '<div style="display:grid;grid-template-columns:repeat(auto-fit, minmax(200px, 1fr));gap:15px">'
+    + _stat_card_html(label="Total Files", background="#e3f2fd", color="#2196f3", field="files")
+    + _stat_card_html(label="Total Size", background="#e8f5e9", color="#4caf50", field="size")
+    + _stat_card_html(label="File Types", background="#fff3e0", color="#ff9800", field="types")
+    + '</div>'
+)
+
+_BREAKDOWN = {"margin_top": "20px"}
+_BREAKDOWN_TITLE = {"color": "#555", "font_size": "1em", "margin": "0 0 10px 0"}
+_TYPE_LIST = {"display": "flex", "flex_wrap": "wrap", "gap": "10px"}
+_BADGE = {
+    "padding": "5px 10px",
+    "background": "#f5f5f5",
+    "border": "1px solid #ddd",
+    "border_radius": "4px",
+    "font_size": "0.9em",
+    "color": "#333"
+}
+
 
 def main():
     """Main entry point for File Manager demo."""
     # Get or initialize filesystem
     fs = get_filesystem(LocalStorageBackend())
 
-    # Ensure directories exist
-    _ensure_directories(fs)
-
     # Create page container
     page = Div(style={
         "max_width": "1400px",
@@ -24,18 +107,18 @@ def main():
         "font_family": "Arial, sans-serif"
     })
 
-    # Add title
-    page.add(H1("File Manager Demo", style={
-        "color": "#333",
-        "margin_bottom": "10px"
-    }))
-
-    # Add description
-    page.add(P(
-        "Upload files from your computer and browse them in the Virtual File System. "
-        "Files are persisted in localStorage and available across sessions.",
-        style={"color": "#666", "margin_bottom": "30px"}
-    ))
+    # Add title and description
+    page.add(
+        H1("File Manager Demo", style={
+            "color": "#333",
+            "margin_bottom": "10px"
+        }),
+        P(
+            "Upload files from your computer and browse them in the Virtual File System. "
+            "Files are persisted in localStorage and available across sessions.",
+            style={"color": "#666", "margin_bottom": "30px"}
+        )
+    )
 
     # Two column layout
     layout = Div(style={
@@ -46,13 +129,8 @@ def main():
     })
 
     # Left column - Upload
-    upload_section = Div(style={
-        "background": "#fff",
-        "padding": "20px",
-        "border_radius": "8px",
-        "box_shadow": "0 2px 4px rgba(0,0,0,0.1)"
-    })
-    upload_section.add(H2("Upload Files", style={"color": "#444", "margin_top": "0"}))
+    upload_section = Div(style=_PANEL)
+    upload_section.add(H2("Upload Files", style=_PANEL_TITLE))
 
     # Upload status display
     upload_status = Div(style={
@@ -64,45 +142,39 @@ def main():
     # Create file selector for destination (this will be refreshed after uploads)
     file_list = None  # Will be set below
 
-    def on_upload_complete(file_path, success):
-        if success:
-            upload_status._dom_element.innerHTML = ""
-            upload_status.add(P(
-                f"✅ Uploaded: {file_path}",
-                style={
-                    "padding": "10px",
-                    "background": "#e8f5e9",
-                    "color": "#2e7d32",
-                    "border_radius": "4px",
-                    "margin": "5px 0"
-                }
-            ))
-            # Refresh file list
-            if file_list:
-                file_list.refresh()
+    # Per-file results are collected and flushed once per batch
+    upload_batch = {'ok': 0, 'fail': 0, 'last': '', 'timer': None}
+
+    def flush_uploads():
+        ok, fail, last = upload_batch['ok'], upload_batch['fail'], upload_batch['last']
+        upload_batch.update(ok=0, fail=0, last='', timer=None)
+
+        if fail:
+            message = f"❌ Upload failed: {last}" if ok + fail == 1 else f"❌ {fail} of {ok + fail} uploads failed"
+            upload_status.replace_children(P(message, style=_STATUS_FAIL))
         else:
-            upload_status._dom_element.innerHTML = ""
-            upload_status.add(P(
-                f"❌ Upload failed: {file_path}",
-                style={
-                    "padding": "10px",
-                    "background": "#ffebee",
-                    "color": "#c62828",
-                    "border_radius": "4px",
-                    "margin": "5px 0"
-                }
-            ))
+            message = f"✅ Uploaded: {last}" if ok == 1 else f"✅ Uploaded {ok} files"
+            upload_status.replace_children(P(message, style=_STATUS_OK))
+
+        # Refresh file list
+        if ok and file_list:
+            file_list.refresh()
+
+    flush_uploads_proxy = create_proxy(flush_uploads)
+
+    def on_upload_complete(file_path, success):
+        upload_batch['ok' if success else 'fail'] += 1
+        upload_batch['last'] = file_path
+        if upload_batch['timer'] is not None:
+            js.clearTimeout(upload_batch['timer'])
+        upload_batch['timer'] = js.setTimeout(flush_uploads_proxy, _UPLOAD_BATCH_MS)
 
     # Geospatial files uploader
-    upload_section.add(H3("📁 Upload Geospatial Files", style={
-        "color": "#555",
-        "font_size": "1.1em",
-        "margin": "20px 0 10px 0"
-    }))
+    upload_section.add(H3("📁 Upload Geospatial Files", style=_UPLOADER_TITLE))
 
     geo_uploader = FileUpload(
         destination_path=['maps'],
-        allowed_extensions=['.zip', '.tif', '.tiff', '.geotiff', '.geojson', '.json'],
+        allowed_extensions=GEO_EXT,
         max_size_mb=50,
         on_upload=on_upload_complete,
         multiple=True
@@ -110,11 +182,7 @@ def main():
     upload_section.add(geo_uploader)
 
     # General files uploader
-    upload_section.add(H3("📄 Upload Any File", style={
-        "color": "#555",
-        "font_size": "1.1em",
-        "margin": "20px 0 10px 0"
-    }))
+    upload_section.add(H3("📄 Upload Any File", style=_UPLOADER_TITLE))
 
     general_uploader = FileUpload(
         destination_path=['documents'],
@@ -124,16 +192,9 @@ def main():
     )
     upload_section.add(general_uploader)
 
-    layout.add(upload_section)
-
     # Right column - Browse/Select
-    browse_section = Div(style={
-        "background": "#fff",
-        "padding": "20px",
-        "border_radius": "8px",
-        "box_shadow": "0 2px 4px rgba(0,0,0,0.1)"
-    })
-    browse_section.add(H2("Browse Files", style={"color": "#444", "margin_top": "0"}))
+    browse_section = Div(style=_PANEL)
+    browse_section.add(H2("Browse Files", style=_PANEL_TITLE))
 
     # Selected file display
     selected_display = Div(style={
@@ -144,66 +205,45 @@ def main():
         "margin_bottom": "15px",
         "min_height": "60px"
     })
-    selected_display.add(P("Select a file to view details", style={
+    placeholder = P("Select a file to view details", style={
         "margin": "0",
         "color": "#666",
         "font_style": "italic"
-    }))
+    })
+
+    # Detail nodes are built once and only their text changes per selection
+    path_p = P("", style=_PATH_STYLE)
+    size_p = P("", style=_META_STYLE)
+    type_p = P("", style=_META_STYLE)
+    preview_div = Div(style=_PREVIEW_WRAP)
+    preview_group = Div(P("Preview:", style=_PREVIEW_LABEL), preview_div)
+    details = Div(path_p, size_p, type_p, preview_group, style={"display": "none"})
+
+    selected_display.add(placeholder, details)
     browse_section.add(selected_display)
 
     def on_file_selected(file_path, file_content):
-        selected_display._dom_element.innerHTML = ""
+        placeholder.style.display = "none"
+        details.style.display = "block"
 
         # File path
-        selected_display.add(P(
-            f"📄 {file_path}",
-            style={
-                "margin": "0 0 10px 0",
-                "color": "#333",
-                "font_weight": "bold",
-                "font_size": "1.1em"
-            }
-        ))
+        path_p.set_text(f"📄 {file_path}")
 
         # File size
         size = len(file_content) if file_content else 0
-        selected_display.add(P(
-            f"Size: {_format_size(size)}",
-            style={"margin": "0 0 10px 0", "color": "#666"}
-        ))
+        size_p.set_text(f"Size: {format_size(size)}")
 
         # File type
         file_type = "Text" if isinstance(file_content, str) else "Binary"
-        selected_display.add(P(
-            f"Type: {file_type}",
-            style={"margin": "0 0 10px 0", "color": "#666"}
-        ))
+        type_p.set_text(f"Type: {file_type}")
 
         # Preview for text files
-        if isinstance(file_content, str) and len(file_content) > 0:
-            preview = file_content[:200] if len(file_content) > 200 else file_content
-            preview_text = preview + "..." if len(file_content) > 200 else preview
-
-            selected_display.add(P("Preview:", style={
-                "margin": "10px 0 5px 0",
-                "color": "#666",
-                "font_weight": "bold"
-            }))
-            selected_display.add(Div(
-                preview_text,
-                style={
-                    "padding": "10px",
-                    "background": "#fff",
-                    "border": "1px solid #ddd",
-                    "border_radius": "4px",
-                    "font_family": "monospace",
-                    "font_size": "0.85em",
-                    "color": "#333",
-                    "white_space": "pre-wrap",
-                    "overflow": "auto",
-                    "max_height": "150px"
-                }
-            ))
+        preview = preview_text(file_content)
+        if preview:
+            preview_div.set_text(preview)
+            preview_group.style.display = "block"
+        else:
+            preview_group.style.display = "none"
 
     # File selector
     file_list = FileSelect(
@@ -212,116 +252,75 @@ def main():
     )
     browse_section.add(file_list)
 
-    layout.add(browse_section)
-    page.add(layout)
+    # Ensure directories exist once the page has painted; each one is a
+    # blocking localStorage write
+    def ensure_directories():
+        _ensure_directories(fs)
+        file_list.refresh()
+
+    run_when_idle(ensure_directories)
+
+    layout.add(upload_section, browse_section)
 
     # Statistics section
-    stats_section = Div(style={
-        "background": "#fff",
-        "padding": "20px",
-        "border_radius": "8px",
-        "box_shadow": "0 2px 4px rgba(0,0,0,0.1)",
-        "margin_bottom": "20px"
-    })
-    stats_section.add(H2("File System Statistics", style={"color": "#444", "margin_top": "0"}))
+    stats_section = Div(style={**_PANEL, "margin_bottom": "20px"})
+    stats_section.add(H2("File System Statistics", style=_PANEL_TITLE))
 
     stats_display = Div()
     stats_section.add(stats_display)
 
+    stats_cache = {}
+
     def update_stats():
-        stats_display._dom_element.innerHTML = ""
-
-        # Calculate statistics
-        total_files = 0
-        total_size = 0
-        file_types = {}
-
-        def count_items(directory, path=[]):
-            nonlocal total_files, total_size
-            for name, item in directory.children.items():
-                if item.type == 'file':
-                    total_files += 1
-                    if item.content:
-                        size = len(item.content)
-                        total_size += size
-
-                    # Count file type
-                    ext = '.' + name.split('.')[-1] if '.' in name else 'no extension'
-                    file_types[ext] = file_types.get(ext, 0) + 1
-                elif item.type == 'directory':
-                    count_items(item, path + [name])
-
-        count_items(fs.root)
+        # Nothing to show in a background tab; render when it comes back
+        if js.document.visibilityState == 'hidden':
+            stats_cache['dirty'] = True
+            return
+        stats_cache['dirty'] = False
+
+        # Reuse the last result while the filesystem is unchanged
+        if stats_cache.get('version') != fs.version:
+            stats_cache['version'] = fs.version
+            stats_cache['stats'] = _collect_stats(fs)
+        total_files, total_size, file_types = stats_cache['stats']
 
         # Display stats
-        stats_grid = Div(style={
-            "display": "grid",
-            "grid_template_columns": "repeat(auto-fit, minmax(200px, 1fr))",
-            "gap": "15px"
-        })
-
-        # Total files stat
-        stat_card = Div(style={
-            "padding": "15px",
-            "background": "#e3f2fd",
-            "border_radius": "4px"
-        })
-        stat_card.add(P("Total Files", style={"margin": "0 0 5px 0", "color": "#666", "font_size": "0.9em"}))
-        stat_card.add(P(str(total_files), style={"margin": "0", "color": "#2196f3", "font_size": "2em", "font_weight": "bold"}))
-        stats_grid.add(stat_card)
-
-        # Total size stat
-        stat_card = Div(style={
-            "padding": "15px",
-            "background": "#e8f5e9",
-            "border_radius": "4px"
-        })
-        stat_card.add(P("Total Size", style={"margin": "0 0 5px 0", "color": "#666", "font_size": "0.9em"}))
-        stat_card.add(P(_format_size(total_size), style={"margin": "0", "color": "#4caf50", "font_size": "2em", "font_weight": "bold"}))
-        stats_grid.add(stat_card)
-
-        # File types stat
-        stat_card = Div(style={
-            "padding": "15px",
-            "background": "#fff3e0",
-            "border_radius": "4px"
-        })
-        stat_card.add(P("File Types", style={"margin": "0 0 5px 0", "color": "#666", "font_size": "0.9em"}))
-        stat_card.add(P(str(len(file_types)), style={"margin": "0", "color": "#ff9800", "font_size": "2em", "font_weight": "bold"}))
-        stats_grid.add(stat_card)
-
-        stats_display.add(stats_grid)
+        stats_display._dom_element.innerHTML = _STATS_HTML.format(
+            files=total_files,
+            size=format_size(total_size),
+            types=len(file_types)
+        )
 
         # File type breakdown
         if file_types:
-            breakdown = Div(style={"margin_top": "20px"})
-            breakdown.add(H3("File Type Breakdown", style={"color": "#555", "font_size": "1em", "margin": "0 0 10px 0"}))
-
-            type_list = Div(style={
-                "display": "flex",
-                "flex_wrap": "wrap",
-                "gap": "10px"
-            })
-
-            for ext, count in sorted(file_types.items(), key=lambda x: x[1], reverse=True):
-                badge = Div(
-                    f"{ext}: {count}",
-                    style={
-                        "padding": "5px 10px",
-                        "background": "#f5f5f5",
-                        "border": "1px solid #ddd",
-                        "border_radius": "4px",
-                        "font_size": "0.9em",
-                        "color": "#333"
-                    }
-                )
-                type_list.add(badge)
+            breakdown = Div(style=_BREAKDOWN)
+            breakdown.add(H3("File Type Breakdown", style=_BREAKDOWN_TITLE))
+
+            type_list = Div(style=_TYPE_LIST)
+
+            top_types = file_types.most_common(_MAX_TYPE_BADGES)
+            badges = [Div(f"{ext}: {count}", style=_BADGE) for ext, count in top_types]
+            if len(file_types) > _MAX_TYPE_BADGES:
+                badges.append(Div(f"… {len(file_types) - _MAX_TYPE_BADGES} more", style=_BADGE))
+            type_list.add(*badges)
 
             breakdown.add(type_list)
             stats_display.add(breakdown)
 
-    # Initial stats update
-    update_stats()
+    # Build the stats the first time the section scrolls into view
+    def on_stats_visible(entries, observer):
+        if any(entry.isIntersecting for entry in entries):
+            observer.disconnect()
+            update_stats()
+
+    def on_visibility_change(event):
+        if stats_cache.get('dirty') and js.document.visibilityState != 'hidden':
+            update_stats()
+
+    stats_cache['observer_proxy'] = create_proxy(on_stats_visible)
+    stats_cache['visibility_proxy'] = create_proxy(on_visibility_change)
+    js.IntersectionObserver.new(stats_cache['observer_proxy']).observe(stats_section._dom_element)
+    js.document.addEventListener('visibilitychange', stats_cache['visibility_proxy'])
 
     # Refresh stats button
     refresh_btn = Button("🔄 Refresh Statistics", style={
@@ -336,7 +335,7 @@ def main():
     refresh_btn.on_click(lambda e: update_stats())
     stats_section.add(refresh_btn)
 
-    page.add(stats_section)
+    page.add(layout, stats_section)
 
     # Add page to DOM
     DOM.add(page)
@@ -348,25 +347,29 @@ def _ensure_directories(fs):
     """Ensure required directories exist."""
     fs.navigate_to([])
 
-    dirs = ['maps', 'documents', 'data']
-    for dir_name in dirs:
-        if dir_name not in fs.current_directory.children:
-            try:
-                fs.create_directory(dir_name)
-            except:
-                pass
-
-
-def _format_size(size_bytes):
-    """Format file size in human-readable format."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    root = fs.get_current_directory()
+    for dir_name in ('maps', 'documents', 'data'):
+        if root.get_child(dir_name) is None:
+            fs.create_directory(dir_name)
+
+
+def _collect_stats(fs):
+    """Count files, total size and files per extension in the filesystem."""
+    names, sizes, types = fs.flatten()
+
+    # Column-wise passes over the flattened tree run in C builtins
+    is_file = [item_type == 'file' for item_type in types]
+    total_files = sum(is_file)
+    total_size = sum(compress(sizes, is_file))
+    file_types = Counter(map(_extension_key, compress(names, is_file)))
+
+    return total_files, total_size, file_types
+
+
+def _extension_key(name):
+    """Histogram key for a file name: '.ext' or 'no extension'."""
+    _, dot, ext = name.rpartition('.')
+    return '.' + ext if dot else 'no extension'
 
 
 if __name__ == "__main__":
@@ -3,19 +3,67 @@ File Select Demo - Demonstration of the FileSelect macro.
 Shows how to browse and select files from the Virtual File System.
 """
 
+import js
 from antioch import Div, H1, H2, P, Button, DOM
 from antioch.macros import FileSelect
 from antioch.core import get_filesystem, LocalStorageBackend
 
+from ._util import GEO_EXT, format_size, preview_text, run_when_idle
+
+# Styles shared by the three sections and their select callbacks
+_SECTION = {"margin_bottom": "40px"}
+_SECTION_TITLE = {"color": "#444", "margin_bottom": "10px"}
+_SECTION_INTRO = {"color": "#666", "margin_bottom": "15px"}
+_DISPLAY = {"padding": "15px", "border_radius": "4px", "margin_bottom": "15px"}
+_DISPLAY_BLUE = {**_DISPLAY, "background": "#e3f2fd", "border_left": "4px solid #2196f3"}
+_DISPLAY_GREEN = {**_DISPLAY, "background": "#f1f8e9", "border_left": "4px solid #8bc34a"}
+_DISPLAY_ORANGE = {**_DISPLAY, "background": "#fff3e0", "border_left": "4px solid #ff9800"}
+_PLACEHOLDER = {"margin": "0", "color": "#666"}
+_SELECTED = {"margin": "0", "color": "#333", "font_weight": "bold"}
+_PREVIEW = {"margin": "5px 0 0 0", "color": "#666", "font_family": "monospace", "font_size": "0.9em"}
+_PREVIEW_HIDDEN = {**_PREVIEW, "display": "none"}
+
+
+def _text_line(text, style):
+    """A P element and its text node, so updates can write nodeValue directly."""
+    line = P(style=style)
+    text_node = line.dom_element.appendChild(js.document.createTextNode(text))
+    return line, text_node
+
+
+class _SelectionView:
+    """Selected-file summary for one section, updated in place on each selection."""
+
+    def __init__(self, display, placeholder, show_preview=False):
+        self._line, self._text = _text_line(placeholder, _PLACEHOLDER)
+        self._selected = False
+        self._preview = None
+        display.add(self._line)
+        if show_preview:
+            self._preview, self._preview_text = _text_line("", _PREVIEW_HIDDEN)
+            display.add(self._preview)
+
+    def show(self, file_path, file_content):
+        size = len(file_content) if file_content else 0
+        self._text.nodeValue = f"Selected: {file_path} ({format_size(size)})"
+        if not self._selected:
+            self._selected = True
+            self._line.style.update(_SELECTED)
+
+        if self._preview is not None:
+            if file_content:
+                preview = preview_text(file_content) or f"Binary data ({size} bytes)"
+                self._preview_text.nodeValue = f"Preview: {preview}"
+                self._preview.style.display = "block"
+            else:
+                self._preview.style.display = "none"
+
 
 def main():
     """Main entry point for FileSelect demo."""
     # Get or initialize filesystem
     fs = get_filesystem(LocalStorageBackend())
 
-    # Create some demo files if the filesystem is empty
-    _create_demo_files(fs)
-
     # Create page container
     page = Div(style={
         "max_width": "1200px",
@@ -38,73 +86,39 @@ def main():
     ))
 
     # Section 1: Basic file selector
-    section1 = Div(style={"margin_bottom": "40px"})
-    section1.add(H2("Basic File Selector", style={"color": "#444", "margin_bottom": "10px"}))
+    section1 = Div(style=_SECTION)
+    section1.add(H2("Basic File Selector", style=_SECTION_TITLE))
     section1.add(P(
         "Select any file from the filesystem:",
-        style={"color": "#666", "margin_bottom": "15px"}
+        style=_SECTION_INTRO
     ))
 
     # Selected file display
-    selected_display1 = Div(style={
-        "padding": "15px",
-        "background": "#e3f2fd",
-        "border_left": "4px solid #2196f3",
-        "border_radius": "4px",
-        "margin_bottom": "15px"
-    })
-    selected_display1.add(P("No file selected", style={"margin": "0", "color": "#666"}))
+    selected_display1 = Div(style=_DISPLAY_BLUE)
+    selection1 = _SelectionView(selected_display1, "No file selected", show_preview=True)
     section1.add(selected_display1)
 
-    def on_file_selected1(file_path, file_content):
-        selected_display1._dom_element.innerHTML = ""
-        size = len(file_content) if file_content else 0
-        selected_display1.add(P(
-            f"Selected: {file_path} ({_format_size(size)})",
-            style={"margin": "0", "color": "#333", "font_weight": "bold"}
-        ))
-        if file_content:
-            preview = file_content[:200] if isinstance(file_content, str) else f"Binary data ({size} bytes)"
-            selected_display1.add(P(
-                f"Preview: {preview}...",
-                style={"margin": "5px 0 0 0", "color": "#666", "font_family": "monospace", "font_size": "0.9em"}
-            ))
-
-    file_select1 = FileSelect(on_select=on_file_selected1, height='250px')
+    file_select1 = FileSelect(on_select=selection1.show, height='250px')
     section1.add(file_select1)
 
     page.add(section1)
 
     # Section 2: Filtered file selector (geospatial files only)
-    section2 = Div(style={"margin_bottom": "40px"})
-    section2.add(H2("Filtered File Selector", style={"color": "#444", "margin_bottom": "10px"}))
+    section2 = Div(style=_SECTION)
+    section2.add(H2("Filtered File Selector", style=_SECTION_TITLE))
     section2.add(P(
         "Only show geospatial files (.zip, .tif, .geojson):",
-        style={"color": "#666", "margin_bottom": "15px"}
+        style=_SECTION_INTRO
     ))
 
     # Selected file display
-    selected_display2 = Div(style={
-        "padding": "15px",
-        "background": "#f1f8e9",
-        "border_left": "4px solid #8bc34a",
-        "border_radius": "4px",
-        "margin_bottom": "15px"
-    })
-    selected_display2.add(P("No geospatial file selected", style={"margin": "0", "color": "#666"}))
+    selected_display2 = Div(style=_DISPLAY_GREEN)
+    selection2 = _SelectionView(selected_display2, "No geospatial file selected")
     section2.add(selected_display2)
 
-    def on_file_selected2(file_path, file_content):
-        selected_display2._dom_element.innerHTML = ""
-        size = len(file_content) if file_content else 0
-        selected_display2.add(P(
-            f"Selected: {file_path} ({_format_size(size)})",
-            style={"margin": "0", "color": "#333", "font_weight": "bold"}
-        ))
-
     file_select2 = FileSelect(
-        on_select=on_file_selected2,
-        file_filter=['.zip', '.tif', '.tiff', '.geotiff', '.geojson', '.json'],
+        on_select=selection2.show,
+        file_filter=GEO_EXT,
         height='250px'
     )
     section2.add(file_select2)
@@ -112,34 +126,20 @@ def main():
     page.add(section2)
 
     # Section 3: Compact selector without directory navigation
-    section3 = Div(style={"margin_bottom": "40px"})
-    section3.add(H2("Compact Selector (No Directories)", style={"color": "#444", "margin_bottom": "10px"}))
+    section3 = Div(style=_SECTION)
+    section3.add(H2("Compact Selector (No Directories)", style=_SECTION_TITLE))
     section3.add(P(
         "Show only files in the current directory:",
-        style={"color": "#666", "margin_bottom": "15px"}
+        style=_SECTION_INTRO
     ))
 
     # Selected file display
-    selected_display3 = Div(style={
-        "padding": "15px",
-        "background": "#fff3e0",
-        "border_left": "4px solid #ff9800",
-        "border_radius": "4px",
-        "margin_bottom": "15px"
-    })
-    selected_display3.add(P("No file selected", style={"margin": "0", "color": "#666"}))
+    selected_display3 = Div(style=_DISPLAY_ORANGE)
+    selection3 = _SelectionView(selected_display3, "No file selected")
     section3.add(selected_display3)
 
-    def on_file_selected3(file_path, file_content):
-        selected_display3._dom_element.innerHTML = ""
-        size = len(file_content) if file_content else 0
-        selected_display3.add(P(
-            f"Selected: {file_path} ({_format_size(size)})",
-            style={"margin": "0", "color": "#333", "font_weight": "bold"}
-        ))
-
     file_select3 = FileSelect(
-        on_select=on_file_selected3,
+        on_select=selection3.show,
         show_directories=False,
         height='200px'
     )
@@ -165,12 +165,20 @@ def main():
         "font_size": "1em"
     })
 
-    def refresh_all(e):
+    def refresh_all(e=None):
         file_select1.refresh()
         file_select2.refresh()
         file_select3.refresh()
         print("All file lists refreshed")
 
+    # Create some demo files if the filesystem is empty, once the page has
+    # painted; each write is a blocking localStorage call
+    def create_demo_files():
+        if _create_demo_files(fs):
+            refresh_all()
+
+    run_when_idle(create_demo_files)
+
     refresh_btn.on_click(refresh_all)
     refresh_section.add(refresh_btn)
 
@@ -183,10 +191,10 @@ def main():
 
 
 def _create_demo_files(fs):
-    """Create some demo files if filesystem is empty."""
+    """Create some demo files if filesystem is empty. Returns False if it already had content."""
     # Check if we already have files
     if len(fs.root.children) > 0:
-        return
+        return False
 
     print("Creating demo files...")
 
@@ -218,17 +226,7 @@ def _create_demo_files(fs):
     except Exception as e:
         print(f"Note: {e}")
 
-
-def _format_size(size_bytes):
-    """Format file size in human-readable format."""
-    if size_bytes < 1024:
-        return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    return True
 
 
 if __name__ == "__main__":
@@ -5,207 +5,314 @@ Filesystem Demo for Antioch
 Demonstrates the virtual filesystem with observer pattern and persistence.
 """
 
+from collections import deque
+
 from antioch import DOM, Div, H2, P, Button, Pre, Ul, Li, Input, Span
 from antioch.core import get_filesystem, LocalStorageBackend
 import js
+from pyodide.ffi import create_proxy
+
+from ._util import run_when_idle
+
+# Event log lines kept on screen, newest first
+_LOG_MAX_LINES = 200
+
+# Row and button styles, injected once so each element only needs a className
+_STYLE_ID = "antioch-fs-demo-styles"
+_STYLES = """
+.antioch-fs-row{padding:8px;margin:5px 0;background-color:#fff;border:1px solid #ddd;border-radius:3px;display:flex;justify-content:space-between;align-items:center}
+.antioch-fs-dir-name{cursor:pointer;color:#2196F3;font-weight:bold}
+.antioch-fs-row::after{content:"\\2715";color:#f44336;cursor:pointer;padding:4px 8px}
+.antioch-fs-btn{padding:8px 15px;color:white;border:none;border-radius:3px;cursor:pointer}
+"""
+
+# How long an inline create error stays visible
+_ERROR_MS = 2000
+
+# Events that can change which rows the current directory shows
+_LIST_EVENTS = frozenset(('create', 'delete', 'rename', 'navigate', 'reset'))
+
+# Width of the row's trailing delete mark, drawn by .antioch-fs-row::after
+_DELETE_HIT_PX = 30
+
+# Icon prefixes, cloned into each row instead of formatted into its text
+_DIR_ICON = js.document.createTextNode("📁 ")
+_FILE_ICON = js.document.createTextNode("📄 ")
+
+
+def _install_styles():
+    """Add the demo stylesheet to the page if it isn't there yet."""
+    if js.document.getElementById(_STYLE_ID):
+        return
+    style = js.document.createElement("style")
+    style.id = _STYLE_ID
+    style.textContent = _STYLES
+    js.document.head.appendChild(style)
 
 
 def main():
     """Demonstrate the virtual filesystem functionality."""
+    _install_styles()
 
     # Create a container for the demo
-    container = Div()
-    container.style.padding = "20px"
-    container.style.max_width = "800px"
-    container.style.margin = "0 auto"
+    container = Div(style={"padding": "20px", "max_width": "800px", "margin": "0 auto"})
 
     # Title
-    title = H2("Virtual Filesystem Demo")
-    title.style.color = "#333"
+    title = H2("Virtual Filesystem Demo", style={"color": "#333"})
     container.add(title)
 
     # Description
     desc = P("This demo shows the virtual filesystem with observer pattern. "
-             "All changes persist across browser sessions using localStorage.")
-    desc.style.color = "#666"
+             "All changes persist across browser sessions using localStorage.",
+             style={"color": "#666"})
     container.add(desc)
 
-    # Get the shared filesystem instance
-    storage = LocalStorageBackend()
-    fs = get_filesystem(storage)
+    # Get the shared filesystem instance. Its backend is whichever one the
+    # first caller passed, so debouncing is switched on there; bursts of
+    # changes (e.g. a reset) are then persisted with one localStorage write
+    fs = get_filesystem(LocalStorageBackend())
+    if isinstance(fs.storage_backend, LocalStorageBackend):
+        fs.storage_backend.debounce_ms = 50
 
     # Current path display
-    path_display = Div()
-    path_display.style.background_color = "#f0f0f0"
-    path_display.style.padding = "10px"
-    path_display.style.border_radius = "5px"
-    path_display.style.margin_bottom = "20px"
-
-    path_label = Span("Current Path: ")
-    path_label.style.font_weight = "bold"
-    path_text = Span(fs.get_path_string())
-    path_display.add(path_label, path_text)
+    path_display = Div(style={
+        "background_color": "#f0f0f0",
+        "padding": "10px",
+        "border_radius": "5px",
+        "margin_bottom": "20px"
+    })
+
+    path_label = Span("Current Path: ", style={"font_weight": "bold"})
+    path_display.add(path_label)
+    # A bare text node, so path updates are a single nodeValue write
+    path_text = path_display._dom_element.appendChild(
+        js.document.createTextNode(fs.get_path_string()))
 
     container.add(path_display)
 
     # File list container
-    file_list = Ul()
-    file_list.style.list_style = "none"
-    file_list.style.padding = "0"
+    file_list = Ul(style={"list_style": "none", "padding": "0"})
     container.add(file_list)
 
     # Controls
-    controls = Div()
-    controls.style.margin_top = "20px"
-    controls.style.display = "flex"
-    controls.style.gap = "10px"
-    controls.style.flex_wrap = "wrap"
+    controls = Div(style={
+        "margin_top": "20px",
+        "display": "flex",
+        "gap": "10px",
+        "flex_wrap": "wrap"
+    })
 
     # File name input
-    file_input = Input()
-    file_input.set_attribute("type", "text")
-    file_input.set_attribute("placeholder", "New file/folder name")
-    file_input.style.padding = "8px"
-    file_input.style.border = "1px solid #ddd"
-    file_input.style.border_radius = "3px"
+    file_input = Input("text", placeholder="New file/folder name", style={
+        "padding": "8px",
+        "border": "1px solid #ddd",
+        "border_radius": "3px"
+    })
     controls.add(file_input)
 
     # Create file button
-    create_file_btn = Button("Create File")
-    create_file_btn.style.padding = "8px 15px"
-    create_file_btn.style.background_color = "#4CAF50"
-    create_file_btn.style.color = "white"
-    create_file_btn.style.border = "none"
-    create_file_btn.style.border_radius = "3px"
-    create_file_btn.style.cursor = "pointer"
+    create_file_btn = Button("Create File", style={"background_color": "#4CAF50"})
+    create_file_btn._dom_element.className = "antioch-fs-btn"
 
     # Create directory button
-    create_dir_btn = Button("Create Folder")
-    create_dir_btn.style.padding = "8px 15px"
-    create_dir_btn.style.background_color = "#2196F3"
-    create_dir_btn.style.color = "white"
-    create_dir_btn.style.border = "none"
-    create_dir_btn.style.border_radius = "3px"
-    create_dir_btn.style.cursor = "pointer"
+    create_dir_btn = Button("Create Folder", style={"background_color": "#2196F3"})
+    create_dir_btn._dom_element.className = "antioch-fs-btn"
 
     # Go up button
-    up_btn = Button("Go Up")
-    up_btn.style.padding = "8px 15px"
-    up_btn.style.background_color = "#FF9800"
-    up_btn.style.color = "white"
-    up_btn.style.border = "none"
-    up_btn.style.border_radius = "3px"
-    up_btn.style.cursor = "pointer"
+    up_btn = Button("Go Up", style={"background_color": "#FF9800"})
+    up_btn._dom_element.className = "antioch-fs-btn"
 
     # Reset button
-    reset_btn = Button("Reset Filesystem")
-    reset_btn.style.padding = "8px 15px"
-    reset_btn.style.background_color = "#f44336"
-    reset_btn.style.color = "white"
-    reset_btn.style.border = "none"
-    reset_btn.style.border_radius = "3px"
-    reset_btn.style.cursor = "pointer"
-
-    controls.add(create_file_btn, create_dir_btn, up_btn, reset_btn)
+    reset_btn = Button("Reset Filesystem", style={"background_color": "#f44336"})
+    reset_btn._dom_element.className = "antioch-fs-btn"
+
+    # Inline create errors; unlike alert() this doesn't block the page
+    error_text = Span(style={"color": "#f44336", "align_self": "center"})
+
+    controls.add(create_file_btn, create_dir_btn, up_btn, reset_btn, error_text)
     container.add(controls)
 
     # Observer log
-    log_title = H2("Event Log")
-    log_title.style.margin_top = "30px"
-    log_title.style.color = "#333"
+    log_title = H2("Event Log", style={"margin_top": "30px", "color": "#333"})
     container.add(log_title)
 
-    log_display = Pre()
-    log_display.style.background_color = "#f9f9f9"
-    log_display.style.padding = "10px"
-    log_display.style.border_radius = "5px"
-    log_display.style.max_height = "200px"
-    log_display.style.overflow = "auto"
-    log_display.style.font_size = "12px"
+    log_display = Pre(style={
+        "background_color": "#f9f9f9",
+        "padding": "10px",
+        "border_radius": "5px",
+        "max_height": "200px",
+        "overflow": "auto",
+        "font_size": "12px"
+    })
     container.add(log_display)
 
+    # Rows are kept by name so renders only touch items that changed. The
+    # document is looked up once here rather than through js per row
+    document = js.document
+    row_cache = {}
+    rendered_order = []
+
+    def build_row(name, is_dir):
+        # Create list item
+        li_elem = Li()
+        li_elem._dom_element.className = "antioch-fs-row"
+        li_elem._dom_element.dataset.name = name
+
+        # Item name and type
+        name_span = Span()
+        name_node = name_span._dom_element
+        name_node.appendChild((_DIR_ICON if is_dir else _FILE_ICON).cloneNode(False))
+        name_node.appendChild(document.createTextNode(name))
+        if is_dir:
+            name_node.className = "antioch-fs-dir-name"
+            name_node.dataset.name = name
+            name_node.dataset.action = "nav"
+
+        li_elem.add(name_span)
+        return li_elem
+
+    # One delegated handler serves every row's navigate and delete clicks.
+    # The delete mark is a pseudo-element, so its clicks land on the row
+    # itself within the last few pixels. Missing data attributes raise
+    # rather than read as None, hence getattr
+    def on_list_click(event):
+        target = event.target
+        dataset = target.dataset
+        if getattr(dataset, "action", None) == "nav":
+            fs.push_path(dataset.name)
+        elif (target.className == "antioch-fs-row"
+              and event.offsetX > target.clientWidth - _DELETE_HIT_PX):
+            fs.delete_item(dataset.name)
+
+    file_list.on_click(on_list_click)
+
     # Function to render the file list
-    def render_files():
-        # Clear the file list
-        file_list._dom_element.innerHTML = ""
-
-        items = fs.get_current_items()
-        for item in items:
-            # Create list item
-            li_elem = Li()
-            li_elem.style.padding = "8px"
-            li_elem.style.margin = "5px 0"
-            li_elem.style.background_color = "#fff"
-            li_elem.style.border = "1px solid #ddd"
-            li_elem.style.border_radius = "3px"
-            li_elem.style.display = "flex"
-            li_elem.style.justify_content = "space-between"
-            li_elem.style.align_items = "center"
-
-            # Item name and type
-            icon = "📁" if item.is_directory() else "📄"
-            name_span = Span(f"{icon} {item.name}")
-            if item.is_directory():
-                name_span.style.cursor = "pointer"
-                name_span.style.color = "#2196F3"
-                name_span.style.font_weight = "bold"
-
-                # Navigation handler for directories
-                def create_nav_handler(item_name):
-                    def handler(event):
-                        fs.navigate_to(fs.current_path + [item_name])
-                    return handler
-
-                name_span.on_click(create_nav_handler(item.name))
-
-            # Delete button
-            del_btn = Button("Delete")
-            del_btn.style.padding = "4px 8px"
-            del_btn.style.background_color = "#f44336"
-            del_btn.style.color = "white"
-            del_btn.style.border = "none"
-            del_btn.style.border_radius = "3px"
-            del_btn.style.cursor = "pointer"
-
-            def create_delete_handler(item_name):
-                def handler(event):
-                    fs.delete_item(item_name)
-                return handler
-
-            del_btn.on_click(create_delete_handler(item.name))
-
-            li_elem.add(name_span, del_btn)
-            file_list.add(li_elem)
-
-        # Update path display
-        path_text.set_text(fs.get_path_string())
+    def render_list():
+        new_order, is_dirs = fs.get_current_listing()
+
+        # Drop rows for items that are gone
+        for name in row_cache.keys() - set(new_order):
+            row_cache.pop(name)[1].remove()
+        rendered = [name for name in rendered_order if name in row_cache]
+
+        # Build rows for new items, or items whose type changed
+        for name, is_dir in zip(new_order, is_dirs):
+            cached = row_cache.get(name)
+            if cached is None or cached[0] != is_dir:
+                if cached is not None:
+                    cached[1].remove()
+                    rendered.remove(name)
+                row_cache[name] = (is_dir, build_row(name, is_dir))
+
+        # Only move rows when the order changed; new items at the end are
+        # just appended
+        if tuple(rendered) != new_order[:len(rendered)]:
+            rendered = []
+        pending = new_order[len(rendered):]
+        if pending:
+            # Collect off-DOM so the list is updated in one insertion
+            fragment = document.createDocumentFragment()
+            for name in pending:
+                fragment.appendChild(row_cache[name][1]._dom_element)
+            file_list._dom_element.appendChild(fragment)
+        rendered_order[:] = new_order
+
+    # Update path display; cheap, so it runs ahead of the list render
+    def render_path():
+        path_text.nodeValue = fs.get_path_string()
+
+    render_path_proxy = create_proxy(render_path)
+
+    # Events arriving within one frame share a single render
+    render_pending = False
+
+    def render_frame(timestamp):
+        nonlocal render_pending
+        render_pending = False
+        render_list()
+
+    render_frame_proxy = create_proxy(render_frame)
+
+    def schedule_render():
+        nonlocal render_pending
+        if not render_pending:
+            render_pending = True
+            js.requestAnimationFrame(render_frame_proxy)
+
+    # Log lines are queued and written in one update when the browser is idle
+    log_lines = deque(maxlen=_LOG_MAX_LINES)
+    log_queue = []
+
+    def flush_logs():
+        # Lines older than the ring's capacity would be evicted right away
+        log_lines.extendleft(log_queue[-_LOG_MAX_LINES:])
+        log_queue.clear()
+        log_display.set_text("".join(log_lines))
 
     # Observer callback
     def fs_observer(event_type, details):
         timestamp = js.Date.new().toLocaleTimeString()
-        log_msg = f"[{timestamp}] {event_type.upper()}: {details}\n"
-        log_display.set_text(log_msg + log_display._dom_element.textContent)
-        render_files()
+        log_queue.append(f"[{timestamp}] {event_type.upper()}: {details}\n")
+        if len(log_queue) == 1:
+            run_when_idle(flush_logs)
+        # Only navigation and resets change the current path
+        if event_type in ('navigate', 'reset'):
+            js.queueMicrotask(render_path_proxy)
+        # Content edits and changes made in another directory leave the
+        # list as it is
+        if (event_type in _LIST_EVENTS
+                and details.get('path', fs.get_path_string()) == fs.get_path_string()):
+            schedule_render()
 
     # Register observer
     fs.add_observer(fs_observer)
 
-    # Event handlers
+    # Event handlers; the input is read once per click through its DOM node
+    input_node = file_input._dom_element
+
+    def read_name():
+        raw = input_node.value
+        return raw.strip() if raw else ""
+
+    error_timer = None
+
+    def clear_error():
+        nonlocal error_timer
+        error_timer = None
+        error_text.set_text("")
+
+    clear_error_proxy = create_proxy(clear_error)
+
+    def show_error(message):
+        nonlocal error_timer
+        error_text.set_text(message)
+        if error_timer is not None:
+            js.clearTimeout(error_timer)
+        error_timer = js.setTimeout(clear_error_proxy, _ERROR_MS)
+
+    def read_new_name():
+        """The input's name, or "" after reporting it as taken."""
+        name = read_name()
+        if name and fs.get_current_directory().get_child(name):
+            show_error(f"{name} already exists")
+            return ""
+        return name
+
     def on_create_file(event):
-        name = file_input.value.strip()
+        name = read_new_name()
         if name:
             if fs.create_file(name, f"Content of {name}"):
-                file_input.value = ""
+                input_node.value = ""
             else:
-                js.alert(f"Failed to create file: {name} (may already exist)")
+                show_error(f"Failed to create file: {name}")
 
     def on_create_dir(event):
-        name = file_input.value.strip()
+        name = read_new_name()
         if name:
             if fs.create_directory(name):
-                file_input.value = ""
+                input_node.value = ""
             else:
-                js.alert(f"Failed to create directory: {name} (may already exist)")
+                show_error(f"Failed to create directory: {name}")
 
     def on_go_up(event):
         fs.go_up()
@@ -223,7 +330,7 @@ def main():
     DOM.add(container)
 
     # Initial render after DOM is ready
-    render_files()
+    render_list()
 
 
 if __name__ == "__main__":
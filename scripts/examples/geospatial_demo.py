@@ -7,6 +7,144 @@ from antioch import *
 from antioch.macros import Map, FileUpload, FileSelect, Tabs, Tab
 from antioch.core import get_filesystem, LocalStorageBackend
 import js
+from pyodide.ffi import create_proxy, to_js
+from heapq import nlargest, nsmallest
+
+from ._util import object_url, on_settled
+
+# Pixels sampled per band to find its auto-scaling range
+_SAMPLE_PIXELS = 1000
+
+# Raw values below this in every RGB band are treated as no-data
+_NO_DATA_BELOW = 10
+
+# Widest raster read for display; larger GeoTIFFs are read from an overview
+_MAX_RASTER_WIDTH = 2048
+
+# Example GeoJSON for the overlay demo (London parks)
+_LONDON_PARKS = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"name": "Hyde Park", "type": "Park"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[
+                    [-0.165, 51.508],
+                    [-0.165, 51.513],
+                    [-0.158, 51.513],
+                    [-0.158, 51.508],
+                    [-0.165, 51.508]
+                ]]
+            }
+        },
+        {
+            "type": "Feature",
+            "properties": {"name": "Regent's Park", "type": "Park"},
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[
+                    [-0.158, 51.525],
+                    [-0.158, 51.530],
+                    [-0.151, 51.530],
+                    [-0.151, 51.525],
+                    [-0.158, 51.525]
+                ]]
+            }
+        }
+    ]
+}
+
+# Band formats small enough to colorize through a lookup table
+_LUT_FORMATS = ('B', 'H')
+
+
+def _percentile_range(band):
+    """The 2nd and 98th percentile of an evenly spaced sample of a band."""
+    step = max(1, len(band) // _SAMPLE_PIXELS)
+    samples = band[::step]
+    # Only the two order statistics are needed, so select rather than sort
+    count = len(samples)
+    lo = nsmallest(int(count * 0.02) + 1, samples)[-1]
+    hi = nlargest(count - int(count * 0.98), samples)[-1]
+    return lo, hi
+
+
+def _lookup(band, lut):
+    """Map every value of an unsigned 8/16-bit band through a byte table."""
+    if band.format == 'B':
+        return band.tobytes().translate(lut)
+    return bytes(map(lut.__getitem__, band))
+
+
+def _lut_size(band):
+    """Entries a lookup table needs to cover every value in the band."""
+    return 256 if band.format == 'B' else max(band) + 1
+
+
+def _scale_band(band, lo, hi):
+    """Stretch a band so lo..hi maps onto 0..255, clamped, as bytes."""
+    scale = 255 / (hi - lo if hi > lo else 1.0)
+    if band.format in _LUT_FORMATS:
+        # Unsigned 8/16-bit data: scale and clamp every possible value once,
+        # then look up
+        lut = bytes(min(255, max(0, int((v - lo) * scale)))
+                    for v in range(_lut_size(band)))
+        return _lookup(band, lut)
+    # Float data: values at or past the stretch limits clamp without being
+    # scaled, so only in-range values pay for the arithmetic
+    return bytes(0 if v <= lo else 255 if v >= hi else int((v - lo) * scale)
+                 for v in band)
+
+
+# Turns a byte that is 1 where a pixel is no-data into its alpha
+_ALPHA_FROM_NO_DATA = bytes([255, 0]) + bytes(254)
+
+
+def _no_data_alpha(r, g, b):
+    """Alpha bytes that hide pixels dark in all three bands."""
+    if all(band.format in _LUT_FORMATS for band in (r, g, b)):
+        # Each band becomes a 0/1 byte mask; AND-ing them as big integers
+        # marks pixels dark in all three without a Python-level pixel loop
+        dark = -1
+        for band in (r, g, b):
+            size = _lut_size(band)
+            lut = b"\x01" * min(size, _NO_DATA_BELOW) + bytes(max(0, size - _NO_DATA_BELOW))
+            dark &= int.from_bytes(_lookup(band, lut), 'little')
+        return dark.to_bytes(len(r), 'little').translate(_ALPHA_FROM_NO_DATA)
+
+    return bytes(0 if rv < _NO_DATA_BELOW and gv < _NO_DATA_BELOW and bv < _NO_DATA_BELOW
+                 else 255 for rv, gv, bv in zip(r, g, b))
+
+
+def satellite_ranges(bands):
+    """Per-band 2-98% display ranges, used when the stretch runs on the GPU."""
+    return [_percentile_range(band) for band in bands[:3]]
+
+
+def satellite_colormap(bands, width, height):
+    """Colorize satellite imagery with per-band auto-scaling, one whole raster at a time."""
+    pixels = width * height
+    out = bytearray(pixels * 4)
+
+    if len(bands) >= 3:
+        # RGB imagery; very dark pixels become transparent (no-data)
+        r, g, b = bands[:3]
+        out[0::4] = _scale_band(r, *_percentile_range(r))
+        out[1::4] = _scale_band(g, *_percentile_range(g))
+        out[2::4] = _scale_band(b, *_percentile_range(b))
+        out[3::4] = _no_data_alpha(r, g, b)
+    else:
+        # Grayscale (single band)
+        gray = _scale_band(bands[0], *_percentile_range(bands[0]))
+        out[0::4] = gray
+        out[1::4] = gray
+        out[2::4] = gray
+        out[3::4] = b"\xff" * pixels
+
+    return out
+
 
 def main():
     """Main entry point for Geospatial demo."""
@@ -59,6 +197,39 @@ def main():
     # Store loaded layers for cleanup
     loaded_layers = {"shapefile": None, "geotiff": None}
 
+    # A new load cancels the download of the one before it
+    load_controllers = {"shapefile": None, "geotiff": None}
+
+    def restart_load(kind):
+        """Abort the previous load of this kind and return a signal for the next."""
+        previous = load_controllers[kind]
+        if previous is not None:
+            previous.abort()
+        controller = js.AbortController.new()
+        load_controllers[kind] = controller
+        return controller.signal
+
+    # Popup content for a shapefile feature, called by Leaflet with the layer
+    # when its popup opens
+    def feature_popup(layer):
+        try:
+            props = layer.feature.properties.to_py()
+            body = "<br>".join(f"{key}: {value}" for key, value in props.items()
+                               if not key.startswith('_'))
+        except Exception:
+            body = "No properties available"
+        return f"<div style='max-width:200px;'><b>Feature Properties:</b><br>{body}</div>"
+
+    feature_popup_proxy = create_proxy(feature_popup)
+
+    # Callback for each shapefile feature; popups are only built when opened.
+    # Proxied once here so repeated loads don't each leak a new proxy
+    def on_feature(feature, layer):
+        if hasattr(feature, 'properties'):
+            layer.bindPopup(feature_popup_proxy)
+
+    on_feature_proxy = create_proxy(on_feature)
+
     # Define shapefile loading function (used by both URL and file methods)
     def load_shapefile_from_source(url_or_blob):
         """Load shapefile from URL or Blob."""
@@ -74,35 +245,20 @@ def main():
             "fillOpacity": 0.4
         }
 
-        # Define callback for each feature
-        def on_feature(feature, layer):
-            if hasattr(feature, 'properties'):
-                props = feature.properties
-                popup_html = "<div style='max-width:200px;'>"
-                popup_html += "<b>Feature Properties:</b><br>"
-                try:
-                    for key in dir(props):
-                        if not key.startswith('_'):
-                            value = getattr(props, key)
-                            if not callable(value):
-                                popup_html += f"{key}: {value}<br>"
-                except:
-                    popup_html += "No properties available"
-                popup_html += "</div>"
-                layer.bindPopup(popup_html)
-
         # Load shapefile with layer name
         layer_name = "Shapefile Layer"
         if isinstance(url_or_blob, str) and '/' in url_or_blob:
             # Extract filename from URL
             layer_name = url_or_blob.split('/')[-1].replace('.zip', '')
 
+        signal = restart_load("shapefile")
         promise = map1.add_shapefile(
             url_or_blob,
             name=layer_name,
             style_options=style_options,
-            on_each_feature=on_feature,
-            add_to_control=True
+            on_each_feature=on_feature_proxy,
+            add_to_control=True,
+            signal=signal
         )
         if promise:
             print(f"Shapefile loading initiated from: {url_or_blob}")
@@ -110,8 +266,13 @@ def main():
             def on_loaded(layer):
                 loaded_layers["shapefile"] = layer
                 print(f"✓ Shapefile '{layer_name}' loaded")
-            from pyodide.ffi import create_proxy
-            promise.then(create_proxy(on_loaded))
+
+            # A newer load aborting this one isn't worth reporting
+            def on_failed(error):
+                if not signal.aborted:
+                    print(f"✗ Shapefile '{layer_name}' failed to load: {error}")
+
+            on_settled(promise, on_loaded, on_failed)
 
     # Tabbed controls for different loading methods
     # Tab 1: Load from URL
@@ -189,11 +350,7 @@ def main():
     def on_shapefile_selected(file_path, file_content):
         if file_content:
             print(f"Selected shapefile: {file_path}")
-            # Create a Blob from the file content
-            uint8_array = js.Uint8Array.new(file_content)
-            blob = js.Blob.new([uint8_array], js.Object.new(type="application/zip"))
-            blob_url = js.URL.createObjectURL(blob)
-            load_shapefile_from_source(blob_url)
+            load_shapefile_from_source(object_url(file_content, "application/zip"))
 
     shapefile_selector = FileSelect(
         on_select=on_shapefile_selected,
@@ -252,8 +409,8 @@ def main():
     section2.add(map2)
 
     # Define GeoTIFF loading function
-    def load_geotiff_from_source(url_or_blob, opacity=0.7):
-        """Load GeoTIFF from URL or Blob."""
+    def load_geotiff_from_source(url_or_blob, opacity=0.7, cache_name=None):
+        """Load GeoTIFF from URL or Blob; cache_name identifies a blob's source for caching."""
         # Clear previous layer if exists
         if loaded_layers["geotiff"]:
             map2.remove_layer(loaded_layers["geotiff"])
@@ -265,100 +422,24 @@ def main():
 
         print(f"GeoTIFF loading initiated from: {url_or_blob}")
 
-        # Custom colormap for RGB satellite imagery
-        # Track min/max values for auto-scaling - separate for each band
-        value_stats = {'count': 0, 'r_samples': [], 'g_samples': [], 'b_samples': []}
-
-        def satellite_colormap(values):
-            """Convert satellite imagery values to RGB colors with per-band auto-scaling."""
-            if not values or len(values) == 0:
-                return [0, 0, 0, 0]  # Transparent
-
-            # Sample first 1000 pixels to determine value range PER BAND
-            if value_stats['count'] < 1000:
-                value_stats['count'] += 1
-                if len(values) >= 3:
-                    value_stats['r_samples'].append(values[0])
-                    value_stats['g_samples'].append(values[1])
-                    value_stats['b_samples'].append(values[2])
-
-                # After 1000 samples, compute statistics PER BAND
-                if value_stats['count'] == 1000:
-                    # Red band
-                    r_sorted = sorted(value_stats['r_samples'])
-                    value_stats['r_min'] = r_sorted[int(len(r_sorted) * 0.02)]
-                    value_stats['r_max'] = r_sorted[int(len(r_sorted) * 0.98)]
-
-                    # Green band
-                    g_sorted = sorted(value_stats['g_samples'])
-                    value_stats['g_min'] = g_sorted[int(len(g_sorted) * 0.02)]
-                    value_stats['g_max'] = g_sorted[int(len(g_sorted) * 0.98)]
-
-                    # Blue band
-                    b_sorted = sorted(value_stats['b_samples'])
-                    value_stats['b_min'] = b_sorted[int(len(b_sorted) * 0.02)]
-                    value_stats['b_max'] = b_sorted[int(len(b_sorted) * 0.98)]
-
-            # Handle RGB imagery (3+ bands)
-            if len(values) >= 3:
-                r, g, b = values[0], values[1], values[2]
-
-                # Make very dark pixels transparent (no-data)
-                if r < 10 and g < 10 and b < 10:
-                    return [0, 0, 0, 0]
-
-                # Use per-band auto-detected range if available
-                if 'r_min' in value_stats:
-                    r_min = value_stats['r_min']
-                    r_max = value_stats['r_max']
-                    r_range = r_max - r_min if r_max > r_min else 1.0
-
-                    g_min = value_stats['g_min']
-                    g_max = value_stats['g_max']
-                    g_range = g_max - g_min if g_max > g_min else 1.0
-
-                    b_min = value_stats['b_min']
-                    b_max = value_stats['b_max']
-                    b_range = b_max - b_min if b_max > b_min else 1.0
-
-                    r = int((r - r_min) / r_range * 255)
-                    g = int((g - g_min) / g_range * 255)
-                    b = int((b - b_min) / b_range * 255)
-                else:
-                    # Fallback: assume 0-2000 range
-                    r = int(r * 255 / 2000)
-                    g = int(g * 255 / 2000)
-                    b = int(b * 255 / 2000)
-
-                # Clamp to 0-255
-                r = min(255, max(0, r))
-                g = min(255, max(0, g))
-                b = min(255, max(0, b))
-
-                return [r, g, b, 255]
-            else:
-                # Grayscale (single band)
-                val = values[0]
-
-                # Use auto-detected range if available
-                if 'r_min' in value_stats:
-                    vmin = value_stats['r_min']
-                    vmax = value_stats['r_max']
-                    vrange = vmax - vmin if vmax > vmin else 1.0
-                    val = int((val - vmin) / vrange * 255)
-                else:
-                    val = int(val * 255 / 2000) if val > 2000 else int(val)
-
-                val = min(255, max(0, val))
-                return [val, val, val, 255]
+        # Rendered overlays are cached per source and display width; blob URLs
+        # are unique per load, so they need a name to be cached
+        source = cache_name or (url_or_blob if not url_or_blob.startswith('blob:') else None)
+        cache_key = f"{source}@{_MAX_RASTER_WIDTH}" if source else None
 
         # Load GeoTIFF with PNG conversion approach
         layer = map2.add_geotiff(
             url_or_blob,
             name=layer_name,
             opacity=opacity,
-            colormap=satellite_colormap,
-            add_to_control=True
+            band_ranges=satellite_ranges,
+            no_data_below=_NO_DATA_BELOW,
+            batch_colormap=satellite_colormap,
+            max_width=_MAX_RASTER_WIDTH,
+            cache_key=cache_key,
+            decode_in_workers=True,
+            add_to_control=True,
+            signal=restart_load("geotiff")
         )
         # Layer will be added asynchronously
 
@@ -503,11 +584,10 @@ def main():
                 opacity = float(vfs_opacity_input.value)
             except:
                 opacity = 0.7
-            # Create a Blob from the file content
-            uint8_array = js.Uint8Array.new(file_content)
-            blob = js.Blob.new([uint8_array], js.Object.new(type="image/tiff"))
-            blob_url = js.URL.createObjectURL(blob)
-            load_geotiff_from_source(blob_url, opacity)
+            # Key the cache on the file's modification time so edits re-render
+            item = fs.get_item_by_path(file_path)
+            cache_name = f"vfs:{file_path}:{item.modified}" if item else None
+            load_geotiff_from_source(object_url(file_content, "image/tiff"), opacity, cache_name)
 
     geotiff_selector = FileSelect(
         on_select=on_geotiff_selected,
@@ -566,45 +646,7 @@ def main():
 
     # Example GeoJSON data (London parks)
     def add_example_geojson(map_instance):
-        geojson_data = js.JSON.parse('''{
-            "type": "FeatureCollection",
-            "features": [
-                {
-                    "type": "Feature",
-                    "properties": {
-                        "name": "Hyde Park",
-                        "type": "Park"
-                    },
-                    "geometry": {
-                        "type": "Polygon",
-                        "coordinates": [[
-                            [-0.165, 51.508],
-                            [-0.165, 51.513],
-                            [-0.158, 51.513],
-                            [-0.158, 51.508],
-                            [-0.165, 51.508]
-                        ]]
-                    }
-                },
-                {
-                    "type": "Feature",
-                    "properties": {
-                        "name": "Regent's Park",
-                        "type": "Park"
-                    },
-                    "geometry": {
-                        "type": "Polygon",
-                        "coordinates": [[
-                            [-0.158, 51.525],
-                            [-0.158, 51.530],
-                            [-0.151, 51.530],
-                            [-0.151, 51.525],
-                            [-0.158, 51.525]
-                        ]]
-                    }
-                }
-            ]
-        }''')
+        geojson_data = to_js(_LONDON_PARKS, dict_converter=js.Object.fromEntries)
 
         # Style options
         style = {
@@ -701,20 +743,21 @@ def main():
             {"name": "Phoenix", "lat": 33.4484, "lng": -112.0740, "pop": 1690000}
         ]
 
-        for city in cities:
-            # Scale radius by population (sqrt for better visual)
-            radius = (city["pop"] / 1000000) ** 0.5 * 50000  # meters
-            map_instance.add_circle(
-                city["lat"], city["lng"],
-                radius=radius,
-                color="#e74c3c",
-                fill_color="#e74c3c",
-                fill_opacity=0.3
-            )
-            map_instance.add_marker(
-                city["lat"], city["lng"],
-                f"<b>{city['name']}</b><br>Population: {city['pop']:,}"
-            )
+        points = [(city["lat"], city["lng"]) for city in cities]
+        # Scale radius by population (sqrt for better visual), in meters
+        radii = [(city["pop"] / 1000000) ** 0.5 * 50000 for city in cities]
+
+        # Each set goes onto the map as one group
+        map_instance.add_circles(
+            points, radii,
+            color="#e74c3c",
+            fill_color="#e74c3c",
+            fill_opacity=0.3
+        )
+        map_instance.add_markers(
+            points,
+            [f"<b>{city['name']}</b><br>Population: {city['pop']:,}" for city in cities]
+        )
 
         print("Example overlay data added")
 
@@ -820,33 +863,31 @@ def main():
 
 def _ensure_directories(fs):
     """Ensure required directories exist in the VFS."""
-    fs.navigate_to([])
-
-    # Create maps directory and subdirectories
     directories = [
-        ['maps'],
         ['maps', 'shapefiles'],
         ['maps', 'geotiff'],
         ['documents']
     ]
 
     for dir_path in directories:
-        try:
-            current = fs.root
-            for dir_name in dir_path:
-                if dir_name not in current.children:
-                    fs.navigate_to(dir_path[:dir_path.index(dir_name)])
-                    fs.create_directory(dir_name)
-                current = fs.root
-                for segment in dir_path:
-                    current = current.children.get(segment)
-                    if not current:
-                        break
-        except Exception as e:
-            pass  # Directory might already exist
+        _mkdir_p(fs, dir_path)
 
     fs.navigate_to([])
 
 
+def _mkdir_p(fs, parts):
+    """Create each missing directory along parts, walking the path once."""
+    node = fs.root
+    for depth, name in enumerate(parts):
+        child = node.get_child(name)
+        if child is None:
+            fs.navigate_to(parts[:depth])
+            fs.create_directory(name)
+            child = node.get_child(name)
+        if child is None or not child.is_directory():
+            return  # A file is in the way
+        node = child
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
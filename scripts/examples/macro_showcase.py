@@ -10,22 +10,22 @@ from antioch.macros import (
     show_toast, info_toast, success_toast, warning_toast, error_toast, clear_all_toasts
 )
 
+# Common button style
+_BUTTON_STYLE = {
+    "padding": "8px 16px",
+    "margin": "0 5px",
+    "border": "1px solid #007bff",
+    "background_color": "#007bff",
+    "color": "white",
+    "border_radius": "4px",
+    "cursor": "pointer",
+    "font_size": "14px",
+    "transition": "all 0.2s ease"
+}
+
 def create_showcase():
     """Create a comprehensive showcase of all new macros."""
     
-    # Define common button style
-    button_style = {
-        "padding": "8px 16px",
-        "margin": "0 5px",
-        "border": "1px solid #007bff",
-        "background_color": "#007bff",
-        "color": "white",
-        "border_radius": "4px",
-        "cursor": "pointer",
-        "font_size": "14px",
-        "transition": "all 0.2s ease"
-    }
-    
     # Main container
     container = Div(style={
         "max_width": "1200px",
@@ -40,15 +40,9 @@ def create_showcase():
         "color": "#333",
         "margin_bottom": "30px"
     })
-    container.add(title)
-    
-    # Progress Bar Section
-    container.add(H2("Progress Bar Examples"))
     
     # Basic progress bar
     progress1 = ProgressBar(initial_progress=75, width="400px")
-    container.add(P("Basic Progress Bar (75%):"))
-    container.add(progress1.element)
     
     # Animated striped progress bar
     progress2 = ProgressBar(
@@ -58,27 +52,32 @@ def create_showcase():
         animate=True,
         striped=True
     )
-    container.add(P("Animated Striped Progress Bar:"))
-    container.add(progress2.element)
     
     # Progress control buttons
     progress_controls = Div(style={"margin": "10px 0"})
     
-    increase_btn = Button("Increase (+10)", style=button_style)
-    decrease_btn = Button("Decrease (-10)", style=button_style)
-    reset_btn = Button("Reset", style=button_style)
+    increase_btn = Button("Increase (+10)", style=_BUTTON_STYLE)
+    decrease_btn = Button("Decrease (-10)", style=_BUTTON_STYLE)
+    reset_btn = Button("Reset", style=_BUTTON_STYLE)
     
     increase_btn.on_click(lambda e: progress1.increment(10))
     decrease_btn.on_click(lambda e: progress1.decrement(10))
     reset_btn.on_click(lambda e: progress1.set_progress(0))
     
     progress_controls.add(increase_btn, decrease_btn, reset_btn)
-    container.add(progress_controls)
-    
-    container.add(Hr())
     
-    # Alert Section
-    container.add(H2("Alert Examples"))
+    # Sections are added with one call each; several children go in through
+    # a single DocumentFragment
+    container.add(
+        title,
+        H2("Progress Bar Examples"),
+        P("Basic Progress Bar (75%):"),
+        progress1.element,
+        P("Animated Striped Progress Bar:"),
+        progress2.element,
+        progress_controls,
+        Hr()
+    )
     
     # Different alert types
     info_alert = Alert("This is an info alert with useful information.", "info")
@@ -86,16 +85,16 @@ def create_showcase():
     warning_alert = Alert("Warning: Please check your input.", "warning")
     error_alert = Alert("Error: Something went wrong.", "error", auto_dismiss=True, dismiss_delay=3000)
     
-    container.add(info_alert.element)
-    container.add(success_alert.element)
-    container.add(warning_alert.element)
-    container.add(error_alert.element)
-    
-    container.add(Hr())
+    container.add(
+        H2("Alert Examples"),
+        info_alert.element,
+        success_alert.element,
+        warning_alert.element,
+        error_alert.element,
+        Hr()
+    )
     
     # Accordion Section
-    container.add(H2("Accordion Example"))
-    
     panels = [
         {"title": "What is Antioch?", "content": "Antioch is a Python DOM library that runs in browsers via Pyodide, enabling full-stack Python development."},
         {"title": "How do macros work?", "content": "Macros are reusable UI components with built-in state management, event handling, and styling."},
@@ -103,15 +102,10 @@ def create_showcase():
     ]
     
     accordion = Accordion(panels=panels, allow_multiple=True, default_expanded=[0])
-    container.add(accordion.element)
-    
-    container.add(Hr())
+    container.add(H2("Accordion Example"), accordion.element, Hr())
     
     # Pagination Section
-    container.add(H2("Pagination Example"))
-    container.add(P("Navigate through 250 items (25 items per page):"))
-    
-    pagination = Pagination(total_items=250, items_per_page=25, current_page=1)
+    pagination = Pagination(total_items=250, items_per_page=25, current_page=1, show_page_jump=True)
     
     # Page info display
     page_info = Div(style={"margin": "10px 0", "padding": "10px", "background": "#f8f9fa", "border_radius": "4px"})
@@ -123,21 +117,19 @@ def create_showcase():
     pagination.on_page_change(lambda pagination, page, old_page: update_page_info())
     update_page_info()  # Initial update
     
-    container.add(pagination.element)
-    container.add(page_info)
-    
-    container.add(Hr())
+    container.add(
+        H2("Pagination Example"),
+        P("Navigate through 250 items (25 items per page):"),
+        pagination.element,
+        page_info,
+        Hr()
+    )
     
     # Dropdown Section
-    container.add(H2("Dropdown Examples"))
-    
     # Simple dropdown
     simple_items = ["Option 1", "Option 2", "Option 3", "Option 4"]
     simple_dropdown = Dropdown(items=simple_items, placeholder="Choose an option")
     
-    container.add(P("Simple Dropdown:"))
-    container.add(simple_dropdown.element)
-    
     # Multi-select searchable dropdown
     multi_items = [
         DropdownItem("JavaScript", "js"),
@@ -155,9 +147,6 @@ def create_showcase():
         multi_select=True
     )
     
-    container.add(P("Multi-select Searchable Dropdown:"))
-    container.add(multi_dropdown.element)
-    
     # Selection display
     selection_display = Div(style={"margin": "10px 0", "padding": "10px", "background": "#e7f3ff"})
     
@@ -174,20 +163,24 @@ def create_showcase():
     multi_dropdown.on_change(lambda *args: update_selection())
     update_selection()  # Initial update
     
-    container.add(selection_display)
-    
-    container.add(Hr())
+    container.add(
+        H2("Dropdown Examples"),
+        P("Simple Dropdown:"),
+        simple_dropdown.element,
+        P("Multi-select Searchable Dropdown:"),
+        multi_dropdown.element,
+        selection_display,
+        Hr()
+    )
     
     # Toast Section
-    container.add(H2("Toast Notification Examples"))
-    
     toast_controls = Div(style={"display": "flex", "gap": "10px", "flex_wrap": "wrap"})
     
-    info_btn = Button("Show Info Toast", style=button_style)
-    success_btn = Button("Show Success Toast", style=button_style) 
-    warning_btn = Button("Show Warning Toast", style=button_style)
-    error_btn = Button("Show Error Toast", style=button_style)
-    clear_btn = Button("Clear All Toasts", style=button_style)
+    info_btn = Button("Show Info Toast", style=_BUTTON_STYLE)
+    success_btn = Button("Show Success Toast", style=_BUTTON_STYLE) 
+    warning_btn = Button("Show Warning Toast", style=_BUTTON_STYLE)
+    error_btn = Button("Show Error Toast", style=_BUTTON_STYLE)
+    clear_btn = Button("Clear All Toasts", style=_BUTTON_STYLE)
     
     info_btn.on_click(lambda e: info_toast("This is an informational message!"))
     success_btn.on_click(lambda e: success_toast("Operation completed successfully!"))
@@ -196,13 +189,9 @@ def create_showcase():
     clear_btn.on_click(lambda e: clear_all_toasts())
     
     toast_controls.add(info_btn, success_btn, warning_btn, error_btn, clear_btn)
-    container.add(toast_controls)
-    
-    container.add(Hr())
+    container.add(H2("Toast Notification Examples"), toast_controls, Hr())
     
     # Slider Section
-    container.add(H2("Slider Examples"))
-    
     # Volume slider
     volume_slider = Slider(
         min_value=0,
@@ -213,8 +202,6 @@ def create_showcase():
         show_ticks=True
     )
     
-    container.add(volume_slider.element)
-    
     # Temperature slider
     temp_slider = Slider(
         min_value=-20,
@@ -226,8 +213,6 @@ def create_showcase():
         show_min_max=True
     )
     
-    container.add(temp_slider.element)
-    
     # Slider value display
     slider_display = Div(style={"margin": "10px 0", "padding": "10px", "background": "#f0f8ff"})
     
@@ -238,15 +223,13 @@ def create_showcase():
     temp_slider.on_input(lambda slider, value, old_value: update_slider_display())
     update_slider_display()  # Initial update
     
-    container.add(slider_display)
-    
     # Slider controls
     slider_controls = Div(style={"display": "flex", "gap": "10px", "margin": "10px 0"})
     
-    vol_up = Button("Vol +10", style=button_style)
-    vol_down = Button("Vol -10", style=button_style)
-    temp_up = Button("Temp +5", style=button_style)
-    temp_down = Button("Temp -5", style=button_style)
+    vol_up = Button("Vol +10", style=_BUTTON_STYLE)
+    vol_down = Button("Vol -10", style=_BUTTON_STYLE)
+    temp_up = Button("Temp +5", style=_BUTTON_STYLE)
+    temp_down = Button("Temp -5", style=_BUTTON_STYLE)
     
     vol_up.on_click(lambda e: volume_slider.increment(10))
     vol_down.on_click(lambda e: volume_slider.decrement(10))
@@ -254,7 +237,6 @@ def create_showcase():
     temp_down.on_click(lambda e: temp_slider.decrement(5))
     
     slider_controls.add(vol_up, vol_down, temp_up, temp_down)
-    container.add(slider_controls)
     
     # Footer
     footer = Div(style={
@@ -265,7 +247,15 @@ def create_showcase():
         "border_radius": "6px"
     })
     footer.add(P("🎉 Antioch Macro Showcase - Interactive UI components built with Python! 🎉"))
-    container.add(footer)
+    
+    container.add(
+        H2("Slider Examples"),
+        volume_slider.element,
+        temp_slider.element,
+        slider_display,
+        slider_controls,
+        footer
+    )
     
     return container
 
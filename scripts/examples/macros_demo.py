@@ -7,24 +7,25 @@ from antioch import Div, H1, H2, P, Button, DOM
 # Import macros from antioch.macros package
 from antioch.macros import Counter, Modal, Form, FormField, RequiredValidator, EmailValidator, MinLengthValidator, Tabs, Tab
 
+# Style shared by every demo section
+_SECTION_STYLE = {
+    "margin": "20px 0",
+    "padding": "20px",
+    "border": "1px solid #ddd",
+    "border_radius": "8px",
+    "background_color": "#f8f9fa"
+}
+
 
 def create_counter_demo():
     """Demonstrate Counter macro with multiple instances."""
-    section = Div(style={
-        "margin": "20px 0",
-        "padding": "20px",
-        "border": "1px solid #ddd",
-        "border_radius": "8px",
-        "background_color": "#f8f9fa"
-    })
+    section = Div(style=_SECTION_STYLE)
     
-    section.add(H2("Counter Components"))
-    section.add(P("Multiple counter instances working independently:"))
+    section.add(H2("Counter Components"), P("Multiple counter instances working independently:"))
     
     # Basic counter
     basic_counter = Counter(initial_value=5, label="Basic Counter")
     basic_counter.on_change(lambda counter, new_value, old_value: print(f"Basic counter changed to: {new_value}"))
-    section.add(basic_counter.element)
     
     # Limited counter
     limited_counter = Counter(
@@ -35,7 +36,6 @@ def create_counter_demo():
         button_style={"background_color": "#28a745"}
     )
     limited_counter.on_change(lambda counter, new_value, old_value: print(f"Limited counter: {new_value}"))
-    section.add(limited_counter.element)
     
     # Step counter
     step_counter = Counter(
@@ -45,23 +45,16 @@ def create_counter_demo():
         button_style={"background_color": "#ffc107", "color": "#000"}
     )
     step_counter.on_change(lambda counter, new_value, old_value: print(f"Step counter: {new_value}"))
-    section.add(step_counter.element)
+    section.add(basic_counter.element, limited_counter.element, step_counter.element)
     
     return section
 
 
 def create_modal_demo():
     """Demonstrate Modal macro with multiple instances."""
-    section = Div(style={
-        "margin": "20px 0",
-        "padding": "20px", 
-        "border": "1px solid #ddd",
-        "border_radius": "8px",
-        "background_color": "#f8f9fa"
-    })
+    section = Div(style=_SECTION_STYLE)
     
-    section.add(H2("Modal Components"))
-    section.add(P("Click buttons to open different modal types:"))
+    section.add(H2("Modal Components"), P("Click buttons to open different modal types:"))
     
     # Button container
     button_container = Div(style={"margin": "10px 0"})
@@ -129,25 +122,16 @@ def create_modal_demo():
     section.add(button_container)
     
     # Add modals to DOM (they start hidden)
-    DOM.add(basic_modal.element)
-    DOM.add(confirm_modal.element)
-    DOM.add(custom_modal.element)
+    DOM.add(basic_modal.element, confirm_modal.element, custom_modal.element)
     
     return section
 
 
 def create_form_demo():
     """Demonstrate Form macro with validation."""
-    section = Div(style={
-        "margin": "20px 0",
-        "padding": "20px",
-        "border": "1px solid #ddd", 
-        "border_radius": "8px",
-        "background_color": "#f8f9fa"
-    })
+    section = Div(style=_SECTION_STYLE)
     
-    section.add(H2("Form Component"))
-    section.add(P("Form with validation and multiple field types:"))
+    section.add(H2("Form Component"), P("Form with validation and multiple field types:"))
     
     # Create form fields
     fields = [
@@ -218,22 +202,16 @@ def handle_form_submit(data):
 
 def create_tabs_demo():
     """Demonstrate Tabs macro with dynamic content."""
-    section = Div(style={
-        "margin": "20px 0",
-        "padding": "20px",
-        "border": "1px solid #ddd",
-        "border_radius": "8px", 
-        "background_color": "#f8f9fa"
-    })
+    section = Div(style=_SECTION_STYLE)
     
-    section.add(H2("Tabs Component"))
-    section.add(P("Tabbed interface with dynamic content management:"))
+    section.add(H2("Tabs Component"), P("Tabbed interface with dynamic content management:"))
     
-    # Create tabs
+    # Create tabs; the Features and Settings bodies are only built the
+    # first time their tab is opened
     tabs = [
         Tab("Overview", P("This is the overview tab with basic information.")),
-        Tab("Features", create_features_content()),
-        Tab("Settings", create_settings_content()),
+        Tab("Features", content_factory=create_features_content),
+        Tab("Settings", content_factory=create_settings_content),
         Tab("About", P("Learn more about Antioch macros and their capabilities."))
     ]
     
@@ -325,7 +303,6 @@ def main():
         "color": "#333",
         "margin_bottom": "30px"
     })
-    DOM.add(title)
     
     # Introduction
     intro = P(
@@ -340,7 +317,6 @@ def main():
             "color": "#666"
         }
     )
-    DOM.add(intro)
     
     # Create demo sections
     counter_demo = create_counter_demo()
@@ -348,11 +324,9 @@ def main():
     form_demo = create_form_demo()
     tabs_demo = create_tabs_demo()
     
-    # Add all demos to page
-    DOM.add(counter_demo)
-    DOM.add(modal_demo) 
-    DOM.add(form_demo)
-    DOM.add(tabs_demo)
+    # Add the page in one insertion; the sections are collected in a
+    # DocumentFragment first
+    DOM.add(title, intro, counter_demo, modal_demo, form_demo, tabs_demo)
     
     print("✅ Antioch Macros Demo loaded!")
 
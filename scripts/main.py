@@ -1,7 +1,7 @@
 from antioch import Div, P, DOM, Img
 from examples import canvas_macros_demo, chartjs_demo, cloud_sync_demo, custom_macro_example, dataviz_app, dom_demo, example, filesystem_demo, macro_showcase, macros_demo, \
     map_demo, pong_game, quick_macro_test, robust_datatable_demo, style_demo, toolbar_demo, webcanvas_demo, windows_demo, map_layers_demo
-from scripts.examples import geospatial_demo, code_block_demo
+from scripts.examples import geospatial_demo, code_block_demo, download_link_demo
 from tutorials import t01_hello_world, t02_chaining_elements, t03_events
 from webpage import main as web_main
 
@@ -32,7 +32,7 @@ def main():
     # t03_events.main()
     web_main.main()
     # code_block_demo.main()
-    # from scripts.examples import download_link_demo
+    # download_link_demo.main()
 
 
 if __name__ == "__main__":